@@ -0,0 +1,128 @@
+from contextlib import contextmanager
+
+from core.clock import get_clock
+from core.config import get_settings
+from core.metrics import BID_QUEUE_DEPTH
+
+# Team ids come from the client; bound the bucket table
+MAX_BUCKETS = 10000
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = get_clock().monotonic()
+
+    def take(self):
+        now = get_clock().monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        return True
+
+
+class BidAdmission:
+    """
+    Cheap checks run before a bid queues on the bid lock: a token bucket per
+    team and per socket, a cap on bids queued per lot, and the lot's
+    standing minimum. The standing bid only rises within a lot, so a stale
+    value can only let a doomed bid through, never turn away a good one.
+
+    Only touched from the event loop, so no locking.
+    """
+
+    def __init__(self, rate, burst, queue_limit):
+        self.rate = rate
+        self.burst = burst
+        self.queue_limit = queue_limit
+        self._buckets = {}       # ("team", id) / ("sid", sid) -> TokenBucket
+        self._pending = {}       # player_id -> bids queued or running
+        self._standing = {}      # player_id -> (team_id, amount)
+
+    def _bucket(self, key):
+        bucket = self._buckets.get(key)
+
+        if bucket is None:
+            if len(self._buckets) >= MAX_BUCKETS:
+                self._prune()
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+
+        return bucket
+
+    def _prune(self):
+        # A bucket idle long enough to refill is the same as a new one
+        idle = self.burst / self.rate if self.rate > 0 else 0
+        now = get_clock().monotonic()
+        self._buckets = {k: b for k, b in self._buckets.items() if now - b.updated < idle}
+
+    def admit(self, sid, team_id, player_id, amount, lot=None):
+        """None when the bid may queue, else (reason, error) to reject it with right away."""
+        # Both buckets are charged: one team on many sockets, or one socket posing as many teams
+        if not self._bucket(("sid", sid)).take() or not self._bucket(("team", str(team_id))).take():
+            return "rate_limited", "Too many bids, slow down"
+
+        if self._pending.get(str(player_id), 0) >= self.queue_limit:
+            return "busy", "Too many bids in flight, try again"
+
+        try:
+            amount = float(amount)
+        except (TypeError, ValueError):
+            return None          # left to full validation
+
+        standing = self._standing.get(str(player_id))
+
+        if standing is not None:
+            leader, top = standing
+            if str(leader) == str(team_id):
+                return "already_highest", "You already have the highest bid"
+            required = top + get_settings().min_increment
+        elif lot is not None and str(lot["player_id"]) == str(player_id):
+            required = lot["base_price"]
+        else:
+            return None
+
+        if amount < required:
+            return "below_minimum", f"Minimum bid ₹{required}"
+
+        return None
+
+    @contextmanager
+    def queued(self, player_id):
+        key = str(player_id)
+        self._pending[key] = self._pending.get(key, 0) + 1
+        BID_QUEUE_DEPTH.inc()
+
+        try:
+            yield
+        finally:
+            BID_QUEUE_DEPTH.dec()
+            self._pending[key] -= 1
+            if not self._pending[key]:
+                del self._pending[key]
+
+    def note_top_bid(self, player_id, team_id, amount):
+        self._standing[str(player_id)] = (team_id, float(amount))
+
+    def clear_lot(self, player_id):
+        self._standing.pop(str(player_id), None)
+
+    def forget_sid(self, sid):
+        self._buckets.pop(("sid", sid), None)
+
+
+def _build_admission():
+    settings = get_settings()
+    return BidAdmission(
+        rate=settings.bid_rate_per_second,
+        burst=settings.bid_burst,
+        queue_limit=settings.bid_queue_limit
+    )
+
+
+ADMISSION = _build_admission()
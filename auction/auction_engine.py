@@ -1,14 +1,28 @@
 import asyncio
-from datetime import datetime, timezone, timedelta
+import math
+from datetime import timedelta
 import pymysql
 
+from core.clock import get_clock
+from core.config import get_settings
 from core.database import get_db_connection
+from core.log import get_logger
+from core.read_model import bump_version
+from core.search_index import mark_player_status
+from core.metrics import TIMER_LAG, SETTLE_LATENESS
+from auction.auction_state import bid_lock, as_utc
+from auction.team_ledger import LEDGER
+from auction.admission import ADMISSION
+from auction.proxy_engine import PROXIES, run_proxies
+from auction.event_log import log_event
 from sockets.socket_manager import sio, team_sockets
 
-async def background_timer(player_id, mode, session_id):
-
-    print(f"⏰ Timer started for player {player_id}")
+logger = get_logger("auction")
+# Per-tick messages, rate limited in core.log
+tick_logger = get_logger("timer")
 
+async def _run_timer(player_id, settings):
+    """Tick until the lot's deadline; False when the lot is gone and the timer should stop."""
     while True:
 
         conn = get_db_connection()
@@ -22,55 +36,61 @@ async def background_timer(player_id, mode, session_id):
 
             state = cursor.fetchone()
             if not state:
-                print("⚠ Auction row missing - stopping timer")
-                return
+                logger.warning("Auction row missing, stopping timer", extra={"player_id": player_id})
+                return False
             
-            print("PAUSE STATE:", state["paused"])
+            tick_logger.debug("Timer tick", extra={"player_id": player_id, "paused": bool(state["paused"])})
 
         finally:
             cursor.close()
             conn.close()
 
         if not state:
-            print("⚠ Auction row missing — stopping timer")
-            return
+            logger.warning("Auction row missing, stopping timer", extra={"player_id": player_id})
+            return False
 
         # ---------------- PAUSED ----------------
         if state["paused"]:
-            await asyncio.sleep(1)
+            await get_clock().sleep(settings.timer_tick_seconds)
             continue
 
         # ---------------- NORMAL TIMER ----------------
-        now = datetime.now(timezone.utc)
+        now = get_clock().now()
 
         db_expires = state["expires_at"]
         if not db_expires:
-            print("⚠ expires_at missing")
-            return
-
-        if isinstance(db_expires, str):
-            db_expires = datetime.fromisoformat(db_expires)
+            logger.warning("expires_at missing, stopping timer", extra={"player_id": player_id})
+            return False
 
-        if db_expires.tzinfo is None:
-            db_expires = db_expires.replace(tzinfo=timezone.utc)
-
-        remaining = max(0, int((db_expires - now).total_seconds()))
+        remaining = (as_utc(db_expires) - now).total_seconds()
 
         if remaining <= 0:
-            break
+            return True
 
         await sio.emit("timer_update", {
-            "remaining_seconds": remaining,
+            "remaining_seconds": math.ceil(remaining),
             "server_time": now.isoformat()
         })
 
-        await asyncio.sleep(1)
+        # Last tick is shortened so the loop wakes up at the deadline itself
+        interval = min(settings.timer_tick_seconds, remaining)
+        slept_at = get_clock().monotonic()
+        await get_clock().sleep(interval)
+        TIMER_LAG.observe(max(0.0, get_clock().monotonic() - slept_at - interval))
 
-    print("⏰ Timer expired")
 
+async def _settle(player_id, settings):
+    """
+    Sell the lot or mark it unsold, under the bid lock. None when the lot is
+    gone, False when its deadline has not really passed (extended or paused).
+    """
     conn = get_db_connection()
     cursor = conn.cursor(pymysql.cursors.DictCursor)
 
+    # Bids already waiting on the lock arrived before this point; they are
+    # judged against the deadline before the lot is settled
+    await bid_lock.acquire()
+
     try:
 
         cursor.execute(
@@ -81,7 +101,18 @@ async def background_timer(player_id, mode, session_id):
         auction = cursor.fetchone()
 
         if not auction:
-            return
+            return None
+
+        # A bid queued before the deadline may have extended it (anti-snipe),
+        # or the lot was paused meanwhile: back to the timer, nothing is settled
+        if auction["paused"] or as_utc(auction["expires_at"]) > get_clock().now():
+            conn.rollback()
+            return False
+
+        SETTLE_LATENESS.observe(max(
+            0.0,
+            (get_clock().now() - as_utc(auction["expires_at"])).total_seconds()
+        ))
 
         # ---------------- HIGHEST BID ----------------
         cursor.execute("""
@@ -95,20 +126,15 @@ async def background_timer(player_id, mode, session_id):
 
         top_bid = cursor.fetchone()
 
-        if top_bid:
+        ledger_update = None
 
-            cursor.execute("""
-            UPDATE teams
-            SET purse = purse - %s
-            WHERE team_id = %s
-            """, (top_bid["bid_amount"], top_bid["team_id"]))
+        if top_bid:
 
-            cursor.execute(
-                "SELECT purse FROM teams WHERE team_id=%s",
-                (top_bid["team_id"],)
+            # teams.purse and team_ledger move together in this transaction
+            ledger_update = LEDGER.record_sale(
+                cursor, top_bid["team_id"], player_id, top_bid["bid_amount"]
             )
-            row = cursor.fetchone()
-            updated_purse = float(row["purse"])
+            updated_purse = ledger_update["team"]["purse"]
             winner_sid = team_sockets.get(top_bid["team_id"])
 
             if winner_sid:
@@ -156,7 +182,7 @@ async def background_timer(player_id, mode, session_id):
          })
 
             await sio.emit("next_player_loading", {
-                "delay": 10
+                "delay": settings.inter_lot_delay
             })
         else:
 
@@ -188,21 +214,62 @@ async def background_timer(player_id, mode, session_id):
             })
 
             await sio.emit("next_player_loading", {
-                "delay": 10
+                "delay": settings.inter_lot_delay
             })
 
         cursor.execute("DELETE FROM current_auction WHERE player_id=%s", (player_id,))
         cursor.execute("DELETE FROM live_bids WHERE player_id=%s", (player_id,))
 
+        log_event(
+            cursor, "settled", player_id,
+            top_bid["team_id"] if top_bid else None,
+            top_bid["bid_amount"] if top_bid else None,
+            status="sold" if top_bid else "unsold",
+            category=ledger_update["category"] if ledger_update else None
+        )
+
         conn.commit()
+        if ledger_update:
+            LEDGER.apply(ledger_update)
+        bump_version()
+        mark_player_status(player_id, "sold" if top_bid else "unsold")
+        PROXIES.clear(player_id)
+        ADMISSION.clear_lot(player_id)
+        return True
 
     finally:
         cursor.close()
         conn.close()
+        bid_lock.release()
+
+
+async def background_timer(player_id, mode, session_id):
+
+    settings = get_settings()
+
+    logger.info("Timer started", extra={"player_id": player_id})
+
+    # Maximums registered before the lot opened place the opening bid
+    await run_proxies(player_id)
+
+    while True:
+        if not await _run_timer(player_id, settings):
+            return
+
+        logger.info("Timer expired", extra={"player_id": player_id})
+
+        settled = await _settle(player_id, settings)
+
+        if settled is None:
+            return
+        if settled:
+            break
+
+        logger.info("Deadline moved while settling, timer resumed", extra={"player_id": player_id})
 
     # ---------------- DELAY BEFORE NEXT PLAYER ----------------
-    print("⏳ Waiting 10 seconds before next player")
-    await asyncio.sleep(10)
+    logger.info("Waiting %s seconds before next player", settings.inter_lot_delay)
+    await get_clock().sleep(settings.inter_lot_delay)
 
     conn = get_db_connection()
     cursor = conn.cursor(pymysql.cursors.DictCursor)
@@ -223,12 +290,12 @@ async def background_timer(player_id, mode, session_id):
         next_player = cursor.fetchone()
 
         if not next_player:
-            print("🏁 Auction finished")
+            logger.info("Auction finished")
             await sio.emit("auction_finished", {})
             return
 
-        start_time = datetime.now(timezone.utc)
-        duration = 120
+        start_time = get_clock().now()
+        duration = settings.default_lot_duration
         expires_at = start_time + timedelta(seconds=duration)
 
         cursor.execute("""
@@ -243,8 +310,16 @@ async def background_timer(player_id, mode, session_id):
             mode
         ))
 
+        log_event(
+            cursor, "lot_started", next_player["id"],
+            category=next_player["category"], base_price=next_player.get("base_price"),
+            expires_at=expires_at, duration=duration, mode=mode
+        )
+
         conn.commit()
 
+        lot = LEDGER.open_lot(cursor, next_player)
+
         await sio.emit("auction_started", {
             "player": {
                 "id": next_player["id"],
@@ -259,6 +334,8 @@ async def background_timer(player_id, mode, session_id):
             "duration": duration,
             "expires_at": expires_at.isoformat(),
             "current_bid": float(next_player.get("base_price") or 0),
+            "max_bids": LEDGER.lot_max_bids(next_player["category"]),
+            "eligible_teams": LEDGER.eligible_teams(lot),
             "history": []
         })
 
@@ -270,7 +347,7 @@ async def background_timer(player_id, mode, session_id):
             )
         )
 
-        print(f"🚀 Next auction started for {next_player['name']}")
+        logger.info("Next auction started", extra={"player_id": next_player["id"], "player": next_player["name"]})
 
     finally:
         cursor.close()
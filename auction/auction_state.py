@@ -0,0 +1,17 @@
+import asyncio
+from datetime import datetime, timezone
+
+# Serialises bid handling and lot settlement. Bids queued on the lock were
+# received before the settlement started, so they are decided first.
+bid_lock = asyncio.Lock()
+
+
+def as_utc(value):
+    """expires_at / start_time columns come back naive (stored as UTC)."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+
+    return value
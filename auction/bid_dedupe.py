@@ -0,0 +1,51 @@
+import asyncio
+from collections import OrderedDict
+
+from core.config import get_settings
+
+
+class BidDedupe:
+    """
+    Outcome of recent place_bid calls per team, keyed by the client's
+    request_id. A retry gets the original outcome back instead of being
+    validated and written again; a retry that arrives while the original
+    is still queued on the bid lock waits for it.
+
+    Only touched from the event loop, so no locking.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._teams = {}         # team_id -> OrderedDict(request_id -> Future of (event, payload))
+
+    def claim(self, team_id, request_id):
+        """
+        Returns (future, first). The first caller for a request_id runs the
+        bid and must settle the future with record() or forget().
+        """
+        recent = self._teams.setdefault(str(team_id), OrderedDict())
+        outcome = recent.get(request_id)
+
+        if outcome is not None:
+            recent.move_to_end(request_id)
+            return outcome, False
+
+        outcome = recent[request_id] = asyncio.get_running_loop().create_future()
+
+        while len(recent) > self.size:
+            recent.popitem(last=False)
+
+        return outcome, True
+
+    def record(self, outcome, event, payload):
+        if not outcome.done():
+            outcome.set_result((event, payload))
+
+    def forget(self, team_id, request_id, outcome):
+        """Drop an outcome that should not be replayed (server errors); waiters still get it."""
+        recent = self._teams.get(str(team_id), {})
+        if recent.get(request_id) is outcome:
+            del recent[request_id]
+
+
+BID_DEDUPE = BidDedupe(get_settings().bid_dedupe_size)
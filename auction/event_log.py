@@ -0,0 +1,343 @@
+import argparse
+import asyncio
+import json
+import threading
+from collections import deque
+from datetime import datetime
+from decimal import Decimal
+
+import pymysql
+from fastapi.concurrency import run_in_threadpool
+
+from core.clock import get_clock
+from core.config import get_settings
+from core.database import get_db_connection
+from core.log import get_logger
+
+logger = get_logger("events")
+
+INSERT_EVENT_SQL = """
+    INSERT INTO auction_events (event_type, player_id, team_id, amount, data, occurred_at)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+EVENT_TYPES = (
+    "session_started", "lot_started", "bid_accepted", "bid_rejected",
+    "paused", "resumed", "extended", "settled",
+)
+
+# Rejected bids change no state; they are buffered and written in batches by
+# the compaction task, on its own transaction, instead of costing a commit each
+_rejected = deque(maxlen=10000)
+_rejected_lock = threading.Lock()
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def _row(event_type, player_id, team_id, amount, data, occurred_at=None):
+    return (
+        event_type,
+        player_id,
+        team_id,
+        amount,
+        json.dumps(data, default=_json_default) if data else None,
+        occurred_at or get_clock().now(),
+    )
+
+
+def flush_rejected(conn):
+    """Write buffered rejections and commit; they go back in the buffer if the write fails."""
+    with _rejected_lock:
+        rows = list(_rejected)
+        _rejected.clear()
+
+    if not rows:
+        return
+
+    cursor = conn.cursor()
+
+    try:
+        cursor.executemany(INSERT_EVENT_SQL, rows)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        with _rejected_lock:
+            _rejected.extendleft(reversed(rows))
+        raise
+    finally:
+        cursor.close()
+
+
+def log_event(cursor, event_type, player_id=None, team_id=None, amount=None, **data):
+    """Append an event inside the caller's transaction, so it commits with the change it records."""
+    cursor.execute(INSERT_EVENT_SQL, _row(event_type, player_id, team_id, amount, data))
+
+
+def log_rejected(player_id, team_id, amount, reason):
+    # Straight from the client: values the columns cannot hold are recorded as NULL
+    row = _row("bid_rejected", _as_int(player_id), _as_int(team_id), _as_amount(amount), {"reason": reason})
+
+    with _rejected_lock:
+        _rejected.append(row)
+
+
+# ---------- PROJECTION ----------
+# AUTO_INCREMENT ids are handed out at insert, not at commit, so an event can
+# become visible after a higher id already has. Replay re-reads this many ids
+# behind last_event_id and skips the ones it has applied.
+REPLAY_WINDOW = 1000
+
+
+class AuctionProjection:
+    """Auction and team state folded from the event log."""
+
+    def __init__(self):
+        self.last_event_id = 0
+        self.recent_ids = set()  # applied ids inside the replay window
+        self.categories = []     # bit order of category_mask
+        self.teams = {}          # team_id -> purse, spent, squad_count, category_mask
+        self.lot = None          # player_id, category, base_price, expires_at, paused, remaining, bids
+        self.sold = {}           # player_id -> [team_id, amount]
+        self.unsold = []
+        self.counts = {}         # event_type -> events applied
+
+    # ---------- STATE ----------
+    def to_state(self):
+        return {
+            "last_event_id": self.last_event_id,
+            "recent_ids": sorted(self.recent_ids),
+            "categories": self.categories,
+            "teams": {str(t): e for t, e in self.teams.items()},
+            "lot": self.lot,
+            "sold": {str(p): s for p, s in self.sold.items()},
+            "unsold": self.unsold,
+            "counts": self.counts,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        projection = cls()
+        projection.last_event_id = state["last_event_id"]
+        if "recent_ids" in state:
+            projection.recent_ids = set(state["recent_ids"])
+        else:
+            # Snapshot from before the replay window: everything up to its id was applied
+            projection.recent_ids = set(range(projection.window_start() + 1, projection.last_event_id + 1))
+        projection.categories = state["categories"]
+        projection.teams = {int(t): e for t, e in state["teams"].items()}
+        projection.lot = state["lot"]
+        projection.sold = {int(p): s for p, s in state["sold"].items()}
+        projection.unsold = state["unsold"]
+        projection.counts = state.get("counts", {})
+        return projection
+
+    def window_start(self):
+        return max(self.last_event_id - REPLAY_WINDOW, 0)
+
+    def trim_window(self):
+        start = self.window_start()
+        self.recent_ids = {i for i in self.recent_ids if i > start}
+
+    # ---------- EVENTS ----------
+    def apply(self, event):
+        if event["id"] in self.recent_ids:
+            return
+
+        kind = event["event_type"]
+        data = event.get("data") or {}
+
+        if isinstance(data, str):
+            data = json.loads(data)
+
+        handler = getattr(self, f"_on_{kind}", None)
+        if handler is not None:
+            handler(event, data)
+
+        self.last_event_id = max(self.last_event_id, event["id"])
+        self.recent_ids.add(event["id"])
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+
+    def _on_session_started(self, event, data):
+        self.categories = list(data["categories"])
+        self.teams = {int(t["team_id"]): {
+            "purse": t["purse"],
+            "spent": t["spent"],
+            "squad_count": t["squad_count"],
+            "category_mask": t["category_mask"],
+        } for t in data["teams"]}
+        self.lot = None
+
+    def _on_lot_started(self, event, data):
+        self.lot = {
+            "player_id": event["player_id"],
+            "category": data.get("category"),
+            "base_price": data.get("base_price"),
+            "expires_at": data.get("expires_at"),
+            "paused": False,
+            "remaining": None,
+            "bids": {},
+        }
+
+    def _on_bid_accepted(self, event, data):
+        if self.lot and self.lot["player_id"] == event["player_id"]:
+            self.lot["bids"][str(event["team_id"])] = float(event["amount"])
+
+    def _on_paused(self, event, data):
+        if self.lot:
+            self.lot["paused"] = True
+            self.lot["remaining"] = data.get("remaining")
+
+    def _on_resumed(self, event, data):
+        if self.lot:
+            self.lot["paused"] = False
+            self.lot["remaining"] = None
+            self.lot["expires_at"] = data.get("expires_at")
+
+    def _on_extended(self, event, data):
+        if self.lot:
+            self.lot["expires_at"] = data.get("expires_at")
+
+    def _on_settled(self, event, data):
+        player_id = event["player_id"]
+
+        if data.get("status") == "sold":
+            team = self.teams.setdefault(int(event["team_id"]), {
+                "purse": 0.0, "spent": 0.0, "squad_count": 0, "category_mask": 0,
+            })
+            amount = float(event["amount"])
+            category = data.get("category")
+
+            team["purse"] -= amount
+            team["spent"] += amount
+            team["squad_count"] += 1
+
+            if category is not None:
+                if category not in self.categories:
+                    self.categories.append(category)
+                team["category_mask"] |= 1 << self.categories.index(category)
+
+            self.sold[player_id] = [int(event["team_id"]), amount]
+            # Re-run from the unsold pool
+            if player_id in self.unsold:
+                self.unsold.remove(player_id)
+        elif player_id not in self.unsold:
+            self.unsold.append(player_id)
+
+        if self.lot and self.lot["player_id"] == player_id:
+            self.lot = None
+
+
+# ---------- REPLAY / SNAPSHOTS ----------
+def replay(cursor, batch_size=5000):
+    """State as of the last event: latest snapshot plus the events it has not applied."""
+    cursor.execute("SELECT state FROM auction_snapshots ORDER BY last_event_id DESC LIMIT 1")
+    row = cursor.fetchone()
+
+    projection = AuctionProjection.from_state(json.loads(row["state"])) if row else AuctionProjection()
+    after = projection.window_start()
+
+    while True:
+        cursor.execute(
+            """
+            SELECT id, event_type, player_id, team_id, amount, data
+            FROM auction_events
+            WHERE id > %s
+            ORDER BY id
+            LIMIT %s
+            """,
+            (after, batch_size)
+        )
+        events = cursor.fetchall()
+
+        for event in events:
+            projection.apply(event)
+            after = event["id"]
+
+        projection.trim_window()
+
+        if len(events) < batch_size:
+            return projection
+
+
+def write_snapshot(cursor, projection):
+    cursor.execute(
+        "INSERT INTO auction_snapshots (last_event_id, state) VALUES (%s, %s)",
+        (projection.last_event_id, json.dumps(projection.to_state(), default=_json_default))
+    )
+
+
+def compact(min_events=None):
+    """Flush buffered rejections and snapshot if enough events piled up since the last one."""
+    settings = get_settings()
+    min_events = settings.event_snapshot_min_events if min_events is None else min_events
+
+    conn = get_db_connection()
+
+    if conn is None:
+        return None
+
+    cursor = conn.cursor(pymysql.cursors.DictCursor)
+
+    try:
+        flush_rejected(conn)
+
+        cursor.execute("SELECT COALESCE(MAX(last_event_id), 0) AS last_id FROM auction_snapshots")
+        snapshot_id = cursor.fetchone()["last_id"]
+
+        projection = replay(cursor)
+
+        if projection.last_event_id - snapshot_id >= max(min_events, 1):
+            write_snapshot(cursor, projection)
+            conn.commit()
+            logger.info("Auction snapshot written", extra={"last_event_id": projection.last_event_id})
+
+        return projection
+
+    except Exception:
+        conn.rollback()
+        logger.exception("Auction snapshot failed")
+        return None
+
+    finally:
+        cursor.close()
+        conn.close()
+
+
+async def snapshot_loop(interval):
+    """Background task: periodic compaction off the event loop."""
+    while True:
+        await asyncio.sleep(interval)
+        await run_in_threadpool(compact)
+
+
+# ---------- CLI ----------
+def main():
+    parser = argparse.ArgumentParser(description="Replay or snapshot the auction event log")
+    parser.add_argument("command", choices=["replay", "snapshot"])
+    args = parser.parse_args()
+
+    if args.command == "snapshot":
+        projection = compact(min_events=1)
+    else:
+        conn = get_db_connection()
+        cursor = conn.cursor(pymysql.cursors.DictCursor)
+        try:
+            projection = replay(cursor)
+        finally:
+            cursor.close()
+            conn.close()
+
+    if projection is None:
+        raise SystemExit("Event log unavailable")
+
+    print(json.dumps(projection.to_state(), indent=2, default=_json_default))
+
+
+if __name__ == "__main__":
+    main()
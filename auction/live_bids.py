@@ -0,0 +1,149 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from core.config import get_settings
+from core.log import get_logger
+from auction.auction_state import as_utc
+from auction.admission import ADMISSION
+from auction.event_log import log_event
+from sockets.socket_manager import sio
+
+logger = get_logger("auction")
+
+
+def insert_bid(cursor, player_id, team_id, amount):
+    """Record a bid as the team's standing bid and in the history (caller commits)."""
+    cursor.execute(
+        """
+        INSERT INTO live_bids
+        (player_id, team_id, bid_amount, bid_time)
+        VALUES (%s,%s,%s,NOW())
+        ON DUPLICATE KEY UPDATE
+            bid_amount = VALUES(bid_amount),
+            bid_time = NOW()
+        """,
+        (player_id, team_id, amount)
+    )
+
+    cursor.execute(
+        """
+        INSERT INTO bids
+        (player_id, team_id, bid_amount, bid_time)
+        VALUES (%s,%s,%s,NOW())
+        """,
+        (player_id, team_id, amount)
+    )
+
+
+TOP_BID_SQL = """
+    SELECT team_id, bid_amount
+    FROM live_bids
+    WHERE player_id = %s
+    ORDER BY bid_amount DESC
+    LIMIT 1
+"""
+
+
+def top_bid(cursor, player_id):
+    cursor.execute(TOP_BID_SQL, (player_id,))
+
+    return cursor.fetchone()
+
+
+async def publish_bids(cursor, conn, player_id, base_price, received_at, trace=None):
+    """
+    Broadcast the lot's standing after a committed bid, extending the timer
+    when the bid landed inside the anti-snipe window.
+    """
+    settings = get_settings()
+
+    # ---------- FETCH HIGHEST BID ----------
+    if trace:
+        trace.stage("broadcast_query")
+    cursor.execute("""
+    SELECT b.team_id, b.bid_amount, t.name AS team_name
+    FROM live_bids b
+    JOIN teams t ON b.team_id = t.team_id
+    WHERE b.player_id = %s
+    ORDER BY b.bid_amount DESC
+    LIMIT 1
+    """, (player_id,))
+
+    highest = cursor.fetchone()
+
+    if highest:
+        if isinstance(highest["bid_amount"], Decimal):
+            highest["bid_amount"] = float(highest["bid_amount"])
+
+        if isinstance(highest["team_id"], Decimal):
+            highest["team_id"] = int(highest["team_id"])
+
+        ADMISSION.note_top_bid(player_id, highest["team_id"], highest["bid_amount"])
+
+    # ---------- FETCH BID HISTORY ----------
+    cursor.execute("""
+    SELECT b.team_id, t.name AS team_name, b.bid_amount, b.bid_time
+    FROM live_bids b
+    JOIN teams t ON b.team_id = t.team_id
+    WHERE b.player_id = %s
+    ORDER BY b.bid_time ASC
+    """, (player_id,))
+
+    history = cursor.fetchall()
+
+    for h in history:
+        if isinstance(h["bid_amount"], Decimal):
+            h["bid_amount"] = float(h["bid_amount"])
+
+        if h.get("bid_time"):
+            h["bid_time"] = h["bid_time"].isoformat()
+
+    if highest:
+        highest_bid_amount = float(highest["bid_amount"])
+    else:
+        highest_bid_amount = base_price
+
+
+    #----------- Timer Extension On last Second Bid --------------
+    if trace:
+        trace.stage("timer_extension")
+    cursor.execute("""
+    SELECT expires_at
+    FROM current_auction
+    LIMIT 1
+    """)
+
+    row = cursor.fetchone()
+
+    if row:
+        remaining = (as_utc(row["expires_at"]) - received_at).total_seconds()
+    else:
+        remaining = 0
+
+    if 0 < remaining <= settings.anti_snipe_window:
+        cursor.execute("""
+        UPDATE current_auction
+        SET expires_at = DATE_ADD(expires_at, INTERVAL %s SECOND)
+        """, (settings.anti_snipe_extension,))
+        log_event(
+            cursor, "extended", player_id,
+            expires_at=as_utc(row["expires_at"]) + timedelta(seconds=settings.anti_snipe_extension)
+        )
+        conn.commit()
+        if trace:
+            trace.attrs["extended"] = True
+
+        logger.info("Auction timer extended", extra={"player_id": player_id, "seconds": settings.anti_snipe_extension})
+        await sio.emit("timer_update", {
+            "remaining_seconds": settings.anti_snipe_extension,
+            "extended": True
+        })
+    # ---------- BROADCAST UPDATE ----------
+    if trace:
+        trace.stage("broadcast_emit")
+    await sio.emit("auction_update", {
+        "player_id": player_id,
+        "current_bid": highest_bid_amount,
+        "highest_bid": highest,
+        "history": history,
+    })
@@ -0,0 +1,48 @@
+def reserve_aware_max_bids(purses, owned, slots_left, min_prices):
+    """
+    Maximum legal bid of every team for a player of every category, in one
+    vectorized pass.
+
+    purses      (T,)   remaining purse per team
+    owned       (T, C) True where the team already has that category
+    slots_left  (T,)   open squad slots per team
+    min_prices  (C,)   cheapest unsold base price per category, inf if none left
+
+    For team t bidding on a category-c player, the reserve is the cheapest way
+    to fill its other open slots: one player from each of the (slots_left - 1)
+    cheapest categories it still lacks, c excluded. The max bid is
+    purse - reserve, and 0 where the team owns c or its squad is full.
+    """
+    # NumPy is only needed once the ledger is built, keep it out of worker import
+    import numpy as np
+
+    purses = np.asarray(purses, dtype=float)
+    # Reshaped so an empty league still comes out (T, C), not (0,)
+    owned = np.asarray(owned, dtype=bool).reshape(len(purses), len(min_prices))
+    slots_left = np.asarray(slots_left, dtype=int)
+    min_prices = np.asarray(min_prices, dtype=float)
+
+    teams, categories = owned.shape
+    if teams == 0 or categories == 0:
+        return np.zeros((teams, categories))
+
+    # Price of each category the team still needs
+    needed = np.where(owned, np.inf, min_prices[None, :])
+
+    # [t, c, :] = team t's needed prices with the lot's own category c removed
+    others = np.broadcast_to(needed[:, None, :], (teams, categories, categories)).copy()
+    diagonal = np.arange(categories)
+    others[:, diagonal, diagonal] = np.inf
+    others.sort(axis=2)
+
+    fillable = np.isfinite(others)
+    cumulative = np.cumsum(np.where(fillable, others, 0.0), axis=2)
+
+    # Slots still to fill after this lot, capped by categories that have players left
+    to_fill = np.minimum(np.maximum(slots_left - 1, 0)[:, None], fillable.sum(axis=2))
+    picked = np.take_along_axis(cumulative, np.maximum(to_fill - 1, 0)[..., None], axis=2)[..., 0]
+    reserve = np.where(to_fill > 0, picked, 0.0)
+
+    max_bids = np.maximum(purses[:, None] - reserve, 0.0)
+    max_bids[owned | (slots_left[:, None] <= 0)] = 0.0
+    return max_bids
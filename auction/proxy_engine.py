@@ -0,0 +1,196 @@
+import math
+import threading
+import pymysql
+
+from core.clock import get_clock
+from core.config import get_settings
+from core.database import get_db_connection
+from core.log import get_logger
+from core.metrics import BIDS
+from auction.auction_state import bid_lock, as_utc
+from auction.live_bids import insert_bid, publish_bids, top_bid
+from auction.team_ledger import LEDGER
+from auction.event_log import log_event
+
+logger = get_logger("proxy")
+
+
+class ProxyBook:
+    """
+    Private maximums per lot, kept in memory only. Registration order is
+    the tie-break: of two equal maximums the earlier one wins.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._books = {}         # player_id -> {team_id: max amount}, in registration order
+
+    def set(self, player_id, team_id, max_amount):
+        with self._lock:
+            book = self._books.setdefault(int(player_id), {})
+            # Changing a maximum gives up the place in the queue
+            book.pop(int(team_id), None)
+            book[int(team_id)] = float(max_amount)
+
+    def cancel(self, player_id, team_id):
+        with self._lock:
+            self._books.get(int(player_id), {}).pop(int(team_id), None)
+
+    def clear(self, player_id):
+        with self._lock:
+            self._books.pop(int(player_id), None)
+
+    def entries(self, player_id):
+        with self._lock:
+            return list(self._books.get(int(player_id), {}).items())
+
+
+PROXIES = ProxyBook()
+
+
+def resolve(leader, amount, proxies, base_price, increment):
+    """
+    Play out every proxy against the standing bid in one pass.
+
+    leader / amount   standing top bid (leader None before the first bid)
+    proxies           [(team_id, max amount)] in registration order
+
+    Bids climb a ladder of MIN_INCREMENT steps from the standing bid (or the
+    base price). The highest maximum wins - the standing bidder, then the
+    earliest registration, on ties - one step above the highest rung the
+    runner-up can reach, or on that rung when its own maximum is no higher.
+    Returns that single (team_id, amount) bid, or None when no proxy can
+    beat the standing bid.
+    """
+    start = amount if leader is not None else base_price
+    required = amount + increment if leader is not None else base_price
+
+    def reach(max_amount):
+        if increment <= 0:
+            return max_amount
+        return start + math.floor((max_amount - start) / increment) * increment
+
+    # The leader defends with its own proxy, if it has one
+    leader_max = amount if leader is not None else None
+    for team_id, max_amount in proxies:
+        if team_id == leader and max_amount > leader_max:
+            leader_max = max_amount
+
+    challengers = [(t, m) for t, m in proxies if t != leader and m >= required]
+    if not challengers:
+        return None
+
+    best_team, best_max = challengers[0]
+    for team_id, max_amount in challengers[1:]:
+        if max_amount > best_max:
+            best_team, best_max = team_id, max_amount
+
+    if leader_max is not None and leader_max >= best_max:
+        winner, winner_max, runner_max = leader, leader_max, best_max
+    else:
+        winner, winner_max = best_team, best_max
+        runner_max = max(
+            [m for t, m in challengers if t != best_team] + ([leader_max] if leader is not None else []),
+            default=None
+        )
+
+    # Unopposed opening bid
+    if runner_max is None:
+        return winner, required
+
+    runner_last = reach(runner_max)
+    if runner_last + increment <= winner_max:
+        return winner, runner_last + increment
+    return winner, runner_last
+
+
+def counter_bid(lot, leader, amount):
+    """The bid the lot's proxies place against `leader` at `amount`, capped by each team's max bid."""
+    proxies = [
+        (team_id, min(max_amount, LEDGER.max_bid(team_id, lot["category"])))
+        for team_id, max_amount in PROXIES.entries(lot["player_id"])
+        if LEDGER.can_bid(team_id, lot)
+    ]
+
+    if not proxies:
+        return None
+
+    bid = resolve(
+        int(leader) if leader is not None else None,
+        amount,
+        proxies,
+        lot["base_price"],
+        get_settings().min_increment
+    )
+
+    # The leader's proxy only moves when challenged
+    if bid and leader is not None and bid[0] == int(leader) and bid[1] <= amount:
+        return None
+
+    return bid
+
+
+async def run_proxies(player_id):
+    """
+    Let registered proxies act without a manual bid: when a maximum is set
+    and when a lot opens. Persists and broadcasts at most one bid.
+    """
+    received_at = get_clock().now()
+
+    if not PROXIES.entries(player_id):
+        return None
+
+    async with bid_lock:
+        conn = get_db_connection()
+
+        if conn is None:
+            logger.warning("Proxy bids skipped, database unavailable", extra={"player_id": player_id})
+            return None
+
+        conn.begin()
+        cursor = conn.cursor(pymysql.cursors.DictCursor)
+
+        try:
+            cursor.execute("SELECT * FROM current_auction LIMIT 1 FOR UPDATE")
+            auction = cursor.fetchone()
+
+            if (
+                not auction
+                or auction.get("paused")
+                or str(auction["player_id"]) != str(player_id)
+                or received_at >= as_utc(auction["expires_at"])
+            ):
+                conn.rollback()
+                return None
+
+            lot = LEDGER.lot_for(cursor, player_id)
+            row = top_bid(cursor, player_id)
+
+            bid = counter_bid(
+                lot,
+                row["team_id"] if row else None,
+                float(row["bid_amount"]) if row else 0.0
+            ) if lot else None
+
+            if bid is None:
+                conn.rollback()
+                return None
+
+            insert_bid(cursor, player_id, *bid)
+            log_event(cursor, "bid_accepted", player_id, *bid, proxy=True)
+            conn.commit()
+
+            BIDS.inc(outcome="accepted", reason="proxy")
+            logger.info("Proxy bid placed", extra={"team_id": bid[0], "player_id": player_id, "bid_amount": bid[1]})
+
+            await publish_bids(cursor, conn, player_id, lot["base_price"], received_at)
+            return bid
+
+        except Exception:
+            conn.rollback()
+            logger.exception("Proxy resolution failed", extra={"player_id": player_id})
+            return None
+
+        finally:
+            cursor.close()
+            conn.close()
@@ -0,0 +1,379 @@
+import threading
+from decimal import Decimal
+
+from core.config import get_settings
+from core.database import get_db_connection
+from core.log import get_logger
+from auction.max_bid import reserve_aware_max_bids
+
+logger = get_logger("ledger")
+
+# Cheapest player still obtainable per category (unsold players can be re-run)
+MIN_PRICES_SQL = """
+    SELECT p.category, MIN(p.base_price) AS min_price
+    FROM players p
+    WHERE p.category IS NOT NULL
+      AND p.id <> %s
+      AND NOT EXISTS (SELECT 1 FROM sold_players sp WHERE sp.player_id = p.id)
+    GROUP BY p.category
+"""
+
+
+def _money(value):
+    return float(value) if isinstance(value, Decimal) else float(value or 0)
+
+
+class TeamLedger:
+    """
+    Per-team purse / spend / squad state, persisted in `team_ledger` and
+    mirrored in memory so bid validation never aggregates sold_players.
+
+    Categories map to bits in sorted order as of the last rebuild; a rebuild
+    recomputes every mask, so the mapping never has to be stored. Teams map
+    to bits the same way for the eligibility bitsets (who may still bid on
+    a category / on the open lot).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._teams = {}
+        self._max_bids = {}      # team_id -> {category: max legal bid}
+        self._team_bits = {}     # team_id -> bit index
+        self._eligible = {}      # category -> bitset of teams that may still bid on it
+        self.categories = {}
+        self.lot = None          # open lot: player_id, category, base_price, eligible bitset
+        self.loaded = False
+
+    # ---------- READS ----------
+    def get(self, team_id):
+        try:
+            return self._teams.get(int(team_id))
+        except (TypeError, ValueError):
+            return None
+
+    def category_bit(self, category):
+        bit = self.categories.get(category)
+        return None if bit is None else 1 << bit
+
+    def owns_category(self, team_id, category):
+        entry = self.get(team_id)
+        bit = self.category_bit(category)
+        return bool(entry and bit and entry["category_mask"] & bit)
+
+    def max_bid(self, team_id, category):
+        """Most the team may bid on a player of `category` and still fill its squad."""
+        entry = self.get(team_id)
+        if entry is None:
+            return 0.0
+        return self._max_bids.get(entry["team_id"], {}).get(category, entry["purse"])
+
+    def lot_max_bids(self, category):
+        """{team_id: max bid} for a lot, as sent in the lot snapshot."""
+        return {team_id: bids.get(category, 0.0) for team_id, bids in self._max_bids.items()}
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "categories": sorted(self.categories, key=self.categories.get),
+                "teams": [
+                    {**entry, "max_bids": self._max_bids.get(team_id, {})}
+                    for team_id, entry in self._teams.items()
+                ],
+            }
+
+    def can_bid(self, team_id, lot):
+        try:
+            bit = self._team_bits.get(int(team_id))
+        except (TypeError, ValueError):
+            return False
+        return bit is not None and bool(lot["eligible"] >> bit & 1)
+
+    def eligible_teams(self, lot):
+        return [team_id for team_id, bit in self._team_bits.items() if lot["eligible"] >> bit & 1]
+
+    def eligibility(self):
+        """category -> eligible team ids, for the admin view."""
+        with self._lock:
+            return {
+                category: [t for t, bit in self._team_bits.items() if self._eligible.get(category, 0) >> bit & 1]
+                for category in sorted(self.categories, key=self.categories.get)
+            }
+
+    # ---------- ELIGIBILITY ----------
+    def _eligibility(self, teams, max_bids):
+        """Team bit map and per-category bitsets; a team is eligible while its max bid is positive."""
+        team_bits = {team_id: bit for bit, team_id in enumerate(sorted(teams))}
+        eligible = {}
+
+        for team_id, bids in max_bids.items():
+            for category, limit in bids.items():
+                if limit > 0:
+                    eligible[category] = eligible.get(category, 0) | 1 << team_bits[team_id]
+
+        return team_bits, eligible
+
+    def _lot(self, player_id, category, base_price):
+        if category is None:
+            # Uncategorised players only need an open slot and the purse
+            squad_size = get_settings().squad_size
+            limits = {t: e["purse"] if e["squad_count"] < squad_size else 0.0 for t, e in self._teams.items()}
+            candidates = sum(1 << bit for t, bit in self._team_bits.items() if limits[t] > 0)
+        else:
+            limits = {t: bids.get(category, 0.0) for t, bids in self._max_bids.items()}
+            candidates = self._eligible.get(category, 0)
+
+        # Narrow the category bitset to teams that can afford the opening price
+        eligible = candidates
+        for team_id, bit in self._team_bits.items():
+            if candidates >> bit & 1 and limits[team_id] < base_price:
+                eligible &= ~(1 << bit)
+
+        return {"player_id": player_id, "category": category, "base_price": base_price, "eligible": eligible}
+
+    def open_lot(self, cursor, player):
+        """Fix the eligible bidders for a lot when it starts; `player` is a players row."""
+        self.ensure()
+
+        with self._lock:
+            self.lot = self._lot(player["id"], player["category"], _money(player.get("base_price")))
+            return self.lot
+
+    def lot_for(self, cursor, player_id):
+        """The open lot, reopened from `players` if this process missed its start."""
+        lot = self.lot
+
+        if lot is None or str(lot["player_id"]) != str(player_id):
+            cursor.execute("SELECT id, category, base_price FROM players WHERE id = %s", (player_id,))
+            row = cursor.fetchone()
+            lot = self.open_lot(cursor, row) if row else None
+
+        return lot
+
+    def _refresh_lot(self):
+        if self.lot is not None:
+            self.lot = self._lot(self.lot["player_id"], self.lot["category"], self.lot["base_price"])
+
+    # ---------- MAX BID ----------
+    def _compute_max_bids(self, cursor, teams, categories, exclude_player=None):
+        """Reserve-aware max bid for every team x category; also sets entry["max_bid"]."""
+        cursor.execute(MIN_PRICES_SQL, (exclude_player or 0,))
+        min_prices = {row["category"]: _money(row["min_price"]) for row in cursor.fetchall()}
+
+        names = sorted(categories, key=categories.get)
+        team_ids = list(teams)
+        squad_size = get_settings().squad_size
+
+        matrix = reserve_aware_max_bids(
+            [teams[t]["purse"] for t in team_ids],
+            [[bool(teams[t]["category_mask"] >> categories[c] & 1) for c in names] for t in team_ids],
+            [squad_size - teams[t]["squad_count"] for t in team_ids],
+            [min_prices.get(c, float("inf")) for c in names],
+        )
+
+        max_bids = {}
+        for team_id, row in zip(team_ids, matrix.tolist()):
+            max_bids[team_id] = dict(zip(names, row))
+            teams[team_id]["max_bid"] = max(row, default=0.0)
+
+        return max_bids
+
+    # ---------- REBUILD ----------
+    def rebuild(self, cursor):
+        """
+        Recompute every team from teams + sold_players and persist it. The
+        caller commits, and calls invalidate() if it rolls back instead.
+        """
+        cursor.execute("SELECT DISTINCT category FROM players WHERE category IS NOT NULL ORDER BY category")
+        categories = {row["category"]: bit for bit, row in enumerate(cursor.fetchall())}
+
+        cursor.execute("""
+            SELECT
+                t.team_id,
+                t.purse,
+                p.category,
+                sp.sold_price
+            FROM teams t
+            LEFT JOIN sold_players sp ON sp.team_id = t.team_id
+            LEFT JOIN players p ON sp.player_id = p.id
+        """)
+
+        teams = {}
+
+        for row in cursor.fetchall():
+            entry = teams.get(row["team_id"])
+
+            if entry is None:
+                entry = teams[row["team_id"]] = {
+                    "team_id": row["team_id"],
+                    "purse": _money(row["purse"]),
+                    "spent": 0.0,
+                    "squad_count": 0,
+                    "category_mask": 0,
+                    "max_bid": 0.0,
+                }
+
+            if row["sold_price"] is None:
+                continue
+
+            entry["spent"] += _money(row["sold_price"])
+            entry["squad_count"] += 1
+            if row["category"] in categories:
+                entry["category_mask"] |= 1 << categories[row["category"]]
+
+        max_bids = self._compute_max_bids(cursor, teams, categories)
+
+        cursor.execute("DELETE FROM team_ledger")
+
+        if teams:
+            cursor.executemany(
+                """
+                INSERT INTO team_ledger (team_id, purse, spent, squad_count, category_mask, max_bid)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                """,
+                [
+                    (e["team_id"], e["purse"], e["spent"], e["squad_count"], e["category_mask"], e["max_bid"])
+                    for e in teams.values()
+                ]
+            )
+
+        with self._lock:
+            self._teams = teams
+            self._max_bids = max_bids
+            self._team_bits, self._eligible = self._eligibility(teams, max_bids)
+            self.categories = categories
+            self._refresh_lot()
+            self.loaded = True
+
+        logger.info("Team ledger rebuilt", extra={"teams": len(teams), "categories": len(categories)})
+
+    def ensure(self):
+        """
+        Rebuild on first use or after invalidate(). Runs on its own connection
+        and commits, so a caller's rollback cannot leave the table behind the
+        mirror; call it before the caller's transaction writes anything.
+        """
+        if self.loaded:
+            return
+
+        conn = get_db_connection()
+
+        if conn is None:
+            raise RuntimeError("Database connection failed")
+
+        cursor = conn.cursor()
+
+        try:
+            self.rebuild(cursor)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            self.loaded = False
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+    def invalidate(self):
+        """Force a rebuild on next use (new teams, new categories)."""
+        self.loaded = False
+
+    # ---------- SETTLEMENT ----------
+    def record_sale(self, cursor, team_id, player_id, price):
+        """
+        Apply a sale to `teams` and `team_ledger` inside the caller's
+        settlement transaction, recomputing every team's max bids. Returns
+        the update; pass it to apply() once the transaction has committed.
+        """
+        self.ensure()
+
+        cursor.execute("SELECT category FROM players WHERE id = %s", (player_id,))
+        row = cursor.fetchone()
+        category = row["category"] if row else None
+
+        categories = dict(self.categories)
+        if category is not None and category not in categories:
+            # Category appeared after the last rebuild; give it the next bit
+            categories[category] = len(categories)
+
+        team_id = int(team_id)
+        teams = {tid: dict(entry) for tid, entry in self._teams.items()}
+        current = teams.get(team_id) or {
+            "team_id": team_id, "purse": 0.0, "spent": 0.0,
+            "squad_count": 0, "category_mask": 0, "max_bid": 0.0,
+        }
+        price = _money(price)
+
+        entry = teams[team_id] = {
+            **current,
+            "purse": current["purse"] - price,
+            "spent": current["spent"] + price,
+            "squad_count": current["squad_count"] + 1,
+            "category_mask": current["category_mask"] | (1 << categories[category] if category is not None else 0),
+        }
+
+        # The sold player no longer counts towards anyone's reserve
+        max_bids = self._compute_max_bids(cursor, teams, categories, exclude_player=player_id)
+
+        cursor.execute("""
+            UPDATE teams
+            SET purse = purse - %s,
+                Players_Bought = COALESCE(Players_Bought, 0) + 1
+            WHERE team_id = %s
+        """, (price, team_id))
+
+        cursor.execute("""
+            INSERT INTO team_ledger (team_id, purse, spent, squad_count, category_mask, max_bid)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                purse = VALUES(purse),
+                spent = VALUES(spent),
+                squad_count = VALUES(squad_count),
+                category_mask = VALUES(category_mask),
+                max_bid = VALUES(max_bid)
+        """, (
+            team_id, entry["purse"], entry["spent"],
+            entry["squad_count"], entry["category_mask"], entry["max_bid"]
+        ))
+
+        cursor.executemany(
+            "UPDATE team_ledger SET max_bid = %s WHERE team_id = %s",
+            [(e["max_bid"], tid) for tid, e in teams.items() if tid != team_id]
+        )
+
+        return {
+            "team": entry, "category": category,
+            "teams": teams, "max_bids": max_bids, "categories": categories,
+        }
+
+    def apply(self, update):
+        with self._lock:
+            self._teams = update["teams"]
+            self._max_bids = update["max_bids"]
+            self._team_bits, self._eligible = self._eligibility(update["teams"], update["max_bids"])
+            self.categories = update["categories"]
+            self._refresh_lot()
+
+
+LEDGER = TeamLedger()
+
+
+def load_ledger():
+    """Startup hook: build the ledger once the DB is reachable (after migrations)."""
+    conn = get_db_connection()
+
+    if conn is None:
+        logger.warning("Team ledger not built, database unavailable")
+        return
+
+    cursor = conn.cursor()
+
+    try:
+        LEDGER.rebuild(cursor)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        LEDGER.invalidate()
+        logger.exception("Team ledger rebuild failed")
+    finally:
+        cursor.close()
+        conn.close()
@@ -1,23 +1,23 @@
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
 
-SECRET_KEY = "JPL_SECRET_KEY"
-ALGORITHM ="HS256"
-ACCESS_TOKEN_EXPIRE_HOUR = 6
+from core.config import get_settings
 
 def create_access_token(data: dict):
+    settings = get_settings()
     to_encode = data.copy()
 
-    expire = datetime.utcnow() + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOUR)
+    expire = datetime.utcnow() + timedelta(hours=settings.access_token_expire_hours)
     to_encode.update({"exp":expire})
 
-    token = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    token = jwt.encode(to_encode, settings.secret_key, algorithm=settings.jwt_algorithm)
 
     return token
 
 def verify_token(token: str):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=ALGORITHM)
+        settings = get_settings()
+        payload = jwt.decode(token, settings.secret_key, algorithms=settings.jwt_algorithm)
         return payload
     
     except JWTError:
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Response, Request, HTTPException
 import bcrypt
 
+from core.config import get_settings
 from core.database import get_db_connection
 from auth.auth_handler import create_access_token, verify_token, get_token_from_request
 
@@ -50,7 +51,7 @@ def login(data: dict, response: Response):
         httponly=True,
         samesite="lax",
         secure=False,
-        max_age=60 * 60 * 6
+        max_age=60 * 60 * get_settings().access_token_expire_hours
     )
 
     return{
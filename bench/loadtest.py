@@ -0,0 +1,403 @@
+"""
+Socket.IO load test simulating an auction day against main:socket_app.
+
+N team clients and M spectators connect and join the auction, an admin
+starts lots and every team bids on a schedule drawn from the chosen arrival
+distribution. Reports p50/p99 bid-ack latency, broadcast fan-out latency,
+timer tick jitter, settle lateness and rejection counts by reason.
+
+    python -m bench.loadtest --start-server --seed \\
+        --teams 12 --spectators 200 --lots 5 --lot-duration 20 --arrivals storm
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import httpx
+import socketio
+
+from auth.auth_handler import create_access_token
+from core.config import get_settings
+from bench.stats import Recorder
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ARRIVALS = ("uniform", "poisson", "storm")
+
+
+def arrival_times(kind, duration, count, rng, storm_window=2.0, storm_share=0.7):
+    """Offsets (seconds from lot start) at which one team sends its bids."""
+    if count <= 0:
+        return []
+
+    if kind == "uniform":
+        return sorted(rng.uniform(0, duration) for _ in range(count))
+
+    if kind == "poisson":
+        rate = count / duration
+        offsets = []
+        t = rng.expovariate(rate)
+        while t < duration:
+            offsets.append(t)
+            t += rng.expovariate(rate)
+        return offsets
+
+    # storm: most bids land in the last `storm_window` seconds
+    storm_start = max(0.0, duration - storm_window)
+    late = int(round(count * storm_share))
+    offsets = [rng.uniform(0, storm_start) for _ in range(count - late)]
+    offsets += [rng.uniform(storm_start, duration) for _ in range(late)]
+    return sorted(offsets)
+
+
+def rejection_reason(error):
+    return re.sub(r"[₹\d.,]+", "#", error or "unknown").strip()
+
+
+def parse_time(value):
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+class Lot:
+    """What the clients currently know about the running lot."""
+
+    def __init__(self):
+        self.player_id = None
+        self.current_bid = 0.0
+        self.leader = None
+        self.started_at = None
+        self.expires_at = None
+        self.active = False
+
+
+class BenchClient:
+
+    # Expected interval between timer_update broadcasts
+    tick = 1.0
+
+    def __init__(self, url, recorder, lot, sent, team_id=None):
+        self.url = url
+        self.recorder = recorder
+        self.lot = lot
+        self.sent = sent
+        self.team_id = team_id
+        self.pending = None
+        self.last_tick = None
+        self.sio = socketio.AsyncClient(reconnection=False)
+
+        self.sio.on("bid_accepted", self.on_bid_accepted)
+        self.sio.on("bid_rejected", self.on_bid_rejected)
+        self.sio.on("auction_update", self.on_auction_update)
+        self.sio.on("timer_update", self.on_timer_update)
+
+    async def start(self):
+        await self.sio.connect(self.url, transports=["websocket"])
+        await self.sio.emit("join_auction", {"team_id": self.team_id} if self.team_id else {})
+
+    async def stop(self):
+        await self.sio.disconnect()
+
+    # ---------- BIDDING ----------
+    async def bid(self, increment, timeout=10.0):
+        lot = self.lot
+
+        if not lot.active or lot.leader == self.team_id:
+            return
+
+        amount = lot.current_bid + increment if lot.leader else lot.current_bid
+        future = asyncio.get_running_loop().create_future()
+        self.pending = future
+
+        started = time.perf_counter()
+        self.sent[(lot.player_id, self.team_id, amount)] = started
+
+        await self.sio.emit("place_bid", {
+            "team_id": self.team_id,
+            "player_id": lot.player_id,
+            "bid_amount": amount
+        })
+
+        try:
+            outcome, data = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.recorder.count("bids_timed_out")
+            return
+        finally:
+            self.pending = None
+
+        self.recorder.observe("bid_ack", time.perf_counter() - started)
+
+        if outcome == "accepted":
+            self.recorder.count("bids_accepted")
+        else:
+            self.recorder.count(f"rejected: {rejection_reason(data.get('error'))}")
+
+    def _resolve(self, outcome, data):
+        if self.pending is not None and not self.pending.done():
+            self.pending.set_result((outcome, data))
+
+    async def on_bid_accepted(self, data):
+        self._resolve("accepted", data)
+
+    async def on_bid_rejected(self, data):
+        self._resolve("rejected", data)
+
+    # ---------- BROADCASTS ----------
+    async def on_auction_update(self, data):
+        now = time.perf_counter()
+        highest = data.get("highest_bid") or {}
+        key = (data.get("player_id"), highest.get("team_id"), data.get("current_bid"))
+        started = self.sent.get(key)
+
+        if started is not None:
+            self.recorder.observe("broadcast_fanout", now - started)
+
+        if data.get("player_id") == self.lot.player_id:
+            self.lot.current_bid = max(self.lot.current_bid, float(data.get("current_bid") or 0))
+            self.lot.leader = highest.get("team_id")
+
+    async def on_timer_update(self, data):
+        now = time.time()
+
+        if data.get("extended"):
+            self.lot.expires_at = now + float(data["remaining_seconds"])
+            self.last_tick = None
+            return
+
+        if self.last_tick is not None:
+            self.recorder.observe("timer_tick_jitter", abs(now - self.last_tick - self.tick))
+        self.last_tick = now
+
+
+class Observer(BenchClient):
+    """Spectator that also follows the lot lifecycle for everyone else."""
+
+    def __init__(self, *args, on_lot_started, on_lot_ended, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_lot_started = on_lot_started
+        self.on_lot_ended = on_lot_ended
+        self.sio.on("auction_started", self.on_auction_started)
+        self.sio.on("auction_ended", self.on_auction_ended)
+        self.sio.on("auction_finished", self.on_auction_finished)
+
+    async def on_auction_started(self, data):
+        lot = self.lot
+        player = data.get("player") or {}
+        lot.player_id = player.get("id") or data.get("player_id")
+        lot.current_bid = float(data.get("current_bid") or player.get("base_price") or 0)
+        lot.leader = None
+        lot.started_at = time.perf_counter()
+        lot.expires_at = parse_time(data["expires_at"])
+        lot.active = True
+        self.on_lot_started()
+
+    async def on_auction_ended(self, data):
+        if self.lot.expires_at is not None:
+            self.recorder.observe("settle_lateness", max(0.0, time.time() - self.lot.expires_at))
+        self.recorder.count(f"lots_{data.get('status')}")
+        self.lot.active = False
+        self.on_lot_ended(finished=False)
+
+    async def on_auction_finished(self, data):
+        self.lot.active = False
+        self.on_lot_ended(finished=True)
+
+
+class LoadTest:
+
+    def __init__(self, args, team_ids):
+        self.args = args
+        self.team_ids = team_ids
+        self.rng = random.Random(args.seed_value)
+        self.recorder = Recorder()
+        self.lot = Lot()
+        self.sent = {}
+        self.lots_done = 0
+        self.done = asyncio.Event()
+        self.bid_tasks = []
+
+    def lot_started(self):
+        args = self.args
+
+        for team in self.teams:
+            offsets = arrival_times(
+                args.arrivals, args.lot_duration, args.bids_per_team, self.rng,
+                storm_window=args.storm_window, storm_share=args.storm_share
+            )
+            self.bid_tasks.append(asyncio.create_task(self.team_schedule(team, offsets)))
+
+    def lot_ended(self, finished):
+        self.lots_done += 1
+
+        if finished or self.lots_done >= self.args.lots:
+            self.done.set()
+
+    async def team_schedule(self, team, offsets):
+        lot = self.lot
+        player_id = lot.player_id
+
+        for offset in offsets:
+            delay = lot.started_at + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if not lot.active or lot.player_id != player_id:
+                return
+
+            await team.bid(self.args.min_increment)
+
+    async def admin_request(self, client, path, **kwargs):
+        token = create_access_token({"id": 0, "role": "admin", "name": "bench"})
+        return await client.post(
+            f"{self.args.url}{path}",
+            headers={"Authorization": f"Bearer {token}"},
+            **kwargs
+        )
+
+    async def run(self):
+        args = self.args
+        BenchClient.tick = args.timer_tick
+
+        self.teams = [
+            BenchClient(args.url, self.recorder, self.lot, self.sent, team_id=team_id)
+            for team_id in self.team_ids[:args.teams]
+        ]
+        spectators = [
+            BenchClient(args.url, self.recorder, self.lot, self.sent)
+            for _ in range(max(0, args.spectators - 1))
+        ]
+        observer = Observer(
+            args.url, self.recorder, self.lot, self.sent,
+            on_lot_started=self.lot_started,
+            on_lot_ended=self.lot_ended
+        )
+
+        clients = [observer] + self.teams + spectators
+
+        connect_started = time.perf_counter()
+        await asyncio.gather(*(client.start() for client in clients))
+        self.recorder.observe("connect_all", time.perf_counter() - connect_started)
+
+        async with httpx.AsyncClient(timeout=30) as http:
+            response = await self.admin_request(http, "/start-auction", json={
+                "mode": "random",
+                "duration": args.lot_duration
+            })
+            response.raise_for_status()
+
+            run_started = time.perf_counter()
+            await self.done.wait()
+            elapsed = time.perf_counter() - run_started
+
+            await self.admin_request(http, "/cancel-auction")
+
+        for task in self.bid_tasks:
+            task.cancel()
+
+        await asyncio.gather(*(client.stop() for client in clients), return_exceptions=True)
+
+        report = self.recorder.report()
+        counts = report["counts"]
+        attempts = sum(v for k, v in counts.items() if k == "bids_accepted" or k.startswith("rejected"))
+        rejected = sum(v for k, v in counts.items() if k.startswith("rejected"))
+
+        report["run"] = {
+            "teams": len(self.teams),
+            "spectators": len(spectators) + 1,
+            "lots": self.lots_done,
+            "arrivals": args.arrivals,
+            "elapsed_s": round(elapsed, 2),
+            "bids_per_s": round(attempts / elapsed, 2) if elapsed else None,
+            "rejection_rate": round(rejected / attempts, 4) if attempts else None,
+        }
+        return report
+
+
+def start_server(args):
+    env = dict(
+        os.environ,
+        JPL_ENV=os.environ.get("JPL_ENV", "bench"),
+        JPL_DEFAULT_LOT_DURATION=str(args.lot_duration),
+        JPL_INTER_LOT_DELAY=str(args.inter_lot_delay),
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:socket_app",
+         "--port", str(args.port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env
+    )
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            httpx.get(f"{args.url}/", timeout=1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+
+    process.terminate()
+    raise RuntimeError("Server did not come up in 30 seconds")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="Target server (default http://127.0.0.1:<port>)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--start-server", action="store_true", help="Run main:socket_app with uvicorn")
+    parser.add_argument("--seed", action="store_true", help="Reset tables and seed teams/players first")
+    parser.add_argument("--teams", type=int, default=10)
+    parser.add_argument("--spectators", type=int, default=50)
+    parser.add_argument("--lots", type=int, default=3)
+    parser.add_argument("--lot-duration", type=int, default=20)
+    parser.add_argument("--inter-lot-delay", type=int, default=2)
+    parser.add_argument("--timer-tick", type=float, default=1.0)
+    parser.add_argument("--min-increment", type=int, default=get_settings().min_increment)
+    parser.add_argument("--bids-per-team", type=int, default=5)
+    parser.add_argument("--arrivals", choices=ARRIVALS, default="uniform")
+    parser.add_argument("--storm-window", type=float, default=2.0)
+    parser.add_argument("--storm-share", type=float, default=0.7)
+    parser.add_argument("--seed-value", type=int, default=42, help="RNG seed for arrivals")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+    args.url = args.url or f"http://127.0.0.1:{args.port}"
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    team_ids = list(range(1, args.teams + 1))
+
+    if args.seed:
+        from bench.seed import seed
+        team_ids = seed(teams=args.teams, players=args.lots)
+
+    server = start_server(args) if args.start_server else None
+
+    try:
+        report = asyncio.run(LoadTest(args, team_ids).run())
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    output = json.dumps(report, indent=2)
+    print(output)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
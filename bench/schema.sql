@@ -0,0 +1,143 @@
+-- Generated by `python -m core.schema mysql` from core/schema.py; do not edit.
+
+CREATE TABLE teams (
+    team_id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL UNIQUE,
+    captain VARCHAR(255),
+    mobile_No VARCHAR(20),
+    email_Id VARCHAR(255),
+    Team_Rank INT DEFAULT 0,
+    Total_Budget DECIMAL(12,2) DEFAULT 0,
+    Season_Budget DECIMAL(12,2) DEFAULT 0,
+    Players_Bought INT DEFAULT 0,
+    purse DECIMAL(12,2) DEFAULT 0,
+    image_path VARCHAR(255)
+);
+
+CREATE TABLE users (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(255),
+    email VARCHAR(255) NOT NULL UNIQUE,
+    password VARCHAR(255) NOT NULL,
+    role VARCHAR(20) NOT NULL,
+    team_id INT NULL
+);
+
+CREATE TABLE captains (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    team_id INT,
+    image_path VARCHAR(255),
+    KEY idx_captains_name (name),
+    KEY idx_captains_team (team_id)
+);
+
+CREATE TABLE players (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL UNIQUE,
+    nickname VARCHAR(255),
+    age INT,
+    gender VARCHAR(20),
+    category VARCHAR(100),
+    jersey INT UNIQUE,
+    type VARCHAR(100),
+    mobile_No VARCHAR(20),
+    email_Id VARCHAR(255),
+    base_price DECIMAL(12,2),
+    total_runs INT,
+    highest_runs INT,
+    wickets_taken INT,
+    times_out INT,
+    teams_played TEXT,
+    image_path VARCHAR(255),
+    KEY idx_players_category_name (category, name),
+    KEY idx_players_type_name (type, name)
+);
+
+CREATE TABLE player_teams (
+    player_id INT NOT NULL,
+    team_id INT NOT NULL,
+    PRIMARY KEY (player_id, team_id),
+    KEY idx_player_teams_team (team_id, player_id)
+);
+
+CREATE TABLE current_auction (
+    player_id INT PRIMARY KEY,
+    start_time DATETIME(6),
+    expires_at DATETIME(6),
+    auction_duration INT,
+    mode VARCHAR(20),
+    paused TINYINT(1) DEFAULT 0,
+    paused_remaining INT NULL
+);
+
+CREATE TABLE live_bids (
+    player_id INT NOT NULL,
+    team_id INT NOT NULL,
+    bid_amount DECIMAL(12,2) NOT NULL,
+    bid_time DATETIME(6),
+    PRIMARY KEY (player_id, team_id),
+    KEY idx_live_bids_player_amount (player_id, bid_amount)
+);
+
+CREATE TABLE bids (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    player_id INT NOT NULL,
+    team_id INT NOT NULL,
+    bid_amount DECIMAL(12,2) NOT NULL,
+    bid_time DATETIME(6),
+    KEY idx_bids_player_time (player_id, bid_time)
+);
+
+CREATE TABLE sold_players (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    player_id INT NOT NULL,
+    team_id INT NOT NULL,
+    sold_price DECIMAL(12,2) NOT NULL,
+    session_id VARCHAR(64),
+    sold_time DATETIME(6),
+    KEY idx_sold_players_player (player_id),
+    KEY idx_sold_players_team (team_id, sold_time)
+);
+
+CREATE TABLE unsold_players (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    player_id INT NOT NULL,
+    reason VARCHAR(255),
+    added_on DATETIME(6),
+    KEY idx_unsold_players_player (player_id)
+);
+
+CREATE TABLE team_ledger (
+    team_id INT PRIMARY KEY,
+    purse DECIMAL(12,2) NOT NULL DEFAULT 0,
+    spent DECIMAL(12,2) NOT NULL DEFAULT 0,
+    squad_count INT NOT NULL DEFAULT 0,
+    category_mask BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    max_bid DECIMAL(12,2) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+CREATE TABLE auction_events (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    event_type VARCHAR(32) NOT NULL,
+    player_id INT NULL,
+    team_id INT NULL,
+    amount DECIMAL(12,2) NULL,
+    data JSON NULL,
+    occurred_at TIMESTAMP(3) NOT NULL,
+    KEY idx_auction_events_player (player_id, id)
+);
+
+CREATE TABLE schema_migrations (
+    version INT PRIMARY KEY,
+    description VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE auction_snapshots (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    last_event_id BIGINT NOT NULL,
+    state JSON NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
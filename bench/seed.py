@@ -0,0 +1,67 @@
+import random
+
+from core.database import get_db_connection
+
+CATEGORIES = ["A", "B", "C", "D", "E", "F", "G", "H"]
+
+AUCTION_TABLES = [
+    "current_auction", "live_bids", "bids", "sold_players", "unsold_players", "player_teams",
+    "team_ledger", "auction_events", "auction_snapshots",
+]
+
+
+def seed(teams, players, purse=100000, base_price=1000, rng=None):
+    """
+    Reset the auction tables and insert `teams` teams and `players` players
+    spread evenly over the categories. Returns the created team ids.
+    """
+    rng = rng or random.Random(42)
+
+    conn = get_db_connection()
+
+    if conn is None:
+        raise RuntimeError("Database connection failed, check MYSQL* variables")
+
+    cursor = conn.cursor()
+
+    try:
+        for table in AUCTION_TABLES:
+            cursor.execute(f"DELETE FROM {table}")
+        cursor.execute("DELETE FROM players")
+        cursor.execute("DELETE FROM teams")
+
+        cursor.executemany(
+            "INSERT INTO teams (name, purse, Total_Budget, Season_Budget) VALUES (%s, %s, %s, %s)",
+            [(f"Bench Team {i + 1}", purse, purse, purse) for i in range(teams)]
+        )
+
+        cursor.executemany(
+            """
+            INSERT INTO players (name, category, type, jersey, base_price, highest_runs)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            """,
+            [
+                (
+                    f"Bench Player {i + 1}",
+                    CATEGORIES[i % len(CATEGORIES)],
+                    rng.choice(["Batsman", "Bowler", "All-Rounder"]),
+                    i + 1,
+                    base_price,
+                    rng.randint(0, 150),
+                )
+                for i in range(players)
+            ]
+        )
+
+        conn.commit()
+
+        cursor.execute("SELECT team_id FROM teams ORDER BY team_id")
+        return [row["team_id"] for row in cursor.fetchall()]
+
+    except Exception:
+        conn.rollback()
+        raise
+
+    finally:
+        cursor.close()
+        conn.close()
@@ -0,0 +1,381 @@
+"""
+Offline auction simulator for capacity planning and engine regression runs.
+
+Drives the real engine in-process: start_auction, background_timer,
+place_bid, set_proxy_bid and settlement. It runs against a SQLite stand-in
+(core/sqlite_backend.py) with core.clock sped up, so a full auction day
+takes minutes. Synthetic teams bid up to a private valuation of each player:
+steady bidders bid throughout a lot, snipers wait for its last seconds, and
+proxy bidders register a maximum when the lot opens.
+
+Reports engine throughput, lot durations, extensions, rejection reasons
+(from the event log) and how team budgets run out over the session.
+
+    python -m bench.simulate --teams 20 --players 500 --speed 100
+    python -m bench.simulate --virtual     # no waiting at all, deterministic
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+
+from starlette.requests import Request
+
+from auth.auth_handler import create_access_token
+from bench.seed import seed
+from bench.stats import Recorder, percentile
+from core.clock import ScaledClock, VirtualClock, get_clock, set_clock
+from core.config import get_settings
+from core.database import get_db_connection, set_connection_factory
+from core.sqlite_backend import open_database
+
+STYLES = ("steady", "sniper", "proxy")
+
+
+def summary(values):
+    if not values:
+        return {"count": 0}
+
+    return {
+        "count": len(values),
+        "mean": round(statistics.fmean(values), 2),
+        "p50": round(percentile(values, 50), 2),
+        "p99": round(percentile(values, 99), 2),
+        "max": round(max(values), 2),
+    }
+
+
+class Lot:
+    """What the agents know about the running lot, from the engine's broadcasts."""
+
+    def __init__(self, data, now):
+        player = data["player"]
+        self.player_id = player["id"]
+        self.category = player["category"]
+        self.base_price = player["base_price"]
+        self.current_bid = float(data["current_bid"])
+        self.leader = None
+        self.max_bids = data.get("max_bids") or {}
+        self.eligible = set(data.get("eligible_teams") or [])
+        self.started_at = now
+        self.expires_at = now + data["duration"]
+        self.extensions = 0
+        self.active = True
+
+
+class Agent:
+
+    def __init__(self, sim, team_id, style, aggression, rng):
+        self.sim = sim
+        self.team_id = team_id
+        self.sid = f"sim-team-{team_id}"
+        self.style = style
+        self.aggression = aggression
+        self.rng = rng
+
+    def valuation(self, lot):
+        return lot.base_price * self.aggression * self.rng.lognormvariate(0, 0.5)
+
+    async def run(self, lot):
+        value = min(self.valuation(lot), float(lot.max_bids.get(self.team_id, 0)))
+
+        if value < lot.base_price:
+            return
+
+        if self.style == "proxy":
+            await self.sim.call("set_proxy_bid", self.sid, {
+                "team_id": self.team_id,
+                "player_id": lot.player_id,
+                "max_amount": value
+            })
+            return
+
+        clock = get_clock()
+        args = self.sim.args
+
+        while lot.active:
+            if self.style == "sniper":
+                remaining = lot.expires_at - clock.monotonic()
+                await clock.sleep(max(0.0, remaining - self.rng.uniform(0.2, args.snipe_window)))
+            else:
+                await clock.sleep(self.rng.expovariate(1 / args.think_time))
+
+            if not lot.active or lot.leader == self.team_id:
+                continue
+
+            amount = lot.current_bid + args.min_increment if lot.leader else lot.current_bid
+            if amount > value:
+                return
+
+            await self.sim.call("place_bid", self.sid, {
+                "team_id": self.team_id,
+                "player_id": lot.player_id,
+                "bid_amount": amount,
+                "request_id": uuid.uuid4().hex
+            })
+
+
+class Simulation:
+
+    def __init__(self, args, team_ids):
+        from sockets.socket_manager import sio
+
+        self.args = args
+        self.sio = sio
+        self.rng = random.Random(args.seed_value)
+        self.recorder = Recorder()
+        self.lot = None
+        self.lots = []
+        self.tasks = []
+        self.done = asyncio.Event()
+
+        styles = self.rng.choices(STYLES, weights=(args.steady_share, args.sniper_share, args.proxy_share), k=len(team_ids))
+        self.agents = {
+            team_id: Agent(self, team_id, style, self.rng.uniform(1.0, args.aggression), random.Random(self.rng.random()))
+            for team_id, style in zip(team_ids, styles)
+        }
+
+    # ---------- ENGINE I/O ----------
+    async def call(self, event, sid, data):
+        started = time.perf_counter()
+        await self.sio.handlers["/"][event](sid, data)
+        self.recorder.observe(event, time.perf_counter() - started)
+        self.recorder.count(event)
+
+    def tap(self, emit):
+        """Wrap sio.emit so broadcasts reach the agents as well as the (empty) server."""
+
+        async def tapped(event, data=None, *args, **kwargs):
+            self.on_emit(event, data or {}, kwargs.get("to"))
+            return await emit(event, data, *args, **kwargs)
+
+        return tapped
+
+    def on_emit(self, event, data, to):
+        now = get_clock().monotonic()
+        lot = self.lot
+
+        if event == "auction_started":
+            self.start_lot(Lot(data, now))
+
+        elif event == "auction_update" and lot and data.get("player_id") == lot.player_id:
+            lot.current_bid = float(data.get("current_bid") or lot.current_bid)
+            lot.leader = (data.get("highest_bid") or {}).get("team_id")
+
+        elif event == "timer_update" and lot and data.get("extended"):
+            lot.expires_at = now + data["remaining_seconds"]
+            lot.extensions += 1
+
+        elif event == "auction_ended" and lot:
+            self.end_lot(lot, data.get("status"), now)
+
+        elif event == "auction_finished":
+            self.done.set()
+
+        elif to is not None and event in ("bid_accepted", "bid_rejected"):
+            self.recorder.count(event)
+
+    def start_lot(self, lot):
+        self.lot = lot
+        self.tasks = [task for task in self.tasks if not task.done()]
+
+        for team_id in lot.eligible:
+            agent = self.agents.get(team_id)
+            if agent:
+                self.tasks.append(asyncio.create_task(agent.run(lot)))
+
+    def end_lot(self, lot, status, now):
+        lot.active = False
+
+        self.lots.append({
+            "player_id": lot.player_id,
+            "status": status,
+            "duration": now - lot.started_at,
+            "extensions": lot.extensions,
+            "eligible": len(lot.eligible),
+        })
+
+        # Bids still in flight reach the engine and are judged there (expired)
+        if self.args.max_lots and len(self.lots) >= self.args.max_lots:
+            self.done.set()
+
+    # ---------- RUN ----------
+    async def run(self):
+        from models.schemas import StartAuctionRequest
+        from routers.auction_routes import start_auction
+        from sockets.socket_events import register_socket_events
+
+        register_socket_events()
+        self.sio.emit = self.tap(self.sio.emit)
+
+        for agent in self.agents.values():
+            await self.call("join_auction", agent.sid, {"team_id": agent.team_id})
+
+        token = create_access_token({"id": 0, "role": "admin", "name": "simulator"})
+        request = Request({
+            "type": "http",
+            "method": "POST",
+            "path": "/start-auction",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+        })
+
+        real_started = time.perf_counter()
+        sim_started = get_clock().monotonic()
+
+        await start_auction(StartAuctionRequest(mode="random", duration=self.args.lot_duration), request)
+
+        clock = get_clock()
+        if isinstance(clock, VirtualClock):
+            await self.drive(clock)
+        else:
+            await self.done.wait()
+
+        real_elapsed = time.perf_counter() - real_started
+        sim_elapsed = get_clock().monotonic() - sim_started
+
+        for task in self.tasks:
+            task.cancel()
+
+        return self.report(real_elapsed, sim_elapsed)
+
+    async def drive(self, clock):
+        """Virtual time: jump from one pending sleep to the next until the session ends."""
+        while not self.done.is_set():
+            if not await clock.advance_to_next():
+                raise RuntimeError("Simulation stalled: nothing is sleeping and the auction has not finished")
+
+    # ---------- REPORT ----------
+    def report(self, real_elapsed, sim_elapsed):
+        from auction.event_log import compact
+        from auction.team_ledger import LEDGER
+
+        projection = compact(min_events=1)
+        counts = projection.counts if projection else {}
+
+        report = self.recorder.report()
+        bids = counts.get("bid_accepted", 0) + counts.get("bid_rejected", 0)
+        sold = [lot for lot in self.lots if lot["status"] == "sold"]
+
+        report["run"] = {
+            "teams": len(self.agents),
+            "styles": {style: sum(a.style == style for a in self.agents.values()) for style in STYLES},
+            "speed": "virtual" if self.args.virtual else self.args.speed,
+            "real_elapsed_s": round(real_elapsed, 2),
+            "sim_elapsed_s": round(sim_elapsed, 2),
+            "lots": len(self.lots),
+            "lots_sold": len(sold),
+        }
+        report["throughput"] = {
+            "bids_per_real_s": round(bids / real_elapsed, 2) if real_elapsed else None,
+            "lots_per_real_min": round(len(self.lots) / real_elapsed * 60, 2) if real_elapsed else None,
+            "bids_accepted": counts.get("bid_accepted", 0),
+            "bids_rejected": counts.get("bid_rejected", 0),
+        }
+        report["lot_duration_s"] = {
+            "all": summary([lot["duration"] for lot in self.lots]),
+            "sold": summary([lot["duration"] for lot in sold]),
+        }
+        report["extensions"] = {
+            "total": counts.get("extended", 0),
+            "lots_extended": sum(lot["extensions"] > 0 for lot in self.lots),
+            "max_per_lot": max((lot["extensions"] for lot in self.lots), default=0),
+        }
+        report["rejections"] = rejection_reasons()
+        report["budget"] = budget_report(LEDGER.snapshot(), self.lots)
+        return report
+
+
+def rejection_reasons():
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT data FROM auction_events WHERE event_type = %s", ("bid_rejected",))
+        reasons = {}
+        for row in cursor.fetchall():
+            reason = json.loads(row["data"] or "{}").get("reason", "unknown")
+            reasons[reason] = reasons.get(reason, 0) + 1
+        return dict(sorted(reasons.items(), key=lambda item: -item[1]))
+
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def budget_report(ledger, lots, buckets=10):
+    """Where the money went, and how the pool of teams able to bid shrank over the session."""
+    settings = get_settings()
+    teams = ledger["teams"]
+    purses = [float(t["purse"]) for t in teams]
+    spent = sum(float(t["spent"]) for t in teams)
+
+    size = max(1, -(-len(lots) // buckets))
+    eligible_by_stage = [
+        round(statistics.fmean(lot["eligible"] for lot in lots[i:i + size]), 1)
+        for i in range(0, len(lots), size)
+    ]
+
+    return {
+        "teams_full_squad": sum(t["squad_count"] >= settings.squad_size for t in teams),
+        "teams_incomplete": sum(t["squad_count"] < settings.squad_size for t in teams),
+        "spent_share": round(spent / (spent + sum(purses)), 4) if spent or purses else None,
+        "purse_left": summary(purses),
+        "lots_without_eligible_team": sum(lot["eligible"] == 0 for lot in lots),
+        "eligible_teams_by_stage": eligible_by_stage,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--players", type=int, default=500)
+    parser.add_argument("--purse", type=int, default=100000)
+    parser.add_argument("--base-price", type=int, default=1000)
+    parser.add_argument("--speed", type=float, default=100.0, help="Simulated seconds per real second")
+    parser.add_argument("--virtual", action="store_true", help="Virtual clock: time jumps between events")
+    parser.add_argument("--lot-duration", type=int, default=20)
+    parser.add_argument("--inter-lot-delay", type=int, default=2)
+    parser.add_argument("--max-lots", type=int, default=0, help="Stop after this many lots (0: run out the pool)")
+    parser.add_argument("--min-increment", type=int, default=get_settings().min_increment)
+    parser.add_argument("--aggression", type=float, default=10.0, help="Top valuation multiplier over base price")
+    parser.add_argument("--think-time", type=float, default=3.0, help="Mean seconds between a steady bidder's bids")
+    parser.add_argument("--snipe-window", type=float, default=3.0, help="Snipers bid this close to the deadline")
+    parser.add_argument("--steady-share", type=float, default=0.5)
+    parser.add_argument("--sniper-share", type=float, default=0.3)
+    parser.add_argument("--proxy-share", type=float, default=0.2)
+    parser.add_argument("--db", default="bench-simulation.db", help="SQLite file, recreated on each run")
+    parser.add_argument("--seed-value", type=int, default=42)
+    parser.add_argument("--json", help="Also write the report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    settings = get_settings()
+    settings.default_lot_duration = args.lot_duration
+    settings.inter_lot_delay = args.inter_lot_delay
+    settings.min_increment = args.min_increment
+
+    set_connection_factory(open_database(args.db, fresh=True))
+    team_ids = seed(
+        teams=args.teams, players=args.players, purse=args.purse,
+        base_price=args.base_price, rng=random.Random(args.seed_value)
+    )
+    set_clock(VirtualClock() if args.virtual else ScaledClock(args.speed))
+
+    report = asyncio.run(Simulation(args, team_ids).run())
+
+    output = json.dumps(report, indent=2)
+    print(output)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
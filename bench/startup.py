@@ -0,0 +1,99 @@
+"""
+Cold-start benchmark for `main`.
+
+Imports `main` in fresh interpreters and fails when the median import time
+exceeds the budget, so heavy top-level imports don't creep back in:
+
+    python -m bench.startup --runs 7 --budget 0.6
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds spent importing main (interpreter startup excluded)
+IMPORT_BUDGET_SECONDS = 0.6
+
+# Modules that must stay out of the import graph of main
+LAZY_MODULES = ("pandas", "numpy")
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+loaded = [m for m in {lazy!r} if m in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def measure_once():
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(lazy=LAZY_MODULES)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    elapsed, _, loaded = result.stdout.strip().splitlines()[-1].partition(" ")
+    return float(elapsed), [m for m in loaded.split(",") if m]
+
+
+def slowest_imports(limit=10):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True
+    )
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, _, cumulative, name = [part.strip() for part in line.replace("import time:", "|").split("|")]
+        rows.append((int(cumulative), name))
+
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET_SECONDS)
+    args = parser.parse_args(argv)
+
+    timings = []
+    eager = set()
+
+    for _ in range(args.runs):
+        elapsed, loaded = measure_once()
+        timings.append(elapsed)
+        eager.update(loaded)
+
+    median = statistics.median(timings)
+
+    print(f"import main: median {median * 1000:.0f} ms, "
+          f"min {min(timings) * 1000:.0f} ms over {args.runs} runs "
+          f"(budget {args.budget * 1000:.0f} ms)")
+
+    failed = False
+
+    if eager:
+        print(f"FAIL: imported eagerly: {', '.join(sorted(eager))}")
+        failed = True
+
+    if median > args.budget:
+        print("FAIL: import budget exceeded, slowest imports (cumulative us):")
+        for cumulative, name in slowest_imports():
+            print(f"  {cumulative:>9}  {name}")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+import math
+from collections import Counter, defaultdict
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+
+    ordered = sorted(values)
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def summarize(values, scale=1000.0):
+    """p50 / p99 / max / count for a list of seconds, reported in ms."""
+    if not values:
+        return {"count": 0}
+
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50) * scale, 2),
+        "p99": round(percentile(values, 99) * scale, 2),
+        "max": round(max(values) * scale, 2),
+    }
+
+
+class Recorder:
+    """Collects latency samples and outcome counts for one run."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.counts = Counter()
+
+    def observe(self, name, seconds):
+        self.samples[name].append(seconds)
+
+    def count(self, name, amount=1):
+        self.counts[name] += amount
+
+    def report(self):
+        return {
+            "latency_ms": {name: summarize(values) for name, values in sorted(self.samples.items())},
+            "counts": dict(sorted(self.counts.items())),
+        }
@@ -0,0 +1,128 @@
+import asyncio
+import heapq
+import itertools
+import time
+from datetime import datetime, timedelta, timezone
+
+
+class RealClock:
+    """Wall-clock time and asyncio sleeps; the production clock."""
+
+    def now(self):
+        return datetime.now(timezone.utc)
+
+    def monotonic(self):
+        return time.monotonic()
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+
+class ScaledClock(RealClock):
+    """
+    Runs `speed` times faster than the wall clock from the moment it is
+    created: a 10 s sleep takes 10 / speed real seconds, and now() moves
+    on by 10 s.
+    """
+
+    def __init__(self, speed):
+        self.speed = speed
+        self._wall_start = datetime.now(timezone.utc)
+        self._real_start = time.monotonic()
+
+    def _elapsed(self):
+        return (time.monotonic() - self._real_start) * self.speed
+
+    def now(self):
+        return datetime.fromtimestamp(self._wall_start.timestamp() + self._elapsed(), timezone.utc)
+
+    def monotonic(self):
+        return self._real_start + self._elapsed()
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(max(0.0, seconds) / self.speed)
+
+
+class VirtualClock:
+    """
+    Time that only moves when advance() is called. Sleepers wake in deadline
+    order as time passes them, and each gets to run before the clock moves
+    on, so timer behaviour is deterministic and a whole auction takes no
+    wall time at all.
+    """
+
+    def __init__(self, start=None, settle_steps=50):
+        self._start = start or datetime.now(timezone.utc)
+        self._elapsed = 0.0
+        self._sleepers = []     # heap of (deadline, seq, future)
+        self._seq = itertools.count()
+        self.settle_steps = settle_steps
+
+    def now(self):
+        return self._start + timedelta(seconds=self._elapsed)
+
+    def monotonic(self):
+        return self._elapsed
+
+    async def sleep(self, seconds):
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self._elapsed + seconds, next(self._seq), future))
+        await future
+
+    def next_deadline(self):
+        # Sleeps of cancelled tasks are dropped lazily
+        while self._sleepers and self._sleepers[0][2].done():
+            heapq.heappop(self._sleepers)
+        return self._sleepers[0][0] if self._sleepers else None
+
+    async def settle(self):
+        """Let woken tasks run until they block again."""
+        for _ in range(self.settle_steps):
+            await asyncio.sleep(0)
+
+    async def advance(self, seconds):
+        target = self._elapsed + seconds
+
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > target:
+                break
+
+            self._elapsed = max(self._elapsed, deadline)
+            while self._sleepers and self._sleepers[0][0] <= self._elapsed:
+                future = heapq.heappop(self._sleepers)[2]
+                if not future.done():
+                    future.set_result(None)
+
+            await self.settle()
+
+        self._elapsed = max(self._elapsed, target)
+
+    async def advance_to_next(self):
+        """Jump to the earliest pending sleep; False when nothing is sleeping."""
+        await self.settle()
+        deadline = self.next_deadline()
+
+        if deadline is None:
+            return False
+
+        await self.advance(deadline - self._elapsed)
+        return True
+
+
+_clock = RealClock()
+
+
+def get_clock():
+    return _clock
+
+
+def set_clock(clock):
+    """Swap the clock engine code reads; for simulators and benchmarks."""
+    global _clock
+    _clock = clock
+    return clock
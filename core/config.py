@@ -0,0 +1,125 @@
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from pydantic import Field, model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+# Profile is picked with JPL_ENV; values set in the environment (JPL_*)
+# or in .env / .env.<profile> always win over the profile defaults below.
+PROFILES = {
+    "development": {},
+    "production": {
+        "socket_logger": False,
+        "engineio_logger": False,
+        "log_level": "WARNING",
+        "log_format": "json",
+        "db_pool_size": 10,
+        # Migrations are run deliberately: python -m core.migrations migrate
+        "db_auto_migrate": False,
+    },
+    "bench": {
+        "socket_logger": False,
+        "engineio_logger": False,
+        "log_level": "WARNING",
+        "log_format": "json",
+        "db_pool_size": 20,
+    },
+}
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="JPL_",
+        extra="ignore",
+        populate_by_name=True,
+    )
+
+    env: str = "development"
+
+    # ---------- AUTH ----------
+    secret_key: str = "JPL_SECRET_KEY"
+    jwt_algorithm: str = "HS256"
+    access_token_expire_hours: int = 6
+
+    # ---------- HTTP / SOCKET ----------
+    cors_origins: List[str] = ["*"]
+    frontend_port: int = 3000
+    socket_logger: bool = True
+    engineio_logger: bool = True
+
+    # ---------- LOGGING ----------
+    log_level: str = "INFO"
+    log_format: str = "text"              # "text" or "json"
+    log_levels: Dict[str, str] = {}       # per-logger overrides, e.g. {"jpl.db": "DEBUG"}
+    log_tick_interval: float = 30.0       # per-tick messages: one per template per interval
+    log_packet_sample_rate: float = 0.01  # fraction of socketio/engineio packet logs kept
+
+    # ---------- DATABASE ----------
+    db_host: Optional[str] = Field(None, validation_alias="MYSQLHOST")
+    db_user: Optional[str] = Field(None, validation_alias="MYSQLUSER")
+    db_password: Optional[str] = Field(None, validation_alias="MYSQLPASSWORD")
+    db_name: Optional[str] = Field(None, validation_alias="MYSQLDATABASE")
+    db_port: int = Field(3306, validation_alias="MYSQLPORT")
+    db_connect_timeout: int = 5
+    db_pool_size: int = 5                 # idle connections kept, 0 disables pooling
+    db_pool_recycle_seconds: int = 300    # ping connections idle for longer than this
+    db_backend: str = "mysql"             # "sqlite": embedded database at sqlite_path, no server
+    sqlite_path: str = "jpl.db"
+    db_auto_migrate: bool = True          # apply pending core.migrations at startup
+
+    # ---------- TIMER POLICY ----------
+    default_lot_duration: int = 120       # seconds per lot
+    fallback_lot_duration: int = 40       # used when a start request sends no duration
+    inter_lot_delay: int = 10             # pause between settlement and next lot
+    timer_tick_seconds: float = 1.0       # timer_update broadcast interval
+    loop_lag_interval: float = 0.5        # event-loop lag probe interval
+    anti_snipe_window: int = 10           # bids in the last N seconds extend the lot
+    anti_snipe_extension: int = 30
+
+    # ---------- BIDDING RULES ----------
+    min_increment: int = 500
+    squad_size: int = 8
+    bid_dedupe_size: int = 64             # recent bid request ids remembered per team
+
+    # ---------- BID ADMISSION ----------
+    bid_rate_per_second: float = 5.0      # token refill per team and per socket
+    bid_burst: int = 10                   # bucket size
+    bid_queue_limit: int = 50             # bids waiting on the lock per lot before "busy"
+
+    # ---------- CACHES ----------
+    cache_ttl_seconds: float = 30.0
+    cache_max_entries: int = 512          # read-model responses kept, least recently used dropped
+    search_refresh_seconds: float = 300.0 # full rebuild of the player search index
+
+    # ---------- EVENT LOG ----------
+    event_snapshot_interval: float = 60.0 # seconds between compaction runs
+    event_snapshot_min_events: int = 500  # events since the last snapshot before writing another
+
+    # ---------- TRACING ----------
+    trace_buffer_size: int = 2000         # traces kept per ring buffer
+    trace_slow_ms: float = 250.0          # slower traces are always kept
+    trace_sample_rate: float = 0.05       # fraction of fast traces kept
+
+    @model_validator(mode="before")
+    @classmethod
+    def apply_profile(cls, data):
+        if not isinstance(data, dict):
+            return data
+
+        profile = data.get("env") or os.getenv("JPL_ENV", "development")
+
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown settings profile: {profile}")
+
+        for key, value in PROFILES[profile].items():
+            data.setdefault(key, value)
+
+        data["env"] = profile
+        return data
+
+
+@lru_cache(maxsize=1)
+def get_settings():
+    profile = os.getenv("JPL_ENV", "development")
+    return Settings(_env_file=(".env", f".env.{profile}"))
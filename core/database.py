@@ -1,22 +1,182 @@
+import queue
+import re
+import time
+from functools import lru_cache
+
 import pymysql
-import os
+from pymysql.constants import SERVER_STATUS
+
+from core.config import get_settings
+from core.log import get_logger
+from core.metrics import DB_QUERY_LATENCY
+
+logger = get_logger("db")
+
+# Idle connections, most recently used first
+_idle = queue.LifoQueue()
+
+# Replaces MySQL entirely when set: the SQLite backend, simulators, benchmarks
+_UNSET = object()
+_factory = _UNSET
+
+_TABLE_RE = re.compile(r"\b(?:FROM|INTO|UPDATE)\s+`?(\w+)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def statement_name(sql):
+    """Stable metric label for a statement, e.g. "select:live_bids"."""
+    words = sql.split(None, 1)
+    verb = words[0].lower() if words else "unknown"
+    match = _TABLE_RE.search(sql)
+    return f"{verb}:{match.group(1) if match else '-'}"
+
+
+class TimedCursor:
+    """Cursor proxy recording query time per statement name."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(query, args)
+        finally:
+            DB_QUERY_LATENCY.observe(time.perf_counter() - started, statement=statement_name(query))
+
+    def executemany(self, query, args):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(query, args)
+        finally:
+            DB_QUERY_LATENCY.observe(time.perf_counter() - started, statement=statement_name(query))
+
+
+class PooledConnection:
+    """
+    Thin proxy over a pymysql connection. close() hands the connection
+    back to the pool instead of closing the socket, so callers keep the
+    usual `cursor.close(); conn.close()` pattern.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        return TimedCursor(self._conn.cursor(*args, **kwargs))
+
+    def close(self):
+        conn, self._conn = self._conn, None
+
+        if conn is not None:
+            _release(conn)
+
+
+def _connect():
+    settings = get_settings()
+
+    logger.debug("Opening DB connection")
+
+    conn = pymysql.connect(
+        host=settings.db_host,
+        user=settings.db_user,
+        password=settings.db_password,
+        database=settings.db_name,
+        port=settings.db_port,
+        connect_timeout=settings.db_connect_timeout,
+        cursorclass=pymysql.cursors.DictCursor
+    )
+    logger.info("DB connection established")
+    return conn
+
+
+def _checkout():
+    recycle = get_settings().db_pool_recycle_seconds
+
+    while True:
+        try:
+            conn, released_at = _idle.get_nowait()
+        except queue.Empty:
+            return None
+
+        try:
+            if time.monotonic() - released_at > recycle:
+                conn.ping(reconnect=False)
+            return conn
+        except Exception:
+            _discard(conn)
+
+
+def _release(conn):
+    try:
+        # Never hand out a connection with an open transaction / stale snapshot
+        if conn.open and conn.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+            conn.rollback()
+    except Exception:
+        _discard(conn)
+        return
+
+    if conn.open and _idle.qsize() < get_settings().db_pool_size:
+        _idle.put((conn, time.monotonic()))
+    else:
+        _discard(conn)
+
+
+def _discard(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+def set_connection_factory(factory):
+    """Route get_db_connection() to `factory()`; None restores MySQL."""
+    global _factory
+    _factory = factory
+
+
+def get_dialect():
+    """SQL dialect of the active backend, for the few dialect-specific statements (DDL)."""
+    if _factory is _UNSET:
+        return "sqlite" if get_settings().db_backend == "sqlite" else "mysql"
+    return getattr(_factory, "dialect", "mysql")
+
+
+def _build_factory():
+    settings = get_settings()
+
+    if settings.db_backend == "mysql":
+        return None
+
+    if settings.db_backend != "sqlite":
+        raise ValueError(f"Unknown database backend: {settings.db_backend}")
+
+    # Imported here: the SQLite backend builds on this module's cursor wrapper
+    from core.sqlite_backend import open_database
+
+    logger.info("Using the embedded SQLite database", extra={"path": settings.sqlite_path})
+    return open_database(settings.sqlite_path)
+
 
 def get_db_connection():
+    global _factory
+
+    if _factory is _UNSET:
+        _factory = _build_factory()
+
+    if _factory is not None:
+        return _factory()
+
     try:
-        print("🔌 Attempting DB Connection...")
-
-        conn = pymysql.connect(
-            host=os.getenv("MYSQLHOST"),
-            user=os.getenv("MYSQLUSER"),
-            password=os.getenv("MYSQLPASSWORD"),
-            database=os.getenv("MYSQLDATABASE"),
-            port=int(os.getenv("MYSQLPORT")),
-            connect_timeout=5,
-            cursorclass=pymysql.cursors.DictCursor
-        )
-        print("DB Connection established")
-        return conn
-    
+        conn = _checkout() or _connect()
+        return PooledConnection(conn)
+
     except Exception as e:
-        print("❌Database Connection Error:", e)
-        return None
\ No newline at end of file
+        logger.error("Database connection error: %s", e)
+        return None
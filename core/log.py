@@ -0,0 +1,171 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+from core.config import get_settings
+
+ROOT = "jpl"
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener = None
+_setup_lock = threading.Lock()
+
+
+def get_logger(name):
+    """Module logger under the "jpl" namespace, e.g. get_logger("timer")."""
+    return logging.getLogger(f"{ROOT}.{name}")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; `extra=` fields become top-level keys."""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for development, extras appended as key=value."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    def format(self, record):
+        line = super().format(record)
+        extras = [
+            f"{key}={value}"
+            for key, value in vars(record).items()
+            if key not in _RESERVED and not key.startswith("_")
+        ]
+        return f"{line} {' '.join(extras)}" if extras else line
+
+
+class _QueueHandler(QueueHandler):
+    """Keeps the traceback out of `msg` so the JSON formatter can emit it as `exc`."""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Per message template, let `burst` records through every `period` seconds.
+    Dropped records are counted and reported as `suppressed` on the next one.
+    """
+
+    def __init__(self, period, burst=1):
+        super().__init__()
+        self.period = period
+        self.burst = burst
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        now = time.monotonic()
+        key = (record.name, record.msg)
+
+        with self._lock:
+            started, passed, dropped = self._windows.get(key, (now, 0, 0))
+
+            if now - started >= self.period:
+                started, passed = now, 0
+
+            if passed >= self.burst:
+                self._windows[key] = (started, passed, dropped + 1)
+                return False
+
+            self._windows[key] = (started, passed + 1, 0)
+
+        if dropped:
+            record.suppressed = dropped
+        return True
+
+
+class SampleFilter(logging.Filter):
+    """Keep a random `rate` fraction of records below WARNING."""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+def setup_logging():
+    """
+    Route the "jpl" namespace (and socketio/engineio) through a queue so
+    callers on the event loop only pay for building the record; formatting
+    and the stdout write happen on the listener thread.
+    """
+    global _listener
+
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        settings = get_settings()
+
+        output = logging.StreamHandler()
+        output.setFormatter(JsonFormatter() if settings.log_format == "json" else TextFormatter())
+
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+        for name in (ROOT, "socketio", "engineio"):
+            logger = logging.getLogger(name)
+            logger.handlers[:] = [_QueueHandler(log_queue)]
+            logger.propagate = False
+
+        logging.getLogger(ROOT).setLevel(settings.log_level.upper())
+
+        for name, level in settings.log_levels.items():
+            logging.getLogger(name).setLevel(level.upper())
+
+        # Per-tick messages: at most one per template per interval
+        get_logger("timer").addFilter(RateLimitFilter(settings.log_tick_interval))
+
+        # Per-packet messages: sampled
+        for name in ("socketio", "engineio"):
+            logging.getLogger(name).addFilter(SampleFilter(settings.log_packet_sample_rate))
+
+
+def library_logger(name, enabled):
+    """Logger handed to socketio/engineio: INFO when enabled, errors only otherwise."""
+    logger = logging.getLogger(name)
+    if logger.level == logging.NOTSET:
+        logger.setLevel(logging.INFO if enabled else logging.ERROR)
+    return logger
@@ -0,0 +1,267 @@
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+# Seconds; tuned for sub-millisecond socket handlers up to slow imports
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _label_key(labelnames, labels):
+    return tuple(str(labels.get(name, "")) for name in labelnames)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames, key, extra=None):
+    pairs = list(zip(labelnames, key))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(_label_key(self.labelnames, labels), 0)
+
+    def render(self):
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+
+
+class Gauge(Counter):
+    """
+    Settable gauge. When `collect` is given it is called at scrape time and
+    must return {label tuple: value}, which keeps hot paths free of updates.
+    """
+    kind = "gauge"
+
+    def __init__(self, name, help, labelnames=(), collect=None):
+        super().__init__(name, help, labelnames)
+        self.collect = collect
+
+    def set(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def render(self):
+        if self.collect is not None:
+            with self._lock:
+                self._values = dict(self.collect())
+        yield from super().render()
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (+Inf last), sum, count]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(self.labelnames, labels)
+        index = bisect_left(self.buckets, value)
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def snapshot(self, **labels):
+        series = self._series.get(_label_key(self.labelnames, labels))
+        if series is None:
+            return {"count": 0, "sum": 0.0, "buckets": {}}
+        return {
+            "count": series[2],
+            "sum": series[1],
+            "buckets": dict(zip(self.buckets + (float("inf"),), series[0])),
+        }
+
+    def render(self):
+        for key, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', le))} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {count}"
+
+
+class Registry:
+
+    def __init__(self):
+        self._metrics = {}
+
+    def _register(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name, help, labelnames=(), collect=None):
+        return self._register(Gauge(name, help, labelnames, collect))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def render(self):
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# ---------- HOT-PATH METRICS ----------
+HTTP_LATENCY = REGISTRY.histogram(
+    "jpl_http_request_duration_seconds", "HTTP request latency by route",
+    ("method", "route", "status")
+)
+SOCKET_EVENT_LATENCY = REGISTRY.histogram(
+    "jpl_socket_event_duration_seconds", "Socket.IO handler latency by event", ("event",)
+)
+SOCKET_EMIT_LATENCY = REGISTRY.histogram(
+    "jpl_socket_emit_duration_seconds", "Time spent in sio.emit by event", ("event",)
+)
+EMIT_QUEUE_DEPTH = REGISTRY.gauge(
+    "jpl_socket_emit_in_flight", "Emits started but not yet handed to the transport"
+)
+DB_QUERY_LATENCY = REGISTRY.histogram(
+    "jpl_db_query_duration_seconds", "Query latency by statement", ("statement",)
+)
+BID_LOCK_WAIT = REGISTRY.histogram(
+    "jpl_bid_lock_wait_seconds", "Time place_bid waits for the bid lock"
+)
+BID_QUEUE_DEPTH = REGISTRY.gauge(
+    "jpl_bid_queue_depth", "Admitted bids waiting for or holding the bid lock"
+)
+BIDS = REGISTRY.counter(
+    "jpl_bids_total", "Bids by outcome and rejection reason", ("outcome", "reason")
+)
+TIMER_LAG = REGISTRY.histogram(
+    "jpl_timer_lag_seconds", "How late the auction timer wakes up after each tick"
+)
+SETTLE_LATENESS = REGISTRY.histogram(
+    "jpl_lot_settle_lateness_seconds", "Delay between a lot's deadline and its settlement"
+)
+EVENT_LOOP_LAG = REGISTRY.histogram(
+    "jpl_event_loop_lag_seconds", "Oversleep of a fixed-interval probe on the event loop"
+)
+
+
+async def watch_event_loop(interval):
+    """Background probe: any oversleep is time the loop spent busy elsewhere."""
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, time.perf_counter() - started - interval))
+
+
+def timed_event(event):
+    """Record handler latency for a Socket.IO event handler."""
+
+    def decorator(handler):
+        @wraps(handler)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await handler(*args, **kwargs)
+            finally:
+                SOCKET_EVENT_LATENCY.observe(time.perf_counter() - started, event=event)
+
+        return wrapper
+
+    return decorator
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency per route template (not raw path)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+
+            if route is not None:
+                name = route.path
+            elif scope["path"].startswith("/uploads/"):
+                name = "/uploads"
+            else:
+                name = "unmatched"
+
+            HTTP_LATENCY.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=name,
+                status=status["code"]
+            )
@@ -0,0 +1,308 @@
+"""
+Versioned schema migrations.
+
+Each migration runs once per database, in version order, and is recorded in
+schema_migrations. Steps are idempotent, so databases created from an older
+jpl_schema.sql, the former hand-written sql/ scripts or ensure_table
+helpers adopt them without errors.
+
+    python -m core.migrations status
+    python -m core.migrations migrate
+    python -m core.migrations check      # hot statements use their indexes (seeds rows, rolls back)
+"""
+import argparse
+import json
+import re
+import sys
+import uuid
+
+from core.clock import get_clock
+from core.config import get_settings
+from core.database import get_db_connection, get_dialect
+from core.log import get_logger
+from core.schema import TABLES, create_table_sql
+
+logger = get_logger("migrations")
+
+
+# ---------- STEPS ----------
+def create_tables(cursor, dialect):
+    for table in TABLES.values():
+        for statement in table.create_sql(dialect):
+            cursor.execute(statement)
+
+
+def index_exists(cursor, dialect, table, index):
+    if dialect == "sqlite":
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = %s", (index,))
+    else:
+        cursor.execute(
+            """
+            SELECT 1 FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+            LIMIT 1
+            """,
+            (table, index)
+        )
+    return cursor.fetchone() is not None
+
+
+def add_indexes(*names):
+    """Step creating the named core.schema indexes where they are missing."""
+    owners = {index: table for table in TABLES.values() for index, _ in table.indexes}
+
+    def step(cursor, dialect):
+        for index in names:
+            table = owners[index]
+            if not index_exists(cursor, dialect, table.name, index):
+                columns = dict(table.indexes)[index]
+                cursor.execute(f"CREATE INDEX {index} ON {table.name} ({', '.join(columns)})")
+
+    return step
+
+
+# (version, description, steps); append only, never edit an applied migration
+MIGRATIONS = [
+    (1, "Baseline: every table the backend uses", [
+        create_tables,
+        add_indexes(
+            "idx_players_category_name", "idx_players_type_name",
+            "idx_captains_name", "idx_captains_team", "idx_player_teams_team",
+            "idx_sold_players_player", "idx_unsold_players_player",
+            "idx_auction_events_player",
+        ),
+    ]),
+    (2, "Hot-path indexes: top bid, squad by team, bid history", [
+        add_indexes("idx_live_bids_player_amount", "idx_sold_players_team", "idx_bids_player_time"),
+    ]),
+]
+
+
+# ---------- RUNNER ----------
+def applied_versions(cursor, dialect):
+    for statement in create_table_sql("schema_migrations", dialect):
+        cursor.execute(statement)
+
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row["version"] for row in cursor.fetchall()}
+
+
+def migrate(conn=None, dialect=None, target=None):
+    """Apply pending migrations up to `target` (default: all). Returns the versions applied."""
+    own = conn is None
+    conn = conn or get_db_connection()
+    dialect = dialect or get_dialect()
+
+    if conn is None:
+        raise RuntimeError("Database connection failed")
+
+    cursor = conn.cursor()
+    applied = []
+
+    try:
+        done = applied_versions(cursor, dialect)
+
+        for version, description, steps in MIGRATIONS:
+            if version in done or (target is not None and version > target):
+                continue
+
+            logger.info("Applying migration", extra={"version": version, "description": description})
+
+            # MySQL commits each DDL statement on its own, so a failed step
+            # leaves earlier ones in place; steps are idempotent for the retry
+            for step in steps:
+                step(cursor, dialect)
+
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                (version, description)
+            )
+            conn.commit()
+            applied.append(version)
+
+        return applied
+
+    except Exception:
+        conn.rollback()
+        raise
+
+    finally:
+        cursor.close()
+        if own:
+            conn.close()
+
+
+def run_migrations():
+    """Startup hook: apply pending migrations when enabled and the DB is reachable."""
+    if not get_settings().db_auto_migrate:
+        return
+
+    try:
+        applied = migrate()
+    except RuntimeError:
+        logger.warning("Migrations not checked, database unavailable")
+        return
+
+    if applied:
+        logger.info("Schema migrated", extra={"versions": applied})
+
+
+# ---------- QUERY PLANS ----------
+# SQLite: "SEARCH b USING INDEX idx (..)", older builds "SEARCH TABLE bids AS b USING .."
+_SQLITE_INDEX_RE = re.compile(r"^(?:SEARCH|SCAN)(?: TABLE)? (\w+)(?: AS (\w+))? USING (?:COVERING )?INDEX (\w+)")
+
+PLAN_SEED_TEAMS = 40
+PLAN_SEED_PLAYERS = 300
+
+
+def hot_queries():
+    """
+    (name, statement, argument, {table alias: index}, ordered) for the hot
+    statements, taken from the code that runs them. `argument` is "player"
+    or "team"; ordered statements must not sort.
+    """
+    # Imported here: the statements live next to their callers, which import core
+    from auction.live_bids import TOP_BID_SQL
+    from auction.team_ledger import MIN_PRICES_SQL
+    from routers.auction_routes import BID_HISTORY_SQL
+    from routers.teams import TEAM_SQUAD_SQL
+
+    return [
+        ("top bid for the lot", TOP_BID_SQL, "player", {"live_bids": "idx_live_bids_player_amount"}, True),
+        ("squad of a team", TEAM_SQUAD_SQL, "team", {"sp": "idx_sold_players_team"}, True),
+        ("bid history of a player", BID_HISTORY_SQL, "player", {"b": "idx_bids_player_time"}, True),
+        ("cheapest unsold player per category", MIN_PRICES_SQL, "player", {"sp": "idx_sold_players_player"}, False),
+    ]
+
+
+def seed_plan_rows(cursor):
+    """
+    Enough rows in the hot tables that the optimizer's choice is the one a
+    real auction day gets. Inserted in the caller's transaction, which
+    check_plans rolls back. Returns (player_id, team_id) to EXPLAIN with.
+    """
+    tag = uuid.uuid4().hex[:12]
+
+    cursor.executemany(
+        "INSERT INTO teams (name, purse) VALUES (%s, %s)",
+        [(f"plan-check-{tag}-{i}", 100000) for i in range(PLAN_SEED_TEAMS)]
+    )
+    cursor.execute("SELECT team_id FROM teams WHERE name LIKE %s ORDER BY team_id", (f"plan-check-{tag}-%",))
+    teams = [row["team_id"] for row in cursor.fetchall()]
+
+    cursor.executemany(
+        "INSERT INTO players (name, category, base_price) VALUES (%s, %s, %s)",
+        [(f"plan-check-{tag}-{i}", f"C{i % 8}", 100 + i % 50) for i in range(PLAN_SEED_PLAYERS)]
+    )
+    cursor.execute("SELECT id FROM players WHERE name LIKE %s ORDER BY id", (f"plan-check-{tag}-%",))
+    players = [row["id"] for row in cursor.fetchall()]
+
+    now = get_clock().now()
+    cursor.executemany(
+        "INSERT INTO live_bids (player_id, team_id, bid_amount, bid_time) VALUES (%s, %s, %s, %s)",
+        [(p, t, 100 + i, now) for p in players for i, t in enumerate(teams[:20])]
+    )
+    cursor.executemany(
+        "INSERT INTO bids (player_id, team_id, bid_amount, bid_time) VALUES (%s, %s, %s, %s)",
+        [(p, teams[i % len(teams)], 100 + i, now) for p in players for i in range(25)]
+    )
+    cursor.executemany(
+        "INSERT INTO sold_players (player_id, team_id, sold_price, sold_time) VALUES (%s, %s, %s, %s)",
+        [(p, teams[i % len(teams)], 100, now) for i, p in enumerate(players[:len(players) // 2])]
+    )
+
+    return players[len(players) // 2], teams[len(teams) // 2]
+
+
+def explain(cursor, dialect, sql, args):
+    """Plan rows as text lines, {table alias: index used} and whether the plan sorts."""
+    if dialect == "sqlite":
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", args)
+        lines = [row["detail"] for row in cursor.fetchall()]
+        used = {}
+        for line in lines:
+            match = _SQLITE_INDEX_RE.match(line)
+            if match:
+                table, alias, index = match.groups()
+                used[alias or table] = index
+        return lines, used, any("TEMP B-TREE FOR ORDER BY" in line for line in lines)
+
+    cursor.execute(f"EXPLAIN {sql}", args)
+    rows = cursor.fetchall()
+    lines = [
+        f"{row.get('table')}: key={row.get('key')} possible_keys={row.get('possible_keys')} extra={row.get('Extra')}"
+        for row in rows
+    ]
+    # Only `key` counts: possible_keys lists indexes the optimizer turned down
+    used = {row.get("table"): row.get("key") for row in rows}
+    return lines, used, any("filesort" in (row.get("Extra") or "") for row in rows)
+
+
+def check_plans(conn=None, dialect=None):
+    """[(name, ok, plan lines)] for every hot statement, against seeded rows that are rolled back."""
+    own = conn is None
+    conn = conn or get_db_connection()
+    dialect = dialect or get_dialect()
+
+    if conn is None:
+        raise RuntimeError("Database connection failed")
+
+    cursor = conn.cursor()
+    results = []
+
+    try:
+        conn.begin()
+        player_id, team_id = seed_plan_rows(cursor)
+        ids = {"player": player_id, "team": team_id}
+
+        for name, sql, argument, indexes, ordered in hot_queries():
+            lines, used, sorts = explain(cursor, dialect, sql, (ids[argument],))
+            uses_indexes = all(used.get(table) == index for table, index in indexes.items())
+            results.append((name, uses_indexes and not (ordered and sorts), lines))
+        return results
+
+    finally:
+        conn.rollback()
+        cursor.close()
+        if own:
+            conn.close()
+
+
+# ---------- CLI ----------
+def main():
+    parser = argparse.ArgumentParser(description="Schema migrations and query-plan checks")
+    parser.add_argument("command", choices=["status", "migrate", "check"])
+    parser.add_argument("--target", type=int, help="Migrate up to this version")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        print(json.dumps({"applied": migrate(target=args.target)}))
+        return
+
+    if args.command == "status":
+        conn = get_db_connection()
+        if conn is None:
+            raise SystemExit("Database connection failed")
+        cursor = conn.cursor()
+        try:
+            done = applied_versions(cursor, get_dialect())
+        finally:
+            cursor.close()
+            conn.close()
+
+        for version, description, _ in MIGRATIONS:
+            print(f"{version:>4}  {'applied' if version in done else 'pending':<8} {description}")
+        return
+
+    failed = 0
+    for name, ok, lines in check_plans():
+        failed += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {name}")
+        for line in lines:
+            print(f"       {line}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import base64
+import json
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(*key):
+    """Opaque token for the last row's sort key, e.g. ("Virat", "player", 18)."""
+    raw = json.dumps(key, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token, size):
+    """Inverse of encode_cursor; raises InvalidCursor on anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        key = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+
+    if not isinstance(key, list) or len(key) != size:
+        raise InvalidCursor("Malformed cursor")
+
+    return key
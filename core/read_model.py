@@ -0,0 +1,139 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
+
+from core.config import get_settings
+
+# Bumped by every write that changes what the browse endpoints return.
+# Per process: other workers pick changes up through the TTL.
+_version = 0
+_version_lock = threading.Lock()
+
+# key -> (version, built_at, body, etag), least recently used first.
+# Keys come from client query params, so the entries are capped and builds
+# share a fixed set of striped locks.
+_entries = OrderedDict()
+_entries_lock = threading.Lock()
+_build_locks = [threading.Lock() for _ in range(64)]
+
+
+def data_version():
+    return _version
+
+
+def bump_version():
+    global _version
+
+    with _version_lock:
+        _version += 1
+        with _entries_lock:
+            _entries.clear()
+        return _version
+
+
+def _build_lock(key):
+    return _build_locks[hash(key) % len(_build_locks)]
+
+
+def _get(key):
+    with _entries_lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            _entries.move_to_end(key)
+        return entry
+
+
+def _put(key, entry):
+    with _entries_lock:
+        _entries[key] = entry
+        _entries.move_to_end(key)
+        while len(_entries) > max(get_settings().cache_max_entries, 1):
+            _entries.popitem(last=False)
+
+
+def _serialize(payload):
+    # Same encoding FastAPI's JSONResponse uses
+    return json.dumps(
+        jsonable_encoder(payload),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _fresh(entry, version):
+    return (
+        entry is not None
+        and entry[0] == version
+        and time.monotonic() - entry[1] < get_settings().cache_ttl_seconds
+    )
+
+
+def _lookup(key, build):
+    version = _version
+    entry = _get(key)
+
+    if _fresh(entry, version):
+        return entry
+
+    # One build per key at a time; concurrent requests wait and reuse it
+    # (keys sharing a stripe also wait on each other)
+    with _build_lock(key):
+        entry = _get(key)
+        if _fresh(entry, version):
+            return entry
+
+        payload = build()
+        body = _serialize(payload)
+        etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        entry = (version, time.monotonic(), body, etag)
+
+        # Error payloads are returned but never cached
+        if not (isinstance(payload, dict) and "error" in payload) and version == _version:
+            _put(key, entry)
+
+        return entry
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def _respond(request, entry, media_type):
+    version, _, body, etag = entry
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Data-Version": str(version)}
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def cached_json(request, key, build):
+    """
+    Serve build()'s payload from the read model as pre-serialized JSON,
+    answering a matching If-None-Match with 304.
+    """
+    return _respond(request, _lookup(key, build), "application/json")
+
+
+def streamed_ndjson(items):
+    """
+    Uncached NDJSON, one JSON object per line, each sent as `items` yields
+    it. There is no body up front to hash, so no ETag either.
+    """
+    return StreamingResponse(
+        (_serialize(item) + b"\n" for item in items),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Data-Version": str(_version)}
+    )
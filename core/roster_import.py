@@ -0,0 +1,308 @@
+import os
+import zipfile
+from io import BytesIO
+
+import pandas as pd
+import pymysql
+
+from core.database import get_db_connection
+from core.storage import store_stream, CHUNK_SIZE
+
+EXCEL_EXTENSIONS = (".xlsx", ".xls")
+IMAGE_EXTENSIONS = {"png", "jpg", "jpeg", "webp"}
+
+# Progress is reported every N images (and always on the last one)
+PROGRESS_EVERY = 10
+
+INSERT_CHUNK_SIZE = 500
+
+MIN_BASE_PRICE = 0
+MAX_BASE_PRICE = 10_000_000
+
+REQUIRED_COLUMNS = ("name", "category", "base_price")
+TEXT_COLUMNS = (
+    "name", "nickname", "gender", "category", "type",
+    "mobile_No", "email_Id", "teams_played", "image_name"
+)
+INT_COLUMNS = ("age", "jersey", "total_runs", "highest_runs", "wickets_taken", "times_out")
+FLOAT_COLUMNS = ("base_price",)
+
+INSERT_COLUMNS = [
+    "name", "nickname", "age", "gender", "category", "jersey", "type",
+    "mobile_No", "email_Id", "base_price",
+    "total_runs", "highest_runs", "wickets_taken",
+    "times_out", "teams_played", "image_path"
+]
+
+INSERT_PLAYER_SQL = f"""
+    INSERT INTO players ({", ".join(INSERT_COLUMNS)})
+    VALUES ({", ".join(["%s"] * len(INSERT_COLUMNS))})
+"""
+
+
+class RosterImportError(Exception):
+    pass
+
+
+def _member_chunks(zip_ref, info):
+    with zip_ref.open(info) as src:
+        while True:
+            chunk = src.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _is_junk(name):
+    base = os.path.basename(name)
+    return name.startswith("__MACOSX/") or base.startswith(".") or not base
+
+
+def read_roster_zip(fileobj, image_folder, on_progress=None):
+    """
+    Walk the ZIP members once: the first Excel sheet is parsed in memory and
+    every image is streamed straight into the content store.
+
+    Returns (DataFrame, {original image name: stored path}).
+    """
+    try:
+        zip_ref = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile:
+        raise RosterImportError("Invalid ZIP file")
+
+    with zip_ref:
+        members = [
+            info for info in zip_ref.infolist()
+            if not info.is_dir() and not _is_junk(info.filename)
+        ]
+
+        excel_member = next(
+            (info for info in members if info.filename.lower().endswith(EXCEL_EXTENSIONS)),
+            None
+        )
+
+        if excel_member is None:
+            raise RosterImportError("Excel file not found in ZIP")
+
+        df = pd.read_excel(BytesIO(zip_ref.read(excel_member)))
+
+        image_members = [
+            info for info in members
+            if info.filename.rsplit(".", 1)[-1].lower() in IMAGE_EXTENSIONS
+        ]
+
+        images = {}
+        total = len(image_members)
+
+        for index, info in enumerate(image_members, start=1):
+            ext = info.filename.rsplit(".", 1)[-1].lower()
+            images[os.path.basename(info.filename)] = store_stream(
+                image_folder,
+                _member_chunks(zip_ref, info),
+                ext
+            )
+
+            if on_progress and (index % PROGRESS_EVERY == 0 or index == total):
+                on_progress(stage="images", processed=index, total=total)
+
+    return df, images
+
+
+def _strip_text(series):
+    series = series.astype("string").str.strip()
+    return series.mask(series == "")
+
+
+def validate_roster(df, existing_names, existing_jerseys, team_ids):
+    """
+    Validate the whole sheet column-wise.
+
+    Returns (clean DataFrame of valid rows, {sheet row number: [errors]},
+    {DataFrame index: [team ids]}). Sheet row numbers are 1-based and count
+    the header, so they match what the admin sees in Excel.
+    """
+    df = df.copy()
+    df.columns = [str(c).strip() for c in df.columns]
+
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        raise RosterImportError(f"Missing required columns: {', '.join(missing)}")
+
+    for col in TEXT_COLUMNS + INT_COLUMNS + FLOAT_COLUMNS:
+        if col not in df.columns:
+            df[col] = None
+
+    checks = []
+
+    # ---------- TEXT ----------
+    for col in TEXT_COLUMNS:
+        df[col] = _strip_text(df[col])
+
+    checks.append((df["name"].isna(), "Name is required"))
+    checks.append((df["category"].isna(), "Category is required"))
+    checks.append((df["base_price"].isna(), "Base price is required"))
+
+    # ---------- NUMERIC COERCION ----------
+    for col in INT_COLUMNS + FLOAT_COLUMNS:
+        raw = df[col]
+        coerced = pd.to_numeric(raw, errors="coerce")
+        invalid = raw.notna() & coerced.isna()
+
+        if col in INT_COLUMNS:
+            invalid |= coerced.notna() & (coerced % 1 != 0)
+            coerced = coerced.where(~invalid).astype("Int64")
+
+        checks.append((invalid, f"Invalid {col}"))
+        df[col] = coerced
+
+    # ---------- BASE PRICE RANGE ----------
+    price = df["base_price"]
+    checks.append((
+        price.notna() & ((price < MIN_BASE_PRICE) | (price > MAX_BASE_PRICE)),
+        f"Base price must be between {MIN_BASE_PRICE} and {MAX_BASE_PRICE}"
+    ))
+
+    # ---------- DUPLICATES ----------
+    name_key = df["name"].str.lower()
+    jersey = df["jersey"]
+
+    checks.append((name_key.notna() & name_key.duplicated(keep=False), "Duplicate name in file"))
+    checks.append((jersey.notna() & jersey.duplicated(keep=False), "Duplicate jersey in file"))
+    checks.append((name_key.isin(existing_names).fillna(False), "Player name already exists"))
+    checks.append((jersey.isin(existing_jerseys).fillna(False), "Jersey number already taken"))
+
+    # ---------- TEAMS PLAYED ----------
+    teams = df["teams_played"].str.split(",").explode().str.strip()
+    teams = teams[teams.notna() & (teams != "")]
+    resolved = teams.str.lower().map(team_ids)
+
+    unknown = resolved.isna()
+    unknown_teams = [(index, f"Unknown team: {name}") for index, name in teams[unknown].items()]
+
+    links = resolved[~unknown].astype(int).groupby(level=0).agg(list).to_dict()
+
+    # ---------- REPORT ----------
+    errors = {}
+    invalid_rows = pd.Series(False, index=df.index)
+
+    for mask, message in checks:
+        mask = pd.Series(mask, index=df.index).fillna(False).astype(bool)
+        invalid_rows |= mask
+        for index in df.index[mask]:
+            errors.setdefault(int(index) + 2, []).append(message)
+
+    for index, message in unknown_teams:
+        invalid_rows[index] = True
+        errors.setdefault(int(index) + 2, []).append(message)
+
+    return df[~invalid_rows], errors, links
+
+
+def _load_existing(cursor):
+    cursor.execute("SELECT LOWER(name) AS name_key, jersey FROM players")
+    rows = cursor.fetchall()
+
+    existing_names = {r["name_key"] for r in rows if r["name_key"]}
+    existing_jerseys = {int(r["jersey"]) for r in rows if r["jersey"] is not None}
+
+    cursor.execute("SELECT team_id, name FROM teams")
+    team_ids = {r["name"].strip().lower(): r["team_id"] for r in cursor.fetchall() if r["name"]}
+
+    return existing_names, existing_jerseys, team_ids
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def import_roster(fileobj, image_folder, on_progress=None):
+    df, images = read_roster_zip(fileobj, image_folder, on_progress)
+    total = len(df)
+
+    conn = get_db_connection()
+
+    if conn is None:
+        raise RosterImportError("Database connection failed")
+
+    cursor = conn.cursor(pymysql.cursors.DictCursor)
+
+    try:
+        existing_names, existing_jerseys, team_ids = _load_existing(cursor)
+        valid, errors, links = validate_roster(df, existing_names, existing_jerseys, team_ids)
+
+        # ---------- IMAGE PATHS ----------
+        image_name = valid["image_name"]
+        valid = valid.assign(image_path=image_name.map(
+            lambda name: images.get(name, f"{image_folder}/{name}"),
+            na_action="ignore"
+        ))
+
+        rows = valid[INSERT_COLUMNS].astype(object).where(valid[INSERT_COLUMNS].notna(), None)
+        records = list(rows.itertuples(index=False, name=None))
+
+        # ---------- PLAYERS (chunked executemany) ----------
+        processed = 0
+
+        for chunk in _chunks(records, INSERT_CHUNK_SIZE):
+            cursor.executemany(INSERT_PLAYER_SQL, chunk)
+            processed += len(chunk)
+
+            if on_progress:
+                on_progress(stage="rows", processed=processed, total=len(records))
+
+        # ---------- PLAYER_TEAMS (bulk) ----------
+        link_rows = []
+
+        if links:
+            names = valid.loc[valid.index.isin(list(links)), "name"]
+            player_ids = {}
+
+            for chunk in _chunks(list(names), INSERT_CHUNK_SIZE):
+                placeholders = ", ".join(["%s"] * len(chunk))
+                cursor.execute(
+                    f"SELECT id, name FROM players WHERE name IN ({placeholders})",
+                    chunk
+                )
+                player_ids.update({r["name"]: r["id"] for r in cursor.fetchall()})
+
+            for index, name in names.items():
+                for team_id in links[index]:
+                    link_rows.append((player_ids[name], team_id))
+
+            for chunk in _chunks(link_rows, INSERT_CHUNK_SIZE):
+                cursor.executemany(
+                    "INSERT INTO player_teams (player_id, team_id) VALUES (%s, %s)",
+                    chunk
+                )
+
+        conn.commit()
+
+    except Exception:
+        conn.rollback()
+        raise
+
+    finally:
+        cursor.close()
+        conn.close()
+
+    report = [
+        {"row": row, "name": _cell(df, row - 2, "name"), "errors": messages}
+        for row, messages in sorted(errors.items())
+    ]
+
+    return {
+        "rows": total,
+        "inserted": len(records),
+        "rejected": len(report),
+        "team_links": len(link_rows),
+        "images": len(images),
+        "errors": report
+    }
+
+
+def _cell(df, index, column):
+    if column not in df.columns:
+        return None
+    value = df.at[index, column]
+    return None if pd.isna(value) else str(value)
@@ -0,0 +1,250 @@
+"""
+Canonical schema: the tables and columns the backend reads and writes.
+
+Rendered as MySQL or SQLite DDL, so the production tables, the bench MySQL
+(bench/schema.sql) and the embedded SQLite backend cannot drift apart.
+
+    python -m core.schema mysql > bench/schema.sql
+"""
+import argparse
+import re
+
+DIALECTS = ("mysql", "sqlite")
+
+# Column type -> (MySQL, SQLite)
+TYPES = {
+    "serial": ("INT AUTO_INCREMENT PRIMARY KEY", "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    "bigserial": ("BIGINT AUTO_INCREMENT PRIMARY KEY", "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    "int": ("INT", "INTEGER"),
+    "bigint": ("BIGINT", "INTEGER"),
+    "mask": ("BIGINT UNSIGNED", "INTEGER"),
+    "flag": ("TINYINT(1)", "INTEGER"),
+    "money": ("DECIMAL(12,2)", "DECIMAL(12,2)"),
+    "text": ("TEXT", "TEXT"),
+    "json": ("JSON", "TEXT"),
+    "datetime": ("DATETIME(6)", "DATETIME"),
+    "timestamp": ("TIMESTAMP(3)", "TIMESTAMP"),
+    "created_at": ("TIMESTAMP DEFAULT CURRENT_TIMESTAMP", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP"),
+    "updated_at": (
+        "TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP",
+        "TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+    ),
+}
+
+_VARCHAR_RE = re.compile(r"varchar\((\d+)\)")
+
+
+def column_type(kind, dialect):
+    match = _VARCHAR_RE.fullmatch(kind)
+    if match:
+        return f"VARCHAR({match.group(1)})" if dialect == "mysql" else "TEXT"
+    return TYPES[kind][DIALECTS.index(dialect)]
+
+
+class Table:
+    """
+    columns: (name, type, constraints) tuples, types from TYPES or varchar(n).
+    indexes: (index name, column list) pairs.
+    """
+
+    def __init__(self, name, columns, primary_key=None, indexes=()):
+        self.name = name
+        self.columns = columns
+        self.primary_key = primary_key
+        self.indexes = indexes
+
+    def key_columns(self):
+        """Columns an upsert conflicts on."""
+        if self.primary_key:
+            return self.primary_key
+        return tuple(
+            name for name, kind, constraints in self.columns
+            if kind in ("serial", "bigserial") or "PRIMARY KEY" in constraints
+        )
+
+    def create_sql(self, dialect="mysql", if_not_exists=True):
+        """CREATE statements for this table; MySQL keeps its indexes inline so the statement stays idempotent."""
+        lines = [
+            f"{name} {column_type(kind, dialect)} {constraints}".rstrip()
+            for name, kind, constraints in self.columns
+        ]
+
+        if self.primary_key:
+            lines.append(f"PRIMARY KEY ({', '.join(self.primary_key)})")
+
+        if dialect == "mysql":
+            lines += [f"KEY {index} ({', '.join(cols)})" for index, cols in self.indexes]
+
+        guard = "IF NOT EXISTS " if if_not_exists else ""
+        body = ",\n    ".join(lines)
+        statements = [f"CREATE TABLE {guard}{self.name} (\n    {body}\n)"]
+
+        if dialect == "sqlite":
+            statements += [
+                f"CREATE INDEX {guard}{index} ON {self.name} ({', '.join(cols)})"
+                for index, cols in self.indexes
+            ]
+
+        return statements
+
+
+TABLES = {table.name: table for table in (
+    Table("teams", [
+        ("team_id", "serial", ""),
+        ("name", "varchar(255)", "NOT NULL UNIQUE"),
+        ("captain", "varchar(255)", ""),
+        ("mobile_No", "varchar(20)", ""),
+        ("email_Id", "varchar(255)", ""),
+        ("Team_Rank", "int", "DEFAULT 0"),
+        ("Total_Budget", "money", "DEFAULT 0"),
+        ("Season_Budget", "money", "DEFAULT 0"),
+        ("Players_Bought", "int", "DEFAULT 0"),
+        ("purse", "money", "DEFAULT 0"),
+        ("image_path", "varchar(255)", ""),
+    ]),
+    Table("users", [
+        ("id", "serial", ""),
+        ("name", "varchar(255)", ""),
+        ("email", "varchar(255)", "NOT NULL UNIQUE"),
+        ("password", "varchar(255)", "NOT NULL"),
+        ("role", "varchar(20)", "NOT NULL"),
+        ("team_id", "int", "NULL"),
+    ]),
+    Table("captains", [
+        ("id", "serial", ""),
+        ("name", "varchar(255)", "NOT NULL"),
+        ("team_id", "int", ""),
+        ("image_path", "varchar(255)", ""),
+    ], indexes=[
+        ("idx_captains_name", ("name",)),
+        ("idx_captains_team", ("team_id",)),
+    ]),
+    Table("players", [
+        ("id", "serial", ""),
+        ("name", "varchar(255)", "NOT NULL UNIQUE"),
+        ("nickname", "varchar(255)", ""),
+        ("age", "int", ""),
+        ("gender", "varchar(20)", ""),
+        ("category", "varchar(100)", ""),
+        ("jersey", "int", "UNIQUE"),
+        ("type", "varchar(100)", ""),
+        ("mobile_No", "varchar(20)", ""),
+        ("email_Id", "varchar(255)", ""),
+        ("base_price", "money", ""),
+        ("total_runs", "int", ""),
+        ("highest_runs", "int", ""),
+        ("wickets_taken", "int", ""),
+        ("times_out", "int", ""),
+        ("teams_played", "text", ""),
+        ("image_path", "varchar(255)", ""),
+    ], indexes=[
+        ("idx_players_category_name", ("category", "name")),
+        ("idx_players_type_name", ("type", "name")),
+    ]),
+    Table("player_teams", [
+        ("player_id", "int", "NOT NULL"),
+        ("team_id", "int", "NOT NULL"),
+    ], primary_key=("player_id", "team_id"), indexes=[
+        ("idx_player_teams_team", ("team_id", "player_id")),
+    ]),
+    Table("current_auction", [
+        ("player_id", "int", "PRIMARY KEY"),
+        ("start_time", "datetime", ""),
+        ("expires_at", "datetime", ""),
+        ("auction_duration", "int", ""),
+        ("mode", "varchar(20)", ""),
+        ("paused", "flag", "DEFAULT 0"),
+        ("paused_remaining", "int", "NULL"),
+    ]),
+    Table("live_bids", [
+        ("player_id", "int", "NOT NULL"),
+        ("team_id", "int", "NOT NULL"),
+        ("bid_amount", "money", "NOT NULL"),
+        ("bid_time", "datetime", ""),
+    ], primary_key=("player_id", "team_id"), indexes=[
+        ("idx_live_bids_player_amount", ("player_id", "bid_amount")),
+    ]),
+    Table("bids", [
+        ("id", "serial", ""),
+        ("player_id", "int", "NOT NULL"),
+        ("team_id", "int", "NOT NULL"),
+        ("bid_amount", "money", "NOT NULL"),
+        ("bid_time", "datetime", ""),
+    ], indexes=[
+        ("idx_bids_player_time", ("player_id", "bid_time")),
+    ]),
+    Table("sold_players", [
+        ("id", "serial", ""),
+        ("player_id", "int", "NOT NULL"),
+        ("team_id", "int", "NOT NULL"),
+        ("sold_price", "money", "NOT NULL"),
+        ("session_id", "varchar(64)", ""),
+        ("sold_time", "datetime", ""),
+    ], indexes=[
+        ("idx_sold_players_player", ("player_id",)),
+        ("idx_sold_players_team", ("team_id", "sold_time")),
+    ]),
+    Table("unsold_players", [
+        ("id", "serial", ""),
+        ("player_id", "int", "NOT NULL"),
+        ("reason", "varchar(255)", ""),
+        ("added_on", "datetime", ""),
+    ], indexes=[
+        ("idx_unsold_players_player", ("player_id",)),
+    ]),
+    Table("team_ledger", [
+        ("team_id", "int", "PRIMARY KEY"),
+        ("purse", "money", "NOT NULL DEFAULT 0"),
+        ("spent", "money", "NOT NULL DEFAULT 0"),
+        ("squad_count", "int", "NOT NULL DEFAULT 0"),
+        ("category_mask", "mask", "NOT NULL DEFAULT 0"),
+        ("max_bid", "money", "NOT NULL DEFAULT 0"),
+        ("updated_at", "updated_at", ""),
+    ]),
+    Table("auction_events", [
+        ("id", "bigserial", ""),
+        ("event_type", "varchar(32)", "NOT NULL"),
+        ("player_id", "int", "NULL"),
+        ("team_id", "int", "NULL"),
+        ("amount", "money", "NULL"),
+        ("data", "json", "NULL"),
+        ("occurred_at", "timestamp", "NOT NULL"),
+    ], indexes=[
+        ("idx_auction_events_player", ("player_id", "id")),
+    ]),
+    Table("schema_migrations", [
+        ("version", "int", "PRIMARY KEY"),
+        ("description", "varchar(255)", "NOT NULL"),
+        ("applied_at", "created_at", ""),
+    ]),
+    Table("auction_snapshots", [
+        ("id", "bigserial", ""),
+        ("last_event_id", "bigint", "NOT NULL"),
+        ("state", "json", "NOT NULL"),
+        ("created_at", "created_at", ""),
+    ]),
+)}
+
+
+def create_table_sql(name, dialect="mysql"):
+    return TABLES[name].create_sql(dialect)
+
+
+def schema_sql(dialect="mysql"):
+    """The whole schema as one script."""
+    statements = [s for table in TABLES.values() for s in table.create_sql(dialect, if_not_exists=False)]
+    return ";\n\n".join(statements) + ";\n"
+
+
+# ---------- CLI ----------
+def main():
+    parser = argparse.ArgumentParser(description="Print the schema DDL for a dialect")
+    parser.add_argument("dialect", choices=DIALECTS)
+    args = parser.parse_args()
+
+    print(f"-- Generated by `python -m core.schema {args.dialect}` from core/schema.py; do not edit.\n")
+    print(schema_sql(args.dialect), end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+import heapq
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+
+import pymysql
+
+from core.config import get_settings
+from core.database import get_db_connection
+from core.log import get_logger
+
+logger = get_logger("search")
+
+# Below this Jaccard similarity a trigram match is noise
+MIN_SIMILARITY = 0.25
+# Short prefixes ("a") can match most of the roster; stop collecting early
+MAX_PREFIX_HITS = 1000
+
+PLAYER_ROWS_SQL = """
+    SELECT
+        p.id AS player_id,
+        p.name,
+        p.nickname,
+        p.jersey,
+        p.category,
+        p.type,
+        p.image_path,
+        p.base_price,
+        CASE
+            WHEN EXISTS (SELECT 1 FROM sold_players sp WHERE sp.player_id = p.id) THEN 'sold'
+            WHEN EXISTS (SELECT 1 FROM unsold_players up WHERE up.player_id = p.id) THEN 'unsold'
+            ELSE 'available'
+        END AS status
+    FROM players p
+    WHERE p.id > %s
+"""
+
+
+def normalize(text):
+    """Lowercase, strip accents, keep letters/digits separated by single spaces."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", str(text).lower())
+    text = "".join(ch if ch.isalnum() else " " for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.split())
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerSearchIndex:
+    """
+    In-memory index over players. Names and nicknames are split into words;
+    the distinct words form a sorted vocabulary (prefix matches by bisect)
+    with trigram postings (typo-tolerant matches). Jerseys map exactly.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._docs = {}          # player_id -> public row
+        self._names = {}         # player_id -> normalized names (name, nickname)
+        self._vocab = []         # sorted distinct words
+        self._word_ids = {}      # word -> {player_id}
+        self._grams = {}         # trigram -> {word}
+        self._jerseys = {}       # jersey -> player_id
+        self.max_id = 0
+        self.loaded_at = None
+
+    # ---------- WRITES ----------
+    def _add(self, row, bulk=False):
+        player_id = row["player_id"]
+        names = [n for n in (normalize(row.get("name")), normalize(row.get("nickname"))) if n]
+
+        self._docs[player_id] = {
+            **row,
+            "base_price": float(row["base_price"]) if row.get("base_price") is not None else None,
+        }
+        self._names[player_id] = names
+
+        for word in {w for name in names for w in name.split()}:
+            ids = self._word_ids.get(word)
+
+            if ids is None:
+                ids = self._word_ids[word] = set()
+                if bulk:
+                    self._vocab.append(word)
+                else:
+                    insort(self._vocab, word)
+                for gram in trigrams(word):
+                    self._grams.setdefault(gram, set()).add(word)
+
+            ids.add(player_id)
+
+        if row.get("jersey") is not None:
+            self._jerseys[str(row["jersey"])] = player_id
+
+        self.max_id = max(self.max_id, player_id)
+
+    def _remove(self, player_id):
+        doc = self._docs.pop(player_id, None)
+        if doc is None:
+            return
+
+        for word in {w for name in self._names.pop(player_id) for w in name.split()}:
+            ids = self._word_ids[word]
+            ids.discard(player_id)
+
+            if not ids:
+                del self._word_ids[word]
+                del self._vocab[bisect_left(self._vocab, word)]
+                for gram in trigrams(word):
+                    self._grams[gram].discard(word)
+
+        if self._jerseys.get(str(doc.get("jersey"))) == player_id:
+            del self._jerseys[str(doc["jersey"])]
+
+    def upsert(self, row):
+        with self._lock:
+            self._remove(row["player_id"])
+            self._add(row)
+
+    def remove(self, player_id):
+        with self._lock:
+            self._remove(player_id)
+
+    def set_status(self, player_id, status):
+        with self._lock:
+            doc = self._docs.get(player_id)
+            if doc is not None:
+                doc["status"] = status
+
+    def replace_all(self, rows):
+        fresh = PlayerSearchIndex()
+        for row in rows:
+            fresh._add(row, bulk=True)
+        fresh._vocab.sort()
+
+        with self._lock:
+            self._docs, self._names = fresh._docs, fresh._names
+            self._vocab, self._word_ids = fresh._vocab, fresh._word_ids
+            self._grams, self._jerseys = fresh._grams, fresh._jerseys
+            self.max_id = fresh.max_id
+            self.loaded_at = time.monotonic()
+
+    # ---------- READS ----------
+    def _similar_words(self, word):
+        """Vocabulary words matching `word`, with a 0..1 quality."""
+        matches = {}
+        i = bisect_left(self._vocab, word)
+
+        while i < len(self._vocab) and len(matches) < MAX_PREFIX_HITS:
+            candidate = self._vocab[i]
+            if not candidate.startswith(word):
+                break
+            matches[candidate] = 1.0 if candidate == word else 0.8
+            i += 1
+
+        # Typo tolerance: trigram Jaccard similarity against the vocabulary
+        if len(word) >= 3:
+            grams = trigrams(word)
+            shared = Counter()
+            for gram in grams:
+                shared.update(self._grams.get(gram, ()))
+
+            for candidate, count in shared.items():
+                similarity = count / (len(grams) + len(candidate) + 2 - count)
+                if similarity >= MIN_SIMILARITY and candidate not in matches:
+                    matches[candidate] = 0.6 * similarity
+
+        return matches
+
+    def search(self, query, limit=20, status=None):
+        q = normalize(query)
+        if not q:
+            return []
+
+        with self._lock:
+            scores = None
+
+            # Every query word has to match some word of the name / nickname
+            for word in q.split():
+                word_scores = {}
+                for candidate, quality in self._similar_words(word).items():
+                    for player_id in self._word_ids[candidate]:
+                        if quality > word_scores.get(player_id, 0):
+                            word_scores[player_id] = quality
+
+                if scores is None:
+                    scores = word_scores
+                else:
+                    scores = {pid: scores[pid] + sc for pid, sc in word_scores.items() if pid in scores}
+
+                if not scores:
+                    break
+
+            scores = scores or {}
+
+            for player_id in scores:
+                names = self._names[player_id]
+                if q in names:
+                    scores[player_id] += 10.0
+                elif any(name.startswith(q) for name in names):
+                    scores[player_id] += 5.0
+
+            jersey_id = self._jerseys.get(q)
+            if jersey_id is not None:
+                scores[jersey_id] = 100.0
+
+            if status is not None:
+                scores = {pid: sc for pid, sc in scores.items() if self._docs[pid]["status"] == status}
+
+            top = heapq.nsmallest(
+                limit, scores.items(),
+                key=lambda item: (-item[1], self._docs[item[0]]["name"] or "")
+            )
+
+            return [{**self._docs[pid], "score": round(score, 3)} for pid, score in top]
+
+    def __len__(self):
+        return len(self._docs)
+
+
+SEARCH_INDEX = PlayerSearchIndex()
+_load_lock = threading.Lock()
+
+
+def _fetch_rows(after_id):
+    conn = get_db_connection()
+
+    if conn is None:
+        raise RuntimeError("Database connection failed")
+
+    cursor = conn.cursor(pymysql.cursors.DictCursor)
+
+    try:
+        cursor.execute(PLAYER_ROWS_SQL, (after_id,))
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def ensure_index():
+    """Full (re)build on first use and every search_refresh_seconds after that."""
+    refresh = get_settings().search_refresh_seconds
+    loaded_at = SEARCH_INDEX.loaded_at
+
+    if loaded_at is not None and time.monotonic() - loaded_at < refresh:
+        return SEARCH_INDEX
+
+    with _load_lock:
+        if SEARCH_INDEX.loaded_at is loaded_at:
+            started = time.perf_counter()
+            SEARCH_INDEX.replace_all(_fetch_rows(0))
+            logger.info(
+                "Search index built",
+                extra={"players": len(SEARCH_INDEX), "ms": round((time.perf_counter() - started) * 1000, 1)}
+            )
+
+    return SEARCH_INDEX
+
+
+def index_new_players():
+    """Add players inserted since the last load (ids are auto-increment)."""
+    if SEARCH_INDEX.loaded_at is None:
+        return
+
+    try:
+        with _load_lock:
+            for row in _fetch_rows(SEARCH_INDEX.max_id):
+                SEARCH_INDEX.upsert(row)
+    except Exception:
+        # The periodic rebuild catches up; never fail the write that triggered this
+        logger.exception("Incremental search index update failed")
+
+
+def mark_player_status(player_id, status):
+    SEARCH_INDEX.set_status(player_id, status)
@@ -0,0 +1,169 @@
+"""
+Embedded SQLite backend, for running the whole backend without a MySQL
+server (JPL_DB_BACKEND=sqlite, simulators, benchmarks).
+
+Tables come from core.migrations. Statements are rewritten for the MySQL-only
+syntax the backend uses: %s placeholders, NOW(), RAND(), FOR UPDATE,
+DATE_ADD(.., INTERVAL n SECOND), GROUP_CONCAT(.. SEPARATOR ..),
+parenthesised UNION branches and ON DUPLICATE KEY UPDATE. NOW() follows core.clock, so an accelerated or
+virtual clock moves database timestamps too.
+"""
+import os
+import re
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+from core.clock import get_clock
+from core.database import TimedCursor
+from core.schema import TABLES
+
+_INSERT_TABLE_RE = re.compile(r"INSERT\s+INTO\s+`?(\w+)", re.IGNORECASE)
+_DATE_ADD_RE = re.compile(r"DATE_ADD\(\s*([\w.]+(?:\(\))?)\s*,\s*INTERVAL\s+(%s|\d+)\s+SECOND\s*\)", re.IGNORECASE)
+_GROUP_CONCAT_RE = re.compile(
+    r"GROUP_CONCAT\(\s*(DISTINCT\s+)?(.+?)(?:\s+ORDER\s+BY\s+[^)]*?)?\s+SEPARATOR\s+('[^']*')\s*\)",
+    re.IGNORECASE
+)
+# "(SELECT .. ORDER BY .. LIMIT n) UNION ALL (SELECT ..)": SQLite wants each branch as a subquery
+_UNION_BRANCH_RE = re.compile(r"(\(|UNION(?:\s+ALL)?\s+)\(SELECT\b", re.IGNORECASE)
+_VALUES_RE = re.compile(r"VALUES\((\w+)\)", re.IGNORECASE)
+_ON_DUPLICATE_RE = re.compile(r"ON\s+DUPLICATE\s+KEY\s+UPDATE", re.IGNORECASE)
+
+
+def _format_time(value):
+    # Stored naive UTC, the way pymysql hands DATETIME columns back
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(sep=" ", timespec="microseconds")
+
+
+def _parse_time(raw):
+    return datetime.fromisoformat(raw.decode() if isinstance(raw, bytes) else raw)
+
+
+sqlite3.register_adapter(datetime, _format_time)
+sqlite3.register_converter("DATETIME", _parse_time)
+sqlite3.register_converter("TIMESTAMP", _parse_time)
+
+
+def _date_add_seconds(value, seconds):
+    if value is None:
+        return None
+    return _format_time(_parse_time(value) + timedelta(seconds=seconds))
+
+
+def _group_concat(match):
+    distinct, expr, separator = match.groups()
+    # SQLite allows no separator on DISTINCT aggregates, nor ORDER BY before 3.44
+    if distinct:
+        return f"REPLACE(GROUP_CONCAT(DISTINCT {expr}), ',', {separator})"
+    return f"GROUP_CONCAT({expr}, {separator})"
+
+
+@lru_cache(maxsize=1024)
+def translate(sql):
+    """MySQL statement -> SQLite statement."""
+    sql = _DATE_ADD_RE.sub(r"DATE_ADD_SECONDS(\1, \2)", sql)
+    sql = _GROUP_CONCAT_RE.sub(_group_concat, sql)
+    sql = _UNION_BRANCH_RE.sub(r"\1SELECT * FROM (SELECT", sql)
+    sql = re.sub(r"\bFOR\s+UPDATE\b", "", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bRAND\(\)", "RANDOM()", sql, flags=re.IGNORECASE)
+
+    duplicate = _ON_DUPLICATE_RE.search(sql)
+    if duplicate:
+        table = TABLES[_INSERT_TABLE_RE.search(sql).group(1)]
+        head, tail = sql[:duplicate.start()], _VALUES_RE.sub(r"excluded.\1", sql[duplicate.end():])
+        sql = f"{head}ON CONFLICT({', '.join(table.key_columns())}) DO UPDATE SET{tail}"
+
+    return sql.replace("%s", "?")
+
+
+class SQLiteCursor:
+    def __init__(self, conn):
+        self._cursor = conn.cursor()
+
+    def execute(self, query, args=None):
+        return self._cursor.execute(translate(query), tuple(args or ()))
+
+    def executemany(self, query, args):
+        return self._cursor.executemany(translate(query), [tuple(a) for a in args])
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """The slice of the pymysql connection API the backend uses."""
+
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path, timeout=5, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        self._conn.row_factory = lambda cursor, row: {d[0]: v for d, v in zip(cursor.description, row)}
+        self._conn.create_function("NOW", 0, lambda: _format_time(get_clock().now()))
+        self._conn.create_function("DATE_ADD_SECONDS", 2, _date_add_seconds)
+
+    def cursor(self, *args):
+        return TimedCursor(SQLiteCursor(self._conn))
+
+    def begin(self):
+        pass
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def ping(self, reconnect=True):
+        pass
+
+    def close(self):
+        self._conn.close()
+
+
+class SQLiteDatabase:
+    """Connection factory for core.database; one short-lived connection per call."""
+
+    dialect = "sqlite"
+
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self):
+        return SQLiteConnection(self.path)
+
+    def create_schema(self):
+        # Imported here: migrations reach the database through core.database
+        from core.migrations import migrate
+
+        conn = self()
+        try:
+            conn._conn.execute("PRAGMA journal_mode=WAL")
+            migrate(conn, self.dialect)
+        finally:
+            conn.close()
+
+
+def open_database(path, fresh=False):
+    """Factory for the database file at `path`, created (or with fresh=True, recreated) as needed."""
+    if fresh:
+        for stale in (path, f"{path}-wal", f"{path}-shm"):
+            if os.path.exists(stale):
+                os.remove(stale)
+
+    database = SQLiteDatabase(path)
+    database.create_schema()
+    return database
@@ -0,0 +1,79 @@
+import os
+from mimetypes import guess_type
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+
+from core.storage import is_content_addressed, content_digest
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Sidecar files written next to the original, in order of preference
+PRECOMPRESSED = (
+    ("br", ".br"),
+    ("gzip", ".gz"),
+)
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles for the uploads mount.
+
+    Content-hashed files never change, so they are served as immutable with
+    the hash as a strong ETag. Anything else (legacy names) is revalidated.
+    Precompressed sidecars (`.br` / `.gz`) are picked when the client accepts
+    them; Range requests are handled by FileResponse.
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        request_headers = Headers(scope=scope)
+        filename = os.path.basename(full_path)
+        media_type = guess_type(filename)[0] or "application/octet-stream"
+
+        headers = {}
+        path = full_path
+        encoding = None
+
+        sidecars = [
+            (name, suffix) for name, suffix in PRECOMPRESSED
+            if os.path.isfile(f"{full_path}{suffix}")
+        ]
+
+        if sidecars:
+            headers["vary"] = "Accept-Encoding"
+            accepted = {
+                part.split(";")[0].strip()
+                for part in request_headers.get("accept-encoding", "").split(",")
+            }
+            for name, suffix in sidecars:
+                if name in accepted:
+                    encoding = name
+                    path = f"{full_path}{suffix}"
+                    stat_result = os.stat(path)
+                    headers["content-encoding"] = name
+                    break
+
+        if is_content_addressed(filename):
+            etag = content_digest(filename)
+            if encoding:
+                etag = f"{etag}-{encoding}"
+            headers["etag"] = f'"{etag}"'
+            headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            headers["cache-control"] = REVALIDATE_CACHE_CONTROL
+
+        response = FileResponse(
+            path,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            stat_result=stat_result
+        )
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+
+        return response
@@ -0,0 +1,66 @@
+import hashlib
+import os
+import re
+import tempfile
+
+UPLOAD_ROOT = "uploads"
+
+CHUNK_SIZE = 64 * 1024
+
+# Stored files are named after the sha256 of their bytes: <64 hex chars>.<ext>
+CONTENT_NAME_RE = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]+$")
+
+
+def is_content_addressed(filename):
+    return bool(CONTENT_NAME_RE.match(os.path.basename(filename)))
+
+
+def content_digest(filename):
+    return os.path.basename(filename).split(".", 1)[0]
+
+
+def store_stream(folder, chunks, ext):
+    """
+    Stream chunks into `folder` under their content hash and return the
+    public path (e.g. "uploads/players/<sha256>.png").
+
+    Uploading the same bytes twice resolves to the same file, so the
+    second copy is dropped instead of written.
+    """
+    os.makedirs(folder, exist_ok=True)
+
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".upload-")
+
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            for chunk in chunks:
+                digest.update(chunk)
+                tmp.write(chunk)
+
+        filename = f"{digest.hexdigest()}.{ext.lower()}"
+        final_path = os.path.join(folder, filename)
+
+        if os.path.exists(final_path):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, final_path)
+
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return f"{folder.rstrip('/')}/{filename}"
+
+
+def store_file(folder, fileobj, ext):
+    return store_stream(
+        folder,
+        iter(lambda: fileobj.read(CHUNK_SIZE), b""),
+        ext
+    )
+
+
+def store_bytes(folder, data, ext):
+    return store_stream(folder, [data], ext)
@@ -0,0 +1,109 @@
+import random
+import threading
+import time
+import uuid
+from collections import deque
+
+from core.config import get_settings
+
+
+class Trace:
+    """
+    Timeline of one operation split into consecutive stages.
+
+    stage() closes the running span and opens the next one, so handlers with
+    many early returns only need a single finish() in their `finally`.
+    """
+
+    def __init__(self, name, **attrs):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.attrs = attrs
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.spans = []
+        self._current = None
+        self.duration = None
+
+    def stage(self, name):
+        now = time.perf_counter()
+        self._close(now)
+        self._current = [name, now]
+
+    def _close(self, now):
+        if self._current is not None:
+            name, started = self._current
+            self.spans.append((name, started - self._t0, now - started))
+            self._current = None
+
+    def finish(self, **attrs):
+        if self.duration is not None:
+            return
+        now = time.perf_counter()
+        self._close(now)
+        self.attrs.update(attrs)
+        self.duration = now - self._t0
+        TRACES.record(self)
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round((self.duration or 0) * 1000, 3),
+            "attrs": self.attrs,
+            "spans": [
+                {
+                    "name": name,
+                    "offset_ms": round(offset * 1000, 3),
+                    "duration_ms": round(duration * 1000, 3),
+                }
+                for name, offset, duration in self.spans
+            ],
+        }
+
+
+class TraceBuffer:
+    """
+    Tail-sampled ring buffers: every trace slower than the threshold (or
+    that failed) is kept in `slow`, the rest are sampled into `recent`.
+    """
+
+    def __init__(self, capacity, slow_threshold, sample_rate):
+        self.slow_threshold = slow_threshold
+        self.sample_rate = sample_rate
+        self.recent = deque(maxlen=capacity)
+        self.slow = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def record(self, trace):
+        if trace.duration >= self.slow_threshold or "error" in trace.attrs:
+            with self._lock:
+                self.slow.append(trace)
+        elif random.random() < self.sample_rate:
+            with self._lock:
+                self.recent.append(trace)
+
+    def export(self, limit=100, slow_only=False, trace_id=None, name=None):
+        with self._lock:
+            traces = list(self.slow) if slow_only else list(self.slow) + list(self.recent)
+
+        if trace_id:
+            traces = [t for t in traces if t.trace_id == trace_id]
+        if name:
+            traces = [t for t in traces if t.name == name]
+
+        traces.sort(key=lambda t: t.started_at, reverse=True)
+        return [t.to_dict() for t in traces[:limit]]
+
+
+def _build_buffer():
+    settings = get_settings()
+    return TraceBuffer(
+        capacity=settings.trace_buffer_size,
+        slow_threshold=settings.trace_slow_ms / 1000,
+        sample_rate=settings.trace_sample_rate
+    )
+
+
+TRACES = _build_buffer()
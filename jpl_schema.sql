@@ -1,63 +1,148 @@
+-- Production schema for the JPL auction backend.
 
 CREATE DATABASE IF NOT EXISTS jpl;
 USE jpl;
 
--- Drop tables if exist for a clean setup
-DROP TABLE IF EXISTS bids;
-DROP TABLE IF EXISTS players;
-DROP TABLE IF EXISTS teams;
+-- Generated by `python -m core.schema mysql` from core/schema.py; do not edit.
 
--- Teams table
 CREATE TABLE teams (
+    team_id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL UNIQUE,
+    captain VARCHAR(255),
+    mobile_No VARCHAR(20),
+    email_Id VARCHAR(255),
+    Team_Rank INT DEFAULT 0,
+    Total_Budget DECIMAL(12,2) DEFAULT 0,
+    Season_Budget DECIMAL(12,2) DEFAULT 0,
+    Players_Bought INT DEFAULT 0,
+    purse DECIMAL(12,2) DEFAULT 0,
+    image_path VARCHAR(255)
+);
+
+CREATE TABLE users (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(255),
+    email VARCHAR(255) NOT NULL UNIQUE,
+    password VARCHAR(255) NOT NULL,
+    role VARCHAR(20) NOT NULL,
+    team_id INT NULL
+);
+
+CREATE TABLE captains (
     id INT AUTO_INCREMENT PRIMARY KEY,
     name VARCHAR(255) NOT NULL,
-    budget DECIMAL(10,2) DEFAULT 20000.00
+    team_id INT,
+    image_path VARCHAR(255),
+    KEY idx_captains_name (name),
+    KEY idx_captains_team (team_id)
 );
 
--- Players table
 CREATE TABLE players (
     id INT AUTO_INCREMENT PRIMARY KEY,
-    name VARCHAR(255) NOT NULL,
+    name VARCHAR(255) NOT NULL UNIQUE,
     nickname VARCHAR(255),
     age INT,
+    gender VARCHAR(20),
     category VARCHAR(100),
+    jersey INT UNIQUE,
     type VARCHAR(100),
-    base_price DECIMAL(10,2),
+    mobile_No VARCHAR(20),
+    email_Id VARCHAR(255),
+    base_price DECIMAL(12,2),
     total_runs INT,
     highest_runs INT,
     wickets_taken INT,
     times_out INT,
     teams_played TEXT,
-    image_path VARCHAR(255)
+    image_path VARCHAR(255),
+    KEY idx_players_category_name (category, name),
+    KEY idx_players_type_name (type, name)
+);
+
+CREATE TABLE player_teams (
+    player_id INT NOT NULL,
+    team_id INT NOT NULL,
+    PRIMARY KEY (player_id, team_id),
+    KEY idx_player_teams_team (team_id, player_id)
+);
+
+CREATE TABLE current_auction (
+    player_id INT PRIMARY KEY,
+    start_time DATETIME(6),
+    expires_at DATETIME(6),
+    auction_duration INT,
+    mode VARCHAR(20),
+    paused TINYINT(1) DEFAULT 0,
+    paused_remaining INT NULL
+);
+
+CREATE TABLE live_bids (
+    player_id INT NOT NULL,
+    team_id INT NOT NULL,
+    bid_amount DECIMAL(12,2) NOT NULL,
+    bid_time DATETIME(6),
+    PRIMARY KEY (player_id, team_id),
+    KEY idx_live_bids_player_amount (player_id, bid_amount)
 );
 
--- Bids table
 CREATE TABLE bids (
     id INT AUTO_INCREMENT PRIMARY KEY,
-    player_id INT,
-    team_id INT,
-    bid_amount DECIMAL(10,2),
-    bid_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (player_id) REFERENCES players(id),
-    FOREIGN KEY (team_id) REFERENCES teams(id)
-);
-
--- Insert sample teams
-INSERT INTO teams (name, budget) VALUES
-('JPL Warriors', 25000.00),
-('JPL Titans', 30000.00),
-('JPL Challengers', 20000.00),
-('JPL Strikers', 15000.00);
-
--- Insert sample players
-INSERT INTO players (name, nickname, age, category, type, base_price, total_runs, highest_runs, wickets_taken, times_out, teams_played, image_path) VALUES
-('Prathamesh Bhadwalkar', 'PB', 19, 'Batsman', 'Right Handed', 5000, 1200, 90, 5, 20, 'JPL Warriors', '/assets/images/player1.png'),
-('Amit Sharma', 'Ami', 22, 'Bowler', 'Left Arm Spinner', 4000, 500, 45, 40, 15, 'JPL Titans', '/assets/images/player2.png'),
-('Rahul Verma', 'RV', 21, 'All-Rounder', 'Right Handed', 7000, 1500, 100, 20, 25, 'JPL Challengers', '/assets/images/player3.png'),
-('Suresh Iyer', 'SI', 23, 'Batsman', 'Right Handed', 6000, 1800, 110, 2, 30, 'JPL Strikers', '/assets/images/player4.png'),
-('Karan Patel', 'KP', 20, 'Bowler', 'Right Arm Fast', 3500, 300, 30, 50, 10, 'JPL Titans', '/assets/images/player5.png'),
-('Neha Kulkarni', 'NK', 18, 'Batsman', 'Left Handed', 3000, 800, 60, 0, 18, 'JPL Challengers', '/assets/images/player6.png'),
-('Vikas Yadav', 'Vicky', 25, 'All-Rounder', 'Right Handed', 8000, 2200, 130, 30, 28, 'JPL Warriors', '/assets/images/player7.png'),
-('Deepak Joshi', 'DJ', 24, 'Bowler', 'Left Arm Fast', 4500, 400, 40, 45, 12, 'JPL Strikers', '/assets/images/player8.png'),
-('Anjali Mehta', 'Anju', 19, 'Batsman', 'Right Handed', 5500, 1000, 70, 3, 20, 'JPL Warriors', '/assets/images/player9.png'),
-('Sanjay Rao', 'SR', 26, 'All-Rounder', 'Left Handed', 9000, 2500, 150, 35, 32, 'JPL Titans', '/assets/images/player10.png');
+    player_id INT NOT NULL,
+    team_id INT NOT NULL,
+    bid_amount DECIMAL(12,2) NOT NULL,
+    bid_time DATETIME(6),
+    KEY idx_bids_player_time (player_id, bid_time)
+);
+
+CREATE TABLE sold_players (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    player_id INT NOT NULL,
+    team_id INT NOT NULL,
+    sold_price DECIMAL(12,2) NOT NULL,
+    session_id VARCHAR(64),
+    sold_time DATETIME(6),
+    KEY idx_sold_players_player (player_id),
+    KEY idx_sold_players_team (team_id, sold_time)
+);
+
+CREATE TABLE unsold_players (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    player_id INT NOT NULL,
+    reason VARCHAR(255),
+    added_on DATETIME(6),
+    KEY idx_unsold_players_player (player_id)
+);
+
+CREATE TABLE team_ledger (
+    team_id INT PRIMARY KEY,
+    purse DECIMAL(12,2) NOT NULL DEFAULT 0,
+    spent DECIMAL(12,2) NOT NULL DEFAULT 0,
+    squad_count INT NOT NULL DEFAULT 0,
+    category_mask BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    max_bid DECIMAL(12,2) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+CREATE TABLE auction_events (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    event_type VARCHAR(32) NOT NULL,
+    player_id INT NULL,
+    team_id INT NULL,
+    amount DECIMAL(12,2) NULL,
+    data JSON NULL,
+    occurred_at TIMESTAMP(3) NOT NULL,
+    KEY idx_auction_events_player (player_id, id)
+);
+
+CREATE TABLE schema_migrations (
+    version INT PRIMARY KEY,
+    description VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE auction_snapshots (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    last_event_id BIGINT NOT NULL,
+    state JSON NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -1,24 +1,51 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 import socketio
-from sockets.socket_manager import sio
+from sockets.socket_manager import sio, allow_local_network_origin
 from sockets.socket_events import register_socket_events
+from core.config import get_settings
+from core.log import get_logger, setup_logging
 from core.database import get_db_connection
+from core.migrations import run_migrations
+from core.metrics import MetricsMiddleware, watch_event_loop
+from core.static_files import CachedStaticFiles
+from auction.team_ledger import load_ledger
+from auction.event_log import snapshot_loop
 from fastapi.concurrency import run_in_threadpool
 from auth.auth_routes import router as auth_router
 from routers.players import router as players_router
 from routers.teams import router as teams_router
 from routers.auction_routes import router as auction_router
-import socket
-# from core.utils import get_local_ip
+from routers.monitoring import router as monitoring_router
+
+setup_logging()
+logger = get_logger("server")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Network probing happens once the worker is up, not at import time
+    local_ip = await run_in_threadpool(allow_local_network_origin)
+    logger.info("Server reachable on http://%s:5000", local_ip)
+
+    await run_in_threadpool(run_migrations)
+    await run_in_threadpool(load_ledger)
+
+    loop_probe = asyncio.create_task(watch_event_loop(get_settings().loop_lag_interval))
+    snapshots = asyncio.create_task(snapshot_loop(get_settings().event_snapshot_interval))
+    yield
+    loop_probe.cancel()
+    snapshots.cancel()
 
 #Create FastAPI app
-app =  FastAPI()
+app =  FastAPI(lifespan=lifespan)
 app.include_router(auth_router)
 app.include_router(players_router)
 app.include_router(teams_router)
 app.include_router(auction_router)
+app.include_router(monitoring_router)
 
 
 
@@ -39,19 +66,21 @@ app.include_router(auction_router)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins= ["*"],
+    allow_origins= get_settings().cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+app.add_middleware(MetricsMiddleware)
+
 #Register socket events
 register_socket_events()
 
 #Combine FastAPI + Soket.IO
 socket_app = socketio.ASGIApp(sio, other_asgi_app=app)
 
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.mount("/uploads", CachedStaticFiles(directory="uploads"), name="uploads")
 
 @app.get("/")
 async def root():
@@ -74,7 +103,7 @@ async def db_test():
             "result": result
         }
     except Exception as e:
-        print("DB test error:",e)
+        logger.exception("DB test error")
         return{"error": str(e)}
     finally:
         cursor.close()
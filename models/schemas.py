@@ -1,7 +1,9 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
+from core.config import get_settings
+
 class StartAuctionRequest(BaseModel):
     mode: str = "manual"
     player_id: Optional[int] = None
-    duration: int = 120
\ No newline at end of file
+    duration: int = Field(default_factory=lambda: get_settings().default_lot_duration)
\ No newline at end of file
@@ -4,12 +4,22 @@ import pymysql
 import asyncio
 from decimal import Decimal
 from auction.auction_engine import background_timer
+from core.clock import get_clock
+from core.config import get_settings
 from core.database import get_db_connection
+from core.log import get_logger
+from core.read_model import bump_version
+from core.search_index import mark_player_status
+from auction.team_ledger import LEDGER
+from auction.admission import ADMISSION
+from auction.proxy_engine import PROXIES
+from auction.event_log import log_event
 from auth.auth_handler import verify_token, get_token_from_request
 from sockets.socket_manager import sio, team_sockets
 from models.schemas import StartAuctionRequest
 
 router = APIRouter()
+logger = get_logger("auction")
 
 @router.post("/start-auction")
 async def start_auction(data: StartAuctionRequest, request: Request):
@@ -25,7 +35,7 @@ async def start_auction(data: StartAuctionRequest, request: Request):
         raise HTTPException(status_code=403, detail="Forbidden")
 
     mode = data.mode
-    duration = data.duration or 40
+    duration = data.duration or get_settings().fallback_lot_duration
     player_id = data.player_id
 
     conn = get_db_connection()
@@ -42,6 +52,20 @@ async def start_auction(data: StartAuctionRequest, request: Request):
         if cursor.fetchone():
             raise HTTPException(400, "Auction already running")
 
+        # Fresh team state for the session
+        LEDGER.rebuild(cursor)
+
+        # Replay starts from the team state the session opens with
+        ledger = LEDGER.snapshot()
+        log_event(
+            cursor, "session_started",
+            categories=ledger["categories"],
+            teams=[
+                {k: t[k] for k in ("team_id", "purse", "spent", "squad_count", "category_mask")}
+                for t in ledger["teams"]
+            ]
+        )
+
         # -------- SELECT PLAYER --------
 
         if mode == "manual":
@@ -90,7 +114,7 @@ async def start_auction(data: StartAuctionRequest, request: Request):
             raise HTTPException(400, "Invalid mode")
 
         if not player:
-            print("🏁 No eligible players remaining")
+            logger.info("No eligible players remaining")
             await sio.emit("auction_finished", {
                 "message": "No players available for auction"
             })
@@ -109,7 +133,7 @@ async def start_auction(data: StartAuctionRequest, request: Request):
 
         # -------- INSERT CURRENT AUCTION --------
 
-        start_time = datetime.now(timezone.utc)
+        start_time = get_clock().now()
         expires_at = start_time + timedelta(seconds=duration)
 
         cursor.execute("""
@@ -124,8 +148,16 @@ async def start_auction(data: StartAuctionRequest, request: Request):
             mode
         ))
 
+        log_event(
+            cursor, "lot_started", player_id,
+            category=player["category"], base_price=player.get("base_price"),
+            expires_at=expires_at, duration=duration, mode=mode
+        )
+
         conn.commit()
 
+        lot = LEDGER.open_lot(cursor, player)
+
         # -------- SOCKET EVENTS --------
 
         await sio.emit("timer_update", {
@@ -147,6 +179,8 @@ async def start_auction(data: StartAuctionRequest, request: Request):
             "duration": duration,
             "expires_at": expires_at.isoformat(),
             "current_bid": float(player.get("base_price") or 0),
+            "max_bids": LEDGER.lot_max_bids(player["category"]),
+            "eligible_teams": LEDGER.eligible_teams(lot),
             "history": []
         })
 
@@ -160,7 +194,7 @@ async def start_auction(data: StartAuctionRequest, request: Request):
             )
         )
 
-        print(f"🚀 Auction started for {player['name']}")
+        logger.info("Auction started", extra={"player_id": player_id, "player": player["name"]})
 
         return {
             "status": "auction_started",
@@ -170,13 +204,16 @@ async def start_auction(data: StartAuctionRequest, request: Request):
             "expires_at": expires_at.isoformat()
         }
 
-    except Exception as e:
+    except HTTPException:
         conn.rollback()
-        raise e
+        # The session's ledger rebuild was rolled back with it
+        LEDGER.invalidate()
+        raise
 
-    except Exception as e:
+    except Exception:
         conn.rollback()
-        print("❌ start-auction error: ",e)
+        LEDGER.invalidate()
+        logger.exception("start-auction failed")
         raise HTTPException(status_code=500, detail="Internal server error")
 
     finally:
@@ -185,7 +222,7 @@ async def start_auction(data: StartAuctionRequest, request: Request):
 
 
 def seconds_remaining(expires_at):
-    now = datetime.now(timezone.utc)
+    now = get_clock().now()
     remaining = (expires_at - now).total_seconds()
     return max(0, int(remaining))
 
@@ -320,17 +357,19 @@ async def get_current_auction(request: Request):
             "auction_duration": auction["auction_duration"],
             "teamBalance": team_balance,
             "nextSteps": [
-                current_bid + 500,
-                current_bid + 1000,
-                current_bid + 1500
+                current_bid + step * get_settings().min_increment
+                for step in (1, 2, 3)
             ],
             "paused": paused,
-            "canBid": user.get("role") == "team",
+            "canBid": (
+                user.get("role") == "team"
+                and LEDGER.can_bid(user.get("team_id"), LEDGER.lot_for(cursor, player_id))
+            ),
             "history": history
         }
 
     except Exception as e:
-        print("❌ ERROR in /current-auction:", e)
+        logger.exception("current-auction failed")
         raise HTTPException(status_code=500, detail=str(e))
 
     finally:
@@ -385,7 +424,7 @@ async def pause_auction(request: Request):
         if expires_at.tzinfo is None:
             expires_at = expires_at.replace(tzinfo=timezone.utc)
 
-        now = datetime.now(timezone.utc)
+        now = get_clock().now()
 
         remaining = max(0, int((expires_at - now).total_seconds()))
 
@@ -397,9 +436,11 @@ async def pause_auction(request: Request):
             WHERE player_id = %s
         """, (remaining, player_id))
 
+        log_event(cursor, "paused", player_id, remaining=remaining)
+
         conn.commit()
 
-        print(f"⏸ Auction paused for player {player_id} with {remaining}s remaining")
+        logger.info("Auction paused", extra={"player_id": player_id, "remaining": remaining})
 
         # ---------- SOCKET EVENT ----------
         await sio.emit("auction_paused", {
@@ -415,7 +456,7 @@ async def pause_auction(request: Request):
 
     except Exception as e:
         conn.rollback()
-        print("❌ Pause auction error:", e)
+        logger.exception("pause-auction failed")
         raise HTTPException(status_code=500, detail=str(e))
 
     finally:
@@ -464,7 +505,7 @@ async def resume_auction(request: Request):
             raise HTTPException(status_code=400, detail="Auction time already ended")
         
         # ---------------- NEW EXPIRY ------------------
-        new_end_time = datetime.now(timezone.utc) + timedelta(seconds=remaining)
+        new_end_time = get_clock().now() + timedelta(seconds=remaining)
 
         cursor.execute("""
             UPDATE current_auction
@@ -474,12 +515,14 @@ async def resume_auction(request: Request):
             WHERE player_id = %s
         """,(new_end_time, auction["player_id"]))
 
+        log_event(cursor, "resumed", auction["player_id"], expires_at=new_end_time)
+
         conn.commit()
 
         player_id = auction["player_id"]
         mode = auction["mode"]
 
-        print(f"▶ Auction resumed for player {player_id} - {remaining}s remaining")
+        logger.info("Auction resumed", extra={"player_id": player_id, "remaining": remaining})
 
         # # --------------- START TIMER AGAIN -----------------
         # asyncio.create_task(
@@ -506,7 +549,7 @@ async def resume_auction(request: Request):
     
     except Exception as e:
         conn.rollback()
-        print("❌ Resume auction error: ", e)
+        logger.exception("resume-auction failed")
         raise HTTPException(status_code=500, detail=str(e))
     
     finally:
@@ -540,16 +583,19 @@ async def next_auction(request: Request):
 
         player_id = auction["player_id"]
 
-        # Force timer expiry
+        # Force timer expiry; the deadline becomes "now" so settle lateness stays meaningful
+        forced_at = get_clock().now()
         cursor.execute("""
             UPDATE current_auction
-            SET expires_at = start_time
+            SET expires_at = %s
             WHERE player_id = %s
-        """, (player_id,))
+        """, (forced_at, player_id))
+
+        log_event(cursor, "extended", player_id, expires_at=forced_at, forced=True)
 
         conn.commit()
 
-        print(f"⏭ Admin forced auction end for player {player_id}")
+        logger.info("Admin forced auction end", extra={"player_id": player_id})
 
         return {
             "status": "forced_end",
@@ -559,7 +605,7 @@ async def next_auction(request: Request):
     except Exception as e:
 
         conn.rollback()
-        print("Next auction error:", e)
+        logger.exception("next-auction failed")
 
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -631,7 +677,13 @@ async def cancel_auction(request: Request):
 
         cursor.execute("DELETE FROM live_bids WHERE player_id = %s", (player_id,))
 
+        log_event(cursor, "settled", player_id, status="cancelled")
+
         conn.commit()
+        bump_version()
+        mark_player_status(player_id, "unsold")
+        PROXIES.clear(player_id)
+        ADMISSION.clear_lot(player_id)
 
         # ------------ EMIT EVENT --------------
         await sio.emit("auction_ended", {
@@ -640,7 +692,7 @@ async def cancel_auction(request: Request):
             "message": "🛑 Auction cancelled by admin - player marked unsold manually"
         })
 
-        print(f"🛑 Auction cancelled manually for player {player_info.get('name')}")
+        logger.info("Auction cancelled manually", extra={"player": player_info.get("name")})
 
         return{
             "message": f"Auction cancelled for {player_info.get('name')}",
@@ -650,7 +702,7 @@ async def cancel_auction(request: Request):
     except Exception as e:
 
         conn.rollback()
-        print("❌ cancel-auction error: ", e)
+        logger.exception("cancel-auction failed")
         raise HTTPException(status_code=500, detail= str(e))
     
     finally:
@@ -719,7 +771,7 @@ async def auction_state(request: Request):
             if expires_at.tzinfo is None:
                 expires_at = expires_at.replace(tzinfo=timezone.utc)
 
-            now = datetime.now(timezone.utc)
+            now = get_clock().now()
 
             remaining = max(
                 0,
@@ -812,6 +864,55 @@ async def auction_status():
         conn.close()
 
 
+@router.get("/admin/eligibility")
+async def eligibility(request: Request):
+
+    token = get_token_from_request(request)
+    payload = verify_token(token) if token else None
+
+    if not payload or payload.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    conn = get_db_connection()
+
+    if conn is None:
+        raise HTTPException(500, "Database connection failed")
+
+    cursor = conn.cursor(pymysql.cursors.DictCursor)
+
+    try:
+        cursor.execute("SELECT team_id, name FROM teams")
+        names = {row["team_id"]: row["name"] for row in cursor.fetchall()}
+
+        LEDGER.ensure()
+
+        cursor.execute("SELECT player_id FROM current_auction LIMIT 1")
+        auction = cursor.fetchone()
+        lot = LEDGER.lot_for(cursor, auction["player_id"]) if auction else None
+
+        def named(team_ids):
+            return [{"team_id": t, "team_name": names.get(t)} for t in team_ids]
+
+        return {
+            # Who can still bid on the open lot
+            "lot": {
+                "player_id": lot["player_id"],
+                "category": lot["category"],
+                "base_price": lot["base_price"],
+                "eligible_teams": named(LEDGER.eligible_teams(lot)),
+            } if lot else None,
+            # Who can still take a player of each category at all
+            "categories": {
+                category: named(team_ids)
+                for category, team_ids in LEDGER.eligibility().items()
+            },
+        }
+
+    finally:
+        cursor.close()
+        conn.close()
+
+
 @router.post("/mark-sold")
 async def mark_sold(request: Request):
 
@@ -826,6 +927,7 @@ async def mark_sold(request: Request):
     if not payload or payload.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Forbidden")
     
+    settings = get_settings()
     data = await request.json()
     player_id = data.get("player_id")
     session_id = payload.get("session_id", "default")
@@ -862,17 +964,9 @@ async def mark_sold(request: Request):
         team_name = top["team_name"]
         team_image = top["image_path"]
 
-        # ---------- DEDUCT TEAM PURSE ----------
-        cursor.execute(
-            "UPDATE teams SET purse = purse - %s WHERE team_id = %s",
-            (sold_price, team_id)
-        )
-        cursor.execute(
-            "SELECT purse FROM teams WHERE team_id=%s",
-            (team_id,)
-        )
-        row = cursor.fetchone()
-        updated_purse = float(row["purse"])
+        # ---------- DEDUCT TEAM PURSE (teams + ledger) ----------
+        ledger_update = LEDGER.record_sale(cursor, team_id, player_id, sold_price)
+        updated_purse = ledger_update["team"]["purse"]
         winner_sid = team_sockets.get(team_id)
 
         if winner_sid:
@@ -899,7 +993,17 @@ async def mark_sold(request: Request):
             (player_id,)
         )
 
+        log_event(
+            cursor, "settled", player_id, team_id, sold_price,
+            status="sold", category=ledger_update["category"]
+        )
+
         conn.commit()
+        LEDGER.apply(ledger_update)
+        bump_version()
+        mark_player_status(player_id, "sold")
+        PROXIES.clear(player_id)
+        ADMISSION.clear_lot(player_id)
 
         # ---------- FETCH PLAYER INFO ----------
         cursor.execute("""
@@ -935,13 +1039,13 @@ async def mark_sold(request: Request):
         # ---------- EMIT SOCKET EVENT ----------
         await sio.emit("auction_ended", payload)
 
-        print(f"✅ Player {player_info.get('name')} SOLD to {team_name} for ₹{sold_price}")
+        logger.info("Player sold", extra={"player": player_info.get("name"), "team": team_name, "sold_price": sold_price})
 
         # ---------- START NEXT AUCTION ----------
-        await sio.emit("next_player_loading", {"delay": 10})
+        await sio.emit("next_player_loading", {"delay": settings.inter_lot_delay})
         
-        print("⏳ Waiting 10 seconds before next player")
-        await asyncio.sleep(10)
+        logger.info("Waiting %s seconds before next player", settings.inter_lot_delay)
+        await get_clock().sleep(settings.inter_lot_delay)
         
         # -------- SELECT NEXT PLAYER --------
         cursor.execute("""
@@ -961,8 +1065,8 @@ async def mark_sold(request: Request):
             await sio.emit("auction_finished", {})
             return
         
-        start_time = datetime.now(timezone.utc)
-        duration = 120
+        start_time = get_clock().now()
+        duration = settings.default_lot_duration
         expires_at = start_time + timedelta(seconds=duration)
         
         cursor.execute("""
@@ -976,15 +1080,25 @@ async def mark_sold(request: Request):
                 duration,
                 "random"
             ))
+
+        log_event(
+            cursor, "lot_started", next_player["id"],
+            category=next_player["category"], base_price=next_player.get("base_price"),
+            expires_at=expires_at, duration=duration, mode="random"
+        )
         
         conn.commit()
+
+        lot = LEDGER.open_lot(cursor, next_player)
         
         await sio.emit("auction_started", {
             "player_id": next_player["id"],
             "player_name": next_player["name"],
             "mode": "random",
             "duration": duration,
-            "expires_at": expires_at.isoformat()
+            "expires_at": expires_at.isoformat(),
+            "max_bids": LEDGER.lot_max_bids(next_player["category"]),
+            "eligible_teams": LEDGER.eligible_teams(lot)
         })
         asyncio.create_task(
             background_timer(
@@ -993,7 +1107,7 @@ async def mark_sold(request: Request):
                 session_id
             )
         )
-        print(f"🚀 Next auction started for {next_player['name']}")
+        logger.info("Next auction started", extra={"player_id": next_player["id"], "player": next_player["name"]})
 
         return {
             "success": True,
@@ -1008,7 +1122,7 @@ async def mark_sold(request: Request):
 
     except Exception as e:
         conn.rollback()
-        print("❌ Error in mark_sold:", e)
+        logger.exception("mark-sold failed")
         raise HTTPException(status_code=500, detail=str(e))
 
     finally:
@@ -1087,7 +1201,13 @@ async def mark_unsold(request: Request):
             (player_id,)
         )
 
+        log_event(cursor, "settled", player_id, status="unsold")
+
         conn.commit()
+        bump_version()
+        mark_player_status(player_id, "unsold")
+        PROXIES.clear(player_id)
+        ADMISSION.clear_lot(player_id)
 
         # ---------- SOCKET EVENT ----------
         payload = {
@@ -1099,7 +1219,7 @@ async def mark_unsold(request: Request):
 
         await sio.emit("auction_ended", payload)
 
-        print(f"⚠️ Player {player_info.get('name')} marked UNSOLD")
+        logger.info("Player marked unsold", extra={"player": player_info.get("name")})
 
         return {
             "success": True,
@@ -1110,7 +1230,7 @@ async def mark_unsold(request: Request):
     except Exception as e:
 
         conn.rollback()
-        print("❌ Error in mark_unsold:", e)
+        logger.exception("mark-unsold failed")
 
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1118,6 +1238,15 @@ async def mark_unsold(request: Request):
         cursor.close()
         conn.close()
 
+BID_HISTORY_SQL = """
+    SELECT b.team_id, t.name AS team_name, b.bid_amount, b.bid_time
+    FROM bids b
+    JOIN teams t ON b.team_id = t.team_id
+    WHERE b.player_id = %s
+    ORDER BY b.bid_time ASC
+"""
+
+
 @router.get("/auction-state")
 async def auction_state():
 
@@ -1155,13 +1284,7 @@ async def auction_state():
         highest = cursor.fetchall()
 
         #Bid History
-        cursor.execute("""
-            SELECT b.team_id, t.name AS team_name, b.bid_amount, b.bid_time
-            FROM bids b
-            JOIN teams t ON b.team_id = t.team_id
-            WHERE b.player_id = %s
-            ORDER BY b.bid_time ASC
-        """,(player_id,))
+        cursor.execute(BID_HISTORY_SQL, (player_id,))
 
         history = cursor.fetchall()
         return{
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from auth.auth_handler import verify_token, get_token_from_request
+from core.metrics import REGISTRY
+from core.tracing import TRACES
+
+router = APIRouter()
+
+#---------- PROMETHEUS SCRAPE ------------
+@router.get("/metrics")
+def metrics():
+    return PlainTextResponse(
+        REGISTRY.render(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+#---------- BID TRACES (ADMIN) ------------
+@router.get("/admin/traces")
+def traces(
+    request: Request,
+    limit: int = 100,
+    slow_only: bool = False,
+    trace_id: str | None = None,
+    name: str | None = None
+):
+    token = get_token_from_request(request)
+    payload = verify_token(token) if token else None
+
+    if not payload or payload.get("role") != "admin":
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    return {
+        "slow_threshold_ms": TRACES.slow_threshold * 1000,
+        "sample_rate": TRACES.sample_rate,
+        "traces": TRACES.export(
+            limit=max(1, min(limit, 1000)),
+            slow_only=slow_only,
+            trace_id=trace_id,
+            name=name
+        ),
+    }
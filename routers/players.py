@@ -1,98 +1,274 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Request, Form
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request, Form, Query
 from auth.auth_handler import verify_token, get_token_from_request
 from core.database import get_db_connection
+from core.log import get_logger
+from auction.team_ledger import LEDGER
+from core.read_model import cached_json, bump_version
+from core.search_index import ensure_index, index_new_players
+from core.pagination import encode_cursor, decode_cursor, InvalidCursor
+from core.storage import store_file
+from sockets.socket_manager import sio, ADMIN_ROOM
+from fastapi.concurrency import run_in_threadpool
 import pymysql
-import os
-import uuid
-import zipfile
-import csv
-import tempfile
-import shutil
-import pandas as pd
-import numpy as np
+import asyncio
+import time
 
 
 from typing import List, Optional
 
 
 router = APIRouter()
+logger = get_logger("players")
 
 UPLOAD_FOLDER_PLAYERS = "uploads/players"
 
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "webp"}
 
+# ---------- PLAYER LISTING ----------
+MAX_PAGE_SIZE = 200
+PLAYER_STATUSES = {"sold", "unsold", "available"}
+
+# Listing column -> (players expression, captains expression)
+LISTING_COLUMNS = {
+    "player_id": ("p.id", "c.id"),
+    "name": ("p.name", "c.name"),
+    "nickname": ("p.nickname", "NULL"),
+    "jersey": ("p.jersey", "NULL"),
+    "category": ("p.category", "'Captain'"),
+    "type": ("p.type", "NULL"),
+    "image_path": ("p.image_path", "c.image_path"),
+    "base_price": ("p.base_price", "NULL"),
+    "total_runs": ("p.total_runs", "NULL"),
+    "highest_runs": ("p.highest_runs", "NULL"),
+    "wickets_taken": ("p.wickets_taken", "NULL"),
+    "times_out": ("p.times_out", "NULL"),
+    "teams_played": ("NULL", "t.name"),
+}
+
+# Needed for identity and the cursor, always returned
+KEY_COLUMNS = ("player_id", "name")
+
+STATUS_FILTERS = {
+    "sold": "EXISTS (SELECT 1 FROM sold_players sp WHERE sp.player_id = p.id)",
+    "unsold": "EXISTS (SELECT 1 FROM unsold_players up WHERE up.player_id = p.id)",
+    "available": (
+        "NOT EXISTS (SELECT 1 FROM sold_players sp WHERE sp.player_id = p.id) "
+        "AND NOT EXISTS (SELECT 1 FROM unsold_players up WHERE up.player_id = p.id)"
+    ),
+}
+
+
+def _csv(value):
+    return [part.strip() for part in value.split(",") if part.strip()] if value else []
+
+
+def _keyset(role, name_col, id_col, after):
+    """Rows of one UNION branch that sort after the cursor on (name, role, id)."""
+    after_name, after_role, after_id = after
+
+    if role > after_role:
+        return f"{name_col} >= %s", [after_name]
+    if role == after_role:
+        return f"({name_col} > %s OR ({name_col} = %s AND {id_col} > %s))", [after_name, after_name, after_id]
+    return f"{name_col} > %s", [after_name]
+
+
+def _listing_query(columns, categories, types, status, team_id, role, after, limit):
+    branches = []
+    params = []
+    limit_sql = " LIMIT %s" if limit else ""
+
+    # ---- players ----
+    if role in (None, "player"):
+        where, args = [], []
+
+        if categories:
+            where.append(f"p.category IN ({', '.join(['%s'] * len(categories))})")
+            args.extend(categories)
+        if types:
+            where.append(f"p.type IN ({', '.join(['%s'] * len(types))})")
+            args.extend(types)
+        if status:
+            where.append(STATUS_FILTERS[status])
+        if team_id is not None:
+            where.append("EXISTS (SELECT 1 FROM player_teams pt WHERE pt.player_id = p.id AND pt.team_id = %s)")
+            args.append(team_id)
+        if after:
+            clause, values = _keyset("player", "p.name", "p.id", after)
+            where.append(clause)
+            args.extend(values)
+
+        select = ", ".join(f"{LISTING_COLUMNS[c][0]} AS {c}" for c in columns)
+        branches.append(
+            f"(SELECT {select}, 'player' AS role FROM players p"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+            + f" ORDER BY p.name, p.id{limit_sql})"
+        )
+        params.extend(args + ([limit] if limit else []))
+
+    # ---- captains: no type / status, category is always "Captain" ----
+    wants_captains = (
+        role in (None, "captain")
+        and not types
+        and not status
+        and (not categories or "captain" in {c.lower() for c in categories})
+    )
+
+    if wants_captains:
+        where, args = [], []
+
+        if team_id is not None:
+            where.append("c.team_id = %s")
+            args.append(team_id)
+        if after:
+            clause, values = _keyset("captain", "c.name", "c.id", after)
+            where.append(clause)
+            args.extend(values)
+
+        select = ", ".join(f"{LISTING_COLUMNS[c][1]} AS {c}" for c in columns)
+        branches.append(
+            f"(SELECT {select}, 'captain' AS role FROM captains c"
+            " LEFT JOIN teams t ON c.team_id = t.team_id"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+            + f" ORDER BY c.name, c.id{limit_sql})"
+        )
+        params.extend(args + ([limit] if limit else []))
+
+    if not branches:
+        return None, []
+
+    sql = (
+        f"SELECT * FROM ({' UNION ALL '.join(branches)}) listing"
+        f" ORDER BY name, role, player_id{limit_sql}"
+    )
+    params.extend([limit] if limit else [])
+    return sql, params
+
+
+def _fill_teams_played(cursor, rows, paged):
+    player_ids = [row["player_id"] for row in rows if row["role"] == "player"]
+
+    if not player_ids:
+        return
+
+    sql = """
+        SELECT pt.player_id,
+               GROUP_CONCAT(DISTINCT t.name ORDER BY t.name SEPARATOR ', ') AS teams_played
+        FROM player_teams pt
+        JOIN teams t ON pt.team_id = t.team_id
+    """
+    args = ()
+
+    # A page only needs its own players; the full listing reads everything once
+    if paged:
+        sql += f" WHERE pt.player_id IN ({', '.join(['%s'] * len(player_ids))})"
+        args = player_ids
+
+    cursor.execute(sql + " GROUP BY pt.player_id", args)
+    teams = {row["player_id"]: row["teams_played"] for row in cursor.fetchall()}
+
+    for row in rows:
+        if row["role"] == "player":
+            row["teams_played"] = teams.get(row["player_id"], "")
+
+
 @router.get("/players")
-def get_players():
+def get_players(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    category: Optional[str] = None,
+    type: Optional[str] = None,
+    status: Optional[str] = None,
+    team_id: Optional[int] = None,
+    role: Optional[str] = None
+):
+    """
+    Players and captains ordered by (name, role, id).
+
+    Without `limit` the whole roster is returned as before; with it, pass the
+    returned `next_cursor` back as `cursor` to read the next page.
+    `category` and `type` accept comma-separated values.
+    """
+    key = ("players", limit, cursor, fields, category, type, status, team_id, role)
+
+    return cached_json(
+        request, key,
+        lambda: _load_players(limit, cursor, fields, category, type, status, team_id, role)
+    )
+
+
+def _load_players(limit, cursor, fields, category, type, status, team_id, role):
+    requested = _csv(fields)
+    unknown = [f for f in requested if f not in LISTING_COLUMNS and f != "role"]
+
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    columns = [c for c in LISTING_COLUMNS if not requested or c in requested or c in KEY_COLUMNS]
+
+    if status is not None and status not in PLAYER_STATUSES:
+        raise HTTPException(status_code=400, detail="status must be sold, unsold or available")
+
+    if role is not None and role not in ("player", "captain"):
+        raise HTTPException(status_code=400, detail="role must be player or captain")
+
+    try:
+        after = decode_cursor(cursor, 3) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    sql, params = _listing_query(
+        columns, _csv(category), _csv(type), status, team_id, role, after,
+        limit + 1 if limit else None
+    )
+
+    if sql is None:
+        return {"success": True, "count": 0, "players": [], "next_cursor": None}
+
     conn = get_db_connection()
 
     if conn is None:
         return{"error": "Database Connection Failed"}
     
     try:
-        cursor  = conn.cursor(pymysql.cursors.DictCursor)
+        db_cursor = conn.cursor(pymysql.cursors.DictCursor)
 
-        cursor.execute(
-            """SELECT 
-    p.id AS player_id,
-    p.name,
-    p.nickname,
-    p.jersey,
-    p.category,
-    p.type,
-    p.image_path,
-    p.base_price,
-    p.total_runs,
-    p.highest_runs,
-    p.wickets_taken,
-    p.times_out,
-    COALESCE(GROUP_CONCAT(DISTINCT t.name ORDER BY t.name SEPARATOR ', '), '') AS teams_played,
-    'player' AS role
-FROM players p
-LEFT JOIN player_teams pt ON p.id = pt.player_id
-LEFT JOIN teams t ON pt.team_id = t.team_id
-GROUP BY p.id
-
-UNION ALL
-
-SELECT 
-    c.id AS player_id,
-    c.name,
-    NULL AS nickname,
-    NULL AS jersey,
-    'Captain' AS category,
-    NULL AS type,
-    c.image_path,
-    NULL AS base_price,
-    NULL AS total_runs,
-    NULL AS highest_runs,
-    NULL AS wickets_taken,
-    NULL AS times_out,
-    t.name AS teams_played,
-    'captain' AS role
-FROM captains c
-LEFT JOIN teams t ON c.team_id = t.team_id
-
-ORDER BY name;"""
-        )
+        db_cursor.execute(sql, params)
+        rows = db_cursor.fetchall()
 
-        rows = cursor.fetchall()
+        next_cursor = None
+
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last["name"], last["role"], last["player_id"])
+
+        if "teams_played" in columns:
+            _fill_teams_played(db_cursor, rows, paged=limit is not None)
 
         return{
             "success": True,
             "count": len(rows),
-            "players": rows
+            "players": rows,
+            "next_cursor": next_cursor
         }
     
     except Exception as e:
-        print("Player route error:", e)
+        logger.exception("players route failed")
         return{"error": str(e)}
     
     finally:
-        cursor.close()
+        db_cursor.close()
         conn.close()
 
 @router.get("/player-with-teams")
-def players_with_teams():
+def players_with_teams(request: Request):
+    return cached_json(request, ("player-with-teams",), _load_players_with_teams)
+
+
+def _load_players_with_teams():
 
     conn = get_db_connection()
 
@@ -131,13 +307,41 @@ def players_with_teams():
         }
     
     except Exception as e:
-        print("player-with-teams route error:", e)
+        logger.exception("player-with-teams route failed")
         return{"error": str(e)}
     
     finally:
         cursor.close()
         conn.close()
 
+#---------- PLAYER SEARCH ------------
+# Declared before /players/{player_id} so "search" is not taken for an id
+@router.get("/players/search")
+def search_players(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    status: Optional[str] = None
+):
+    """Prefix / typo-tolerant match on name and nickname, exact match on jersey."""
+    if status is not None and status not in PLAYER_STATUSES:
+        raise HTTPException(status_code=400, detail="status must be sold, unsold or available")
+
+    try:
+        index = ensure_index()
+    except Exception as e:
+        logger.exception("player search index build failed")
+        return{"error": str(e)}
+
+    started = time.perf_counter()
+    results = index.search(q, limit, status)
+
+    return{
+        "success": True,
+        "count": len(results),
+        "results": results,
+        "took_ms": round((time.perf_counter() - started) * 1000, 3)
+    }
+
 @router.get("/players/{player_id}")
 async def get_player(player_id: int, role: str):
 
@@ -202,15 +406,12 @@ async def upload_player_image(
     if ext not in ALLOWED_EXTENSIONS:
         raise HTTPException(status_code=400, detail="Invalid file type")
 
-    filename = f"{uuid.uuid4().hex}.{ext}"
-
-    filepath = os.path.join(UPLOAD_FOLDER_PLAYERS, filename)
-
-    with open(filepath, "wb") as buffer:
-        buffer.write(await image.read())
+    image_path = await run_in_threadpool(
+        store_file, UPLOAD_FOLDER_PLAYERS, image.file, ext
+    )
 
     return {
-        "image_path": f"uploads/players/{filename}"
+        "image_path": image_path
     }
 
 
@@ -272,15 +473,9 @@ async def add_player(
         if ext not in ALLOWED_EXTENSIONS:
             raise HTTPException(status_code=400, detail="Invalid image format")
 
-        os.makedirs(UPLOAD_FOLDER_PLAYERS, exist_ok=True)
-
-        filename = f"{uuid.uuid4().hex}.{ext}"
-        filepath = os.path.join(UPLOAD_FOLDER_PLAYERS, filename)
-
-        with open(filepath, "wb") as f:
-            f.write(await image.read())
-
-        image_path = f"uploads/players/{filename}"
+        image_path = await run_in_threadpool(
+            store_file, UPLOAD_FOLDER_PLAYERS, image.file, ext
+        )
 
     # ================= DB =================
     conn = get_db_connection()
@@ -320,6 +515,8 @@ async def add_player(
             )
 
         conn.commit()
+        bump_version()
+        await run_in_threadpool(index_new_players)
 
         return {
             "message": "Player added successfully!",
@@ -335,7 +532,7 @@ async def add_player(
 
     except Exception as e:
         conn.rollback()
-        print("❌ add-player error:", e)
+        logger.exception("add-player failed")
         raise HTTPException(status_code=500, detail=str(e))
 
     finally:
@@ -354,97 +551,45 @@ async def upload_players(request: Request, file: UploadFile = File(...)):
     if not payload or payload.get("role") != "admin":
         raise HTTPException(403, "Forbidden")
 
-    # ---------- TEMP DIR ----------
-    temp_dir = tempfile.mkdtemp()
-    zip_path = os.path.join(temp_dir, file.filename)
-
-    # Save ZIP
-    with open(zip_path, "wb") as f:
-        f.write(await file.read())
-
-    # ---------- EXTRACT ZIP ----------
-    try:
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(temp_dir)
-    except:
-        raise HTTPException(400, "Invalid ZIP file")
-
-    # ---------- FIND EXCEL ----------
-    excel_file = None
-    for f in os.listdir(temp_dir):
-        if f.endswith(".xlsx") or f.endswith(".xls"):
-            excel_file = os.path.join(temp_dir, f)
-
-    if not excel_file:
-        raise HTTPException(400, "Excel file not found in ZIP")
-
-    # ---------- READ EXCEL ----------
-    df = pd.read_excel(excel_file)
-
-    # 🔥 IMPORTANT FIX
-    df = df.replace({np.nan: None})
+    # ---------- PROGRESS TO ADMIN ROOM ----------
+    loop = asyncio.get_running_loop()
 
-    records = df.to_dict(orient="records")
-
-    # ---------- MOVE IMAGES ----------
-    images_folder = os.path.join(temp_dir, "images")
-
-    os.makedirs(UPLOAD_FOLDER_PLAYERS, exist_ok=True)
-
-    if os.path.exists(images_folder):
-        for img in os.listdir(images_folder):
-            src = os.path.join(images_folder, img)
-            dst = os.path.join(UPLOAD_FOLDER_PLAYERS, img)
-            shutil.move(src, dst)
+    def report_progress(**progress):
+        asyncio.run_coroutine_threadsafe(
+            sio.emit("import_progress", progress, room=ADMIN_ROOM),
+            loop
+        )
 
-    # ---------- DB INSERT ----------
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    # pandas is only needed here, keep it out of worker startup
+    from core.roster_import import import_roster, RosterImportError
 
+    # ---------- STREAMING INGEST (off the event loop) ----------
     try:
-        for row in records:
-            if not row.get("name"):
-                continue
-
-            image_name = row.get("image_name")
-            image_path = f"{UPLOAD_FOLDER_PLAYERS}/{image_name}" if image_name else None
-
-            cursor.execute("""
-                INSERT INTO players (
-                    name, nickname, age, gender, category, jersey, type,
-                    mobile_No, email_Id, base_price,
-                    total_runs, highest_runs, wickets_taken,
-                    times_out, teams_played, image_path
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                row.get("name"),
-                row.get("nickname"),
-                row.get("age"),
-                row.get("gender"),
-                row.get("category"),
-                row.get("jersey"),
-                row.get("type"),
-                row.get("mobile_No"),
-                row.get("email_Id"),
-                row.get("base_price"),
-                row.get("total_runs"),
-                row.get("highest_runs"),
-                row.get("wickets_taken"),
-                row.get("times_out"),
-                row.get("teams_played"),
-                image_path
-            ))
-
-        conn.commit()
+        result = await run_in_threadpool(
+            import_roster,
+            file.file,
+            UPLOAD_FOLDER_PLAYERS,
+            report_progress
+        )
 
-        return {"message": "ZIP upload successful 🚀"}
+    except RosterImportError as e:
+        raise HTTPException(400, str(e))
 
     except Exception as e:
-        conn.rollback()
-        print("❌ upload error:", e)
+        logger.exception("upload-players failed")
         raise HTTPException(500, str(e))
 
     finally:
-        cursor.close()
-        conn.close()
\ No newline at end of file
+        await file.close()
+
+    if result["inserted"]:
+        bump_version()
+        LEDGER.invalidate()
+        await run_in_threadpool(index_new_players)
+
+    if result["errors"]:
+        message = f"Imported {result['inserted']} players, {result['rejected']} rows rejected"
+    else:
+        message = "ZIP upload successful 🚀"
+
+    return {"message": message, **result}
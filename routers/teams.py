@@ -1,9 +1,13 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Request, Form
 from auth.auth_handler import verify_token, get_token_from_request
 from core.database import get_db_connection
+from core.log import get_logger
+from core.config import get_settings
+from auction.team_ledger import LEDGER
+from core.read_model import cached_json, streamed_ndjson, bump_version
+from core.storage import store_file
+from fastapi.concurrency import run_in_threadpool
 import pymysql
-import os
-import uuid
 from typing import Optional
 
 
@@ -11,6 +15,7 @@ from typing import Optional
 
 
 router = APIRouter()
+logger = get_logger("teams")
 
 UPLOAD_FOLDER_TEAMS = "uploads/teams"
 
@@ -18,7 +23,11 @@ ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "webp" , "jfif"}
 
 #---------- GET ALL TEAMS ------------
 @router.get("/teams")
-def get_teams():
+def get_teams(request: Request):
+    return cached_json(request, ("teams",), _load_teams)
+
+
+def _load_teams():
     conn = get_db_connection()
     if conn is None:
        return{"error": "Database connection failed"}
@@ -35,8 +44,13 @@ def get_teams():
                 Total_Budget AS total_budget,
                 Season_Budget AS current_budget,
                 Players_Bought AS players_bought,
-                image_path
+                image_path,
+                tl.purse,
+                tl.spent,
+                tl.squad_count,
+                tl.max_bid
             FROM teams
+            LEFT JOIN team_ledger tl USING (team_id)
             ORDER BY name ASC
         """)
 
@@ -52,7 +66,141 @@ def get_teams():
         }
     
     except Exception as e:
-        print("Team route error:", e)
+        logger.exception("teams route failed")
+        return{"error": str(e)}
+
+    finally:
+        cursor.close()
+        conn.close()
+
+#---------- ALL SQUADS (LEAGUE VIEW) -----------
+SQUADS_SQL = """
+    SELECT
+        t.team_id,
+        t.name AS team_name,
+        t.image_path AS team_image,
+        t.purse,
+        p.id AS player_id,
+        p.name,
+        p.category,
+        p.type,
+        p.image_path,
+        sp.sold_price,
+        sp.sold_time
+    FROM teams t
+    LEFT JOIN sold_players sp ON sp.team_id = t.team_id
+    LEFT JOIN players p ON sp.player_id = p.id
+    ORDER BY t.name ASC, t.team_id ASC, sp.sold_time ASC
+"""
+
+
+@router.get("/teams/squads")
+def get_all_squads(request: Request, format: str = "json"):
+    """
+    Every team's squad, spend and open slots. `format=ndjson` streams one
+    team per line straight from the query, uncached.
+    """
+    if format == "ndjson":
+        return streamed_ndjson(_stream_squads())
+
+    return cached_json(request, ("teams-squads",), _load_squads)
+
+
+def _squad_teams(cursor):
+    """Fold the SQUADS_SQL rows into teams, yielding each one as its rows end."""
+    squad_size = get_settings().squad_size
+    team = None
+
+    def finish(team):
+        team["squad_count"] = len(team["players"])
+        team["open_slots"] = max(0, squad_size - team["squad_count"])
+        team["categories"].sort()
+        return team
+
+    for row in iter(cursor.fetchone, None):
+        if team is None or row["team_id"] != team["team_id"]:
+            if team is not None:
+                yield finish(team)
+
+            team = {
+                "team_id": row["team_id"],
+                "name": row["team_name"],
+                "image_path": row["team_image"] or None,
+                "purse": float(row["purse"] or 0),
+                "spent": 0.0,
+                "categories": [],
+                "players": [],
+            }
+
+        if row["player_id"] is None:
+            continue
+
+        team["spent"] += float(row["sold_price"] or 0)
+        # Legacy players may have no category; they cover none
+        if row["category"] is not None and row["category"] not in team["categories"]:
+            team["categories"].append(row["category"])
+        team["players"].append({
+            "player_id": row["player_id"],
+            "name": row["name"],
+            "category": row["category"],
+            "type": row["type"],
+            "image_path": row["image_path"],
+            "sold_price": row["sold_price"],
+            "sold_time": row["sold_time"],
+        })
+
+    if team is not None:
+        yield finish(team)
+
+
+def _stream_squads():
+    conn = get_db_connection()
+
+    if conn is None:
+        raise HTTPException(status_code=503, detail="Database connection failed")
+
+    # Unbuffered: rows come off the socket as teams are written out
+    cursor = conn.cursor(pymysql.cursors.SSDictCursor)
+
+    try:
+        cursor.execute(SQUADS_SQL)
+    except Exception:
+        cursor.close()
+        conn.close()
+        logger.exception("teams/squads stream failed")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    def teams():
+        try:
+            yield from _squad_teams(cursor)
+        finally:
+            cursor.close()
+            conn.close()
+
+    return teams()
+
+
+def _load_squads():
+    conn = get_db_connection()
+
+    if conn is None:
+        return{"error": "Database connection failed"}
+
+    try:
+        cursor = conn.cursor(pymysql.cursors.DictCursor)
+
+        cursor.execute(SQUADS_SQL)
+        teams = list(_squad_teams(cursor))
+
+        return{
+            "success": True,
+            "count": len(teams),
+            "squad_size": get_settings().squad_size,
+            "teams": teams
+        }
+
+    except Exception as e:
+        logger.exception("teams/squads route failed")
         return{"error": str(e)}
 
     finally:
@@ -60,8 +208,28 @@ def get_teams():
         conn.close()
 
 #---------- GET TEAM SQUAD -----------
+TEAM_SQUAD_SQL = """
+    SELECT
+        p.id AS player_id,
+        p.name,
+        p.category,
+        p.type,
+        p.image_path,
+        sp.sold_price,
+        sp.sold_time
+    FROM sold_players sp
+    JOIN players p ON sp.player_id = p.id
+    WHERE sp.team_id = %s
+    ORDER BY sp.sold_time ASC
+"""
+
+
 @router.get("/team/{team_id}")
-def get_team_by_id(team_id: int):
+def get_team_by_id(team_id: int, request: Request):
+    return cached_json(request, ("team", team_id), lambda: _load_team(team_id))
+
+
+def _load_team(team_id):
     conn = get_db_connection()
 
     if conn is None:
@@ -70,20 +238,7 @@ def get_team_by_id(team_id: int):
     try:
         cursor = conn.cursor(pymysql.cursors.DictCursor)
 
-        cursor.execute("""
-            SELECT
-                p.id AS player_id,
-                p.name,
-                p.category,
-                p.type,
-                p.image_path,
-                sp.sold_price,
-                sp.sold_time
-            FROM sold_players sp
-            JOIN players p ON sp.player_id = p.id
-            WHERE sp.team_id = %s
-            ORDER BY sp.sold_time ASC       
-        """, (team_id,))
+        cursor.execute(TEAM_SQUAD_SQL, (team_id,))
 
         squad = cursor.fetchall()
 
@@ -94,7 +249,7 @@ def get_team_by_id(team_id: int):
         }
     
     except Exception as e:
-        print("Team route error:", e)
+        logger.exception("teams route failed")
         return{"error": str(e)}
     
     finally:
@@ -143,15 +298,9 @@ async def add_team(
         if ext not in ALLOWED_EXTENSIONS:
             raise HTTPException(status_code=400, detail="Invalid image format")
 
-        os.makedirs(UPLOAD_FOLDER_TEAMS, exist_ok=True)
-
-        filename = f"{uuid.uuid4().hex}.{ext}"
-        filepath = os.path.join(UPLOAD_FOLDER_TEAMS, filename)
-
-        with open(filepath, "wb") as f:
-            f.write(await image.read())
-
-        image_path = f"uploads/teams/{filename}"
+        image_path = await run_in_threadpool(
+            store_file, UPLOAD_FOLDER_TEAMS, image.file, ext
+        )
 
     # ================= NORMALIZE VALUES =================
     teamRank = teamRank or 0
@@ -181,6 +330,8 @@ async def add_team(
         ))
 
         conn.commit()
+        bump_version()
+        LEDGER.invalidate()
 
         return {
             "message": "Team added successfully!"
@@ -195,7 +346,7 @@ async def add_team(
 
     except Exception as e:
         conn.rollback()
-        print("❌ add-team error:", e)
+        logger.exception("add-team failed")
         raise HTTPException(status_code=500, detail=str(e))
 
     finally:
@@ -1,14 +1,26 @@
-from sockets.socket_manager import sio, team_sockets
+from sockets.socket_manager import sio, team_sockets, socket_roles, ADMIN_ROOM
 import asyncio
+import math
+import time
 from core.database import get_db_connection
 import pymysql
 from datetime import datetime, timezone, timedelta
 from auth.auth_handler import verify_token, get_token_from_request
 from decimal import Decimal
-
-MIN_INCREAMENT = 500
-
-bid_lock = asyncio.Lock()
+from core.clock import get_clock
+from core.config import get_settings
+from core.log import get_logger
+from core.metrics import timed_event, BID_LOCK_WAIT, BIDS
+from core.tracing import Trace
+from auction.auction_state import bid_lock, as_utc
+from auction.team_ledger import LEDGER
+from auction.live_bids import insert_bid, publish_bids, top_bid
+from auction.proxy_engine import PROXIES, counter_bid, run_proxies
+from auction.bid_dedupe import BID_DEDUPE
+from auction.admission import ADMISSION
+from auction.event_log import log_event, log_rejected
+
+logger = get_logger("sockets")
 
 def normalize_decimal(obj):
     if isinstance(obj, Decimal):
@@ -18,20 +30,23 @@ def normalize_decimal(obj):
 def register_socket_events():
     @sio.event
     async def connect(sid, eviron):
-        print("✅ Socket Connected:", sid)
+        socket_roles[sid] = "connected"
+        logger.debug("Socket connected", extra={"sid": sid})
 
     @sio.event
     async def disconnect(sid):
-        print("❌ Socket Disconnected:", sid)
+        logger.debug("Socket disconnected", extra={"sid": sid})
+        socket_roles.pop(sid, None)
+        ADMISSION.forget_sid(sid)
         for team_id, socket_id in list(team_sockets.items()):
             if socket_id == sid:
                 del team_sockets[team_id]
-                print(f"Removed team {team_id} socket mapping")
+                logger.debug("Removed team socket mapping", extra={"team_id": team_id})
 
     @sio.event
+    @timed_event("join_auction")
     async def join_auction(sid, data=None):
-        print("JOIN AUCTION EVENT TRIGGERED")
-        print(f"📡 Client joined auction: {sid}")
+        logger.debug("Client joined auction", extra={"sid": sid})
 
         team_id = None
 
@@ -41,9 +56,12 @@ def register_socket_events():
         #map only team sockets
         if team_id:
             team_sockets[team_id] = sid
-            print(f"Team {team_id} mapped to socket {sid}")
+            socket_roles[sid] = "team"
+            logger.debug("Team mapped to socket", extra={"team_id": team_id, "sid": sid})
         else:
-            print("Admin joined auction (no team mapping)")
+            if socket_roles.get(sid) != "admin":
+                socket_roles[sid] = "spectator"
+            logger.debug("Spectator joined auction", extra={"sid": sid})
 
         conn = get_db_connection()
         cursor = conn.cursor(pymysql.cursors.DictCursor)
@@ -106,6 +124,8 @@ def register_socket_events():
                     "highest_runs": auction.get("highest_runs") or 0
                 },
                 "team_purse": updated_purse,
+                "max_bids": LEDGER.lot_max_bids(auction["category"]),
+                "canBid": bool(team_id) and LEDGER.can_bid(team_id, LEDGER.lot_for(cursor, auction["player_id"])),
                 "highest_bid": {
                     "team_id": top_bid["team_id"],
                     "team_name": top_bid["team_name"],
@@ -115,50 +135,119 @@ def register_socket_events():
             }, to=sid)
             
         except Exception as e:
-            print("❌ join_auction error: ", e)
+            logger.exception("join_auction failed")
         finally:
             cursor.close()
             conn.close()
         
     @sio.event
+    async def join_admin(sid, data=None):
+        token = (data or {}).get("token")
+        payload = verify_token(token) if token else None
+
+        if not payload or payload.get("role") != "admin":
+            await sio.emit("admin_rejected", {"error": "Unauthorized"}, to=sid)
+            return
+
+        await sio.enter_room(sid, ADMIN_ROOM)
+        socket_roles[sid] = "admin"
+        logger.info("Admin socket joined", extra={"sid": sid, "room": ADMIN_ROOM})
+
+    @sio.event
+    @timed_event("place_bid")
     async def place_bid(sid, data):
+        # Bids are judged by when they reached the server, not when the lock frees up
+        received_at = get_clock().now()
+        team_id = data.get("team_id")
+        request_id = data.get("request_id")
+        outcome = None
+        # Keys the dedupe cache, so it has to be a plain hashable value
+        valid_request_id = request_id is None or (
+            isinstance(request_id, (str, int)) and not isinstance(request_id, bool)
+        )
+
+        if team_id and request_id and valid_request_id:
+            outcome, first = BID_DEDUPE.claim(team_id, request_id)
+
+            if not first:
+                # Client retry: answer with the original outcome, nothing is re-run
+                event, payload = await asyncio.shield(outcome)
+                BIDS.inc(outcome="duplicate")
+                await sio.emit(event, {**payload, "duplicate": True}, to=sid)
+                return
+
+        trace = Trace(
+            "place_bid",
+            sid=sid,
+            team_id=team_id,
+            player_id=data.get("player_id"),
+            bid_amount=data.get("bid_amount"),
+            request_id=request_id
+        )
+
+        async def respond(event, payload):
+            payload = {**payload, "request_id": request_id, "trace_id": trace.trace_id}
+            if outcome is not None:
+                BID_DEDUPE.record(outcome, event, payload)
+            await sio.emit(event, payload, to=sid)
+
+        async def reject(reason, error):
+            BIDS.inc(outcome="rejected", reason=reason)
+            trace.attrs.update(outcome="rejected", reason=reason)
+            log_rejected(data.get("player_id"), team_id, data.get("bid_amount"), reason)
+            # Server errors and backpressure are worth retrying for real
+            if reason in ("error", "rate_limited", "busy") and outcome is not None:
+                BID_DEDUPE.forget(team_id, request_id, outcome)
+            await respond("bid_rejected", {"error": error})
+
+        try:
+            if not valid_request_id:
+                await reject("invalid_request_id", "request_id must be a string or an integer")
+                return
+
+            # Admission: turned away before taking a place in the bid lock queue
+            rejection = ADMISSION.admit(sid, team_id, data.get("player_id"), data.get("bid_amount"), LEDGER.lot)
+            if rejection:
+                await reject(*rejection)
+                return
+
+            with ADMISSION.queued(data.get("player_id")):
+                await _place_bid(sid, data, received_at, trace, reject, respond)
+        finally:
+            if outcome is not None and not outcome.done():
+                # Cancelled before answering; waiting retries are told, later ones run afresh
+                BID_DEDUPE.forget(team_id, request_id, outcome)
+                BID_DEDUPE.record(outcome, "bid_rejected", {"error": "Bid was not processed", "request_id": request_id})
+            trace.finish()
+
+    async def _place_bid(sid, data, received_at, trace, reject, respond):
+        trace.stage("lock_wait")
+        lock_requested = time.perf_counter()
 
         async with bid_lock:
-            
+            BID_LOCK_WAIT.observe(time.perf_counter() - lock_requested)
+            trace.stage("validation")
+
+            settings = get_settings()
+
             team_id = data.get("team_id")
             player_id = data.get("player_id")
             bid_value = data.get("bid_amount")
 
             if bid_value is None:
-                await sio.emit(
-                    "bid_rejected",
-                    {"error": "Bid amount is required"},
-                    to=sid
-                )
-                return
-            
-            bid_amount = float(bid_value)
-
-            if bid_amount is None:
-                await sio.emit(
-                    "bid_rejected",
-                    {"error": "Bid amount missing"},
-                    to=sid
-                )
+                await reject("missing_amount", "Bid amount is required")
                 return
 
             try:
-                bid_amount = float(bid_amount)
+                bid_amount = float(bid_value)
             except (TypeError, ValueError):
-                await sio.emit(
-                    "bid_rejected",
-                    {"error": "Invalid bid amount"}
-                )
+                await reject("invalid_amount", "Invalid bid amount")
                 return
 
             conn = get_db_connection()
             conn.begin()
             cursor = conn.cursor(pymysql.cursors.DictCursor)
+            committed = False
 
             try:
 
@@ -169,282 +258,217 @@ def register_socket_events():
                 auction = cursor.fetchone()
 
                 if not auction:
-                    await sio.emit(
-                        "bid_rejected",
-                        {"error": "No active auction"},
-                        to=sid
-                    )
+                    await reject("no_auction", "No active auction")
                     return
 
                 if auction.get("paused"):
-                    await sio.emit(
-                        "bid_rejected",
-                        {"error": "Auction is paused"},
-                        to=sid
+                    await reject("paused", "Auction is paused")
+                    return
+
+                if received_at >= as_utc(auction["expires_at"]):
+                    trace.attrs["late_by_ms"] = round(
+                        (received_at - as_utc(auction["expires_at"])).total_seconds() * 1000, 3
                     )
+                    await reject("expired", "Bidding has closed for this lot")
                     return
 
                 active_player = auction["player_id"]
 
                 if str(player_id) != str(active_player):
-                    await sio.emit(
-                        "bid_rejected",
-                        {"error": "Invalid player"},
-                        to=sid
-                    )
+                    await reject("invalid_player", "Invalid player")
                     return
 
-                # ---------------- TEAM CHECK ----------------
-                cursor.execute(
-                    "SELECT team_id, name, purse FROM teams WHERE team_id = %s",
-                    (team_id,)
-                )
-
-                team = cursor.fetchone()
+                # ---------------- TEAM CHECK (ledger, no aggregates) ----------------
+                LEDGER.ensure()
+                team = LEDGER.get(team_id)
 
                 if not team:
-                    await sio.emit(
-                        "bid_rejected",
-                        {"error": "Team not found"},
-                        to=sid
-                    )
+                    await reject("unknown_team", "Team not found")
                     return
 
-                if float(team["purse"]) < bid_amount:
-                    await sio.emit(
-                        "bid_rejected",
-                        {"error": "Insufficient purse"},
-                        to=sid
-                    )
+                if team["purse"] < bid_amount:
+                    await reject("insufficient_purse", "Insufficient purse")
                     return
                 
-                # ---------------- PLAYER BASE PRICE ----------------
-                cursor.execute(
-                    "SELECT base_price, category FROM players WHERE id=%s",
-                    (active_player,)
-                )
+                # ---------------- LOT ELIGIBILITY (fixed at lot start) ----------------
+                lot = LEDGER.lot_for(cursor, active_player)
 
-                player = cursor.fetchone()
-                if not player:
-                    await sio.emit(
-                        "bid_rejected",
-                        {"error": "Player not found"},
-                        to=sid
-                    )
+                if not lot:
+                    await reject("unknown_player", "Player not found")
                     return
-                base_price = float(player.get("base_price") or 0) if player else 0
-                player_category = player["category"]
-                
-                cursor.execute("""
-                SELECT 1
-                FROM sold_players sp
-                JOIN players p ON sp.player_id = p.id
-                WHERE sp.team_id = %s AND p.category = %s
-                LIMIT 1
-                """, (team_id, player_category))
-
-                existing_category = cursor.fetchone()
-
-                if existing_category:
-                    await sio.emit(
-                        "bid_rejected",
-                        {"error": f"You already have a {player_category} category player"},
-                        to=sid
-                    )
+                base_price = lot["base_price"]
+                player_category = lot["category"]
+
+                if not LEDGER.can_bid(team_id, lot):
+                    if LEDGER.owns_category(team_id, player_category):
+                        await reject("category_owned", f"You already have a {player_category} category player")
+                    elif team["squad_count"] >= settings.squad_size:
+                        await reject("squad_full", f"Team already completed ({settings.squad_size} players)")
+                    else:
+                        await reject("not_eligible", "Your purse cannot cover this player and a full squad")
                     return
-                
-                #------------ Team Player Count ------------
-                cursor.execute("""
-                SELECT COUNT(*) AS total_players
-                FROM sold_players
-                WHERE team_id = %s
-                """, (team_id,))
-                team_count = cursor.fetchone()["total_players"]
-
-                if team_count >= 8:
-                    await sio.emit(
-                        "bid_rejected",
-                        {"error": "Team already completed (8 players)"},
-                        to=sid
-                    )
+
+                # Purse left must still cover the cheapest way to fill the squad
+                max_bid = LEDGER.max_bid(team_id, player_category)
+                if bid_amount > max_bid:
+                    await reject("over_max_bid", f"Maximum bid ₹{max_bid:g} keeps enough purse to complete your squad")
                     return
                 
                 
 
                 # ---------------- CURRENT HIGHEST BID ----------------
-                cursor.execute("""
-                SELECT team_id, bid_amount
-                FROM live_bids
-                WHERE player_id = %s
-                ORDER BY bid_amount DESC
-                LIMIT 1
-                """, (active_player,))
-
-                row = cursor.fetchone()
+                row = top_bid(cursor, active_player)
 
                 highest_bid = float(row["bid_amount"]) if row else 0
 
                 if row and str(row["team_id"]) == str(team_id):
-                    await sio.emit(
-                        "bid_rejected",
-                        {"error": "You already have the highest bid"},
-                        to=sid
-                    )
+                    await reject("already_highest", "You already have the highest bid")
                     return
 
-                MIN_INCREMENT = 500
-
-                required = max(highest_bid + MIN_INCREMENT, base_price)
+                required = max(highest_bid + settings.min_increment, base_price)
 
                 if bid_amount < required:
-                    await sio.emit(
-                        "bid_rejected",
-                        {"error": f"Minimum bid ₹{required}"},
-                        to=sid
-                    )
+                    await reject("below_minimum", f"Minimum bid ₹{required}")
                     return
 
                 # ---------------- INSERT LIVE BID ----------------
-                cursor.execute(
-                    """
-                    INSERT INTO live_bids
-                    (player_id, team_id, bid_amount, bid_time)
-                    VALUES (%s,%s,%s,NOW())
-                    ON DUPLICATE KEY UPDATE
-                        bid_amount = VALUES(bid_amount),
-                        bid_time = NOW()
-                    """,
-                    (
-                        active_player,
-                        team_id,
-                        bid_amount
-                    )
-                )
+                trace.stage("db_write")
+                insert_bid(cursor, active_player, team_id, bid_amount)
 
-                # ---------------- BID HISTORY ----------------
-                cursor.execute(
-                    """
-                    INSERT INTO bids
-                    (player_id, team_id, bid_amount, bid_time)
-                    VALUES (%s,%s,%s,NOW())
-                    """,
-                    (
-                        active_player,
-                        team_id,
-                        bid_amount
-                    )
-                )
+                # Registered proxies answer in the same transaction, with one bid
+                counter = counter_bid(lot, team_id, bid_amount)
+                log_event(cursor, "bid_accepted", active_player, team_id, bid_amount, trace_id=trace.trace_id)
+
+                if counter:
+                    insert_bid(cursor, active_player, *counter)
+                    log_event(cursor, "bid_accepted", active_player, *counter, proxy=True)
+                    trace.attrs["proxy_counter"] = counter[1]
 
+                trace.stage("commit")
                 conn.commit()
+                committed = True
 
-                print(f"💰 Bid accepted: Team {team_id} ➜ ₹{bid_amount}")
+                BIDS.inc(outcome="accepted")
+                if counter:
+                    BIDS.inc(outcome="accepted", reason="proxy")
+                trace.attrs["outcome"] = "accepted"
+                logger.info("Bid accepted", extra={"team_id": team_id, "player_id": active_player, "bid_amount": bid_amount, "trace_id": trace.trace_id})
 
                 # ---------------- ACK TO BIDDER ----------------
-                await sio.emit(
+                trace.stage("ack_emit")
+                await respond(
                     "bid_accepted",
                     {
                         "player_id": active_player,
                         "team_id": team_id,
-                        "bid_amount": float(bid_amount)
-                    },
-                    to=sid
+                        "bid_amount": float(bid_amount),
+                        "outbid_by_proxy": bool(counter) and str(counter[0]) != str(team_id),
+                    }
                 )
 
+                try:
+                    await publish_bids(cursor, conn, active_player, base_price, received_at, trace)
+                except Exception as e:
+                    # The bid stands and its ack is cached for retries; only the broadcast is lost
+                    conn.rollback()
+                    logger.exception("Bid broadcast failed", extra={"player_id": active_player, "trace_id": trace.trace_id})
+                    trace.attrs["broadcast_error"] = str(e)
 
-                # ---------- FETCH HIGHEST BID ----------
-                cursor.execute("""
-                SELECT b.team_id, b.bid_amount, t.name AS team_name
-                FROM live_bids b
-                JOIN teams t ON b.team_id = t.team_id
-                WHERE b.player_id = %s
-                ORDER BY b.bid_amount DESC
-                LIMIT 1
-                """, (active_player,))
+            except Exception as e:
 
-                highest = cursor.fetchone()
+                conn.rollback()
+                trace.attrs["error"] = str(e)
 
-                if highest:
-                    if isinstance(highest["bid_amount"], Decimal):
-                        highest["bid_amount"] = float(highest["bid_amount"])
-                
-                    if isinstance(highest["team_id"], Decimal):
-                        highest["team_id"] = int(highest["team_id"])
+                if committed:
+                    # Accepted and acked: never reject (and forget) it, or a retry bids twice
+                    logger.exception("place_bid failed after commit", extra={"trace_id": trace.trace_id})
+                    return
 
-                # ---------- FETCH BID HISTORY ----------
-                cursor.execute("""
-                SELECT b.team_id, t.name AS team_name, b.bid_amount, b.bid_time
-                FROM live_bids b
-                JOIN teams t ON b.team_id = t.team_id
-                WHERE b.player_id = %s
-                ORDER BY b.bid_time ASC
-                """, (active_player,))
+                logger.exception("place_bid failed", extra={"trace_id": trace.trace_id})
+                await reject("error", str(e))
+
+            finally:
+                cursor.close()
+                conn.close()
+    @sio.event
+    @timed_event("set_proxy_bid")
+    async def set_proxy_bid(sid, data):
+        """Register (or with no amount, cancel) a private maximum for the current or an upcoming lot."""
+        team_id = data.get("team_id")
+        player_id = data.get("player_id")
+        max_value = data.get("max_amount")
 
-                history = cursor.fetchall()
+        async def reject(error):
+            await sio.emit("proxy_bid_rejected", {"player_id": player_id, "error": error}, to=sid)
 
-                for h in history:
-                    if isinstance(h["bid_amount"], Decimal):
-                        h["bid_amount"] = float(h["bid_amount"])
+        if not team_id or not player_id:
+            await reject("team_id and player_id are required")
+            return
 
-                    if h.get("bid_time"):
-                        h["bid_time"] = h["bid_time"].isoformat()
+        try:
+            team_id, player_id = int(team_id), int(player_id)
+        except (TypeError, ValueError):
+            await reject("Invalid team or player")
+            return
 
-                if highest:
-                    highest_bid_amount = float(highest["bid_amount"])
-                else:
-                    highest_bid_amount = base_price
+        if not max_value:
+            PROXIES.cancel(player_id, team_id)
+            await sio.emit("proxy_bid_set", {"player_id": player_id, "max_amount": None}, to=sid)
+            return
 
+        try:
+            max_amount = float(max_value)
+        except (TypeError, ValueError):
+            max_amount = None
 
-                #----------- Timer Extension On last Second Bid --------------
-                cursor.execute("""
-                SELECT expires_at
-                FROM current_auction
-                LIMIT 1
-                """)
-
-                row = cursor.fetchone()
-
-                if row:
-                    expires_at = row["expires_at"]
-
-                    if expires_at.tzinfo is None:
-                        expires_at = expires_at.replace(tzinfo=timezone.utc)
-
-                    remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
-                else:
-                    remaining = 0
-
-                if 0 < remaining <= 10:
-                    cursor.execute("""
-                    UPDATE current_auction
-                    SET expires_at = DATE_ADD(expires_at, INTERVAL 30 SECOND)
-                    """)
-                    conn.commit()
-
-                    print("⏱ Auction timer extended by 30 seconds")
-                    await sio.emit("timer_update", {
-                        "remaining_seconds": 30,
-                        "extended": True
-                    })
-                # ---------- BROADCAST UPDATE ----------
-                await sio.emit("auction_update", {
-                    "player_id": active_player,
-                    "current_bid": highest_bid_amount,
-                    "highest_bid": highest,
-                    "history": history,
-                })
+        if max_amount is None or not math.isfinite(max_amount):
+            await reject("Invalid maximum")
+            return
 
-            except Exception as e:
+        conn = get_db_connection()
+        cursor = conn.cursor(pymysql.cursors.DictCursor)
 
-                conn.rollback()
+        try:
+            # Rebuilt after add_team / upload_players, so new teams and categories are known
+            LEDGER.ensure()
 
-                print("⚠ place_bid error:", e)
+            cursor.execute(
+                """
+                SELECT p.category, p.base_price
+                FROM players p
+                WHERE p.id = %s
+                  AND NOT EXISTS (SELECT 1 FROM sold_players sp WHERE sp.player_id = p.id)
+                """,
+                (player_id,)
+            )
+            player = cursor.fetchone()
 
-                await sio.emit(
-                    "bid_rejected",
-                    {"error": str(e)},
-                    to=sid
-                )
+        finally:
+            cursor.close()
+            conn.close()
 
-            finally:
-                cursor.close()
-                conn.close()
\ No newline at end of file
+        if not LEDGER.get(team_id):
+            await reject("Team not found")
+            return
+
+        if not player:
+            await reject("Player not found or already sold")
+            return
+
+        if max_amount < float(player.get("base_price") or 0):
+            await reject(f"Maximum is below the base price ₹{float(player['base_price']):g}")
+            return
+
+        max_bid = LEDGER.max_bid(team_id, player["category"])
+        if max_amount > max_bid:
+            await reject(f"Maximum bid ₹{max_bid:g} keeps enough purse to complete your squad")
+            return
+
+        # Kept private: only the owner is told, other teams just see the bids it places
+        PROXIES.set(player_id, team_id, max_amount)
+        await sio.emit("proxy_bid_set", {"player_id": player_id, "max_amount": max_amount}, to=sid)
+
+        logger.info("Proxy bid set", extra={"team_id": team_id, "player_id": player_id})
+
+        # Acts right away when the lot is live; otherwise when it opens
+        await run_proxies(player_id)
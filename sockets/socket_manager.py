@@ -1,18 +1,66 @@
+import time
+from collections import Counter
+
 import socketio
 
+from core.config import get_settings
+from core.log import library_logger
+from core.metrics import REGISTRY, SOCKET_EMIT_LATENCY, EMIT_QUEUE_DEPTH
 from core.utils import get_local_ip
 
-FRONTEND_PORT = 3000
-local_ip = get_local_ip()
+settings = get_settings()
+
+FRONTEND_PORT = settings.frontend_port
 team_sockets = {}
 
-sio = socketio.AsyncServer(
+# Sockets of authenticated admins (import progress, admin-only updates)
+ADMIN_ROOM = "admins"
+
+# sid -> "team" | "admin" | "spectator", set when a socket joins
+socket_roles = {}
+
+
+class InstrumentedServer(socketio.AsyncServer):
+    """AsyncServer that records emit time and how many emits are in flight."""
+
+    async def emit(self, event, *args, **kwargs):
+        EMIT_QUEUE_DEPTH.inc()
+        started = time.perf_counter()
+        try:
+            return await super().emit(event, *args, **kwargs)
+        finally:
+            EMIT_QUEUE_DEPTH.dec()
+            SOCKET_EMIT_LATENCY.observe(time.perf_counter() - started, event=event)
+
+
+REGISTRY.gauge(
+    "jpl_connected_sockets", "Connected sockets by role", ("role",),
+    collect=lambda: {(role,): count for role, count in Counter(socket_roles.values()).items()}
+)
+
+sio = InstrumentedServer(
     async_mode="asgi",
     cors_allowed_origins=[
         f"http://localhost:{FRONTEND_PORT}",
-        f"http://127.0.0.1:{FRONTEND_PORT}",
-        f"http://{local_ip}:{FRONTEND_PORT}"
+        f"http://127.0.0.1:{FRONTEND_PORT}"
     ],
-    logger=True,
-    engineio_logger=True
-)
\ No newline at end of file
+    # Packet logs go through core.log (queued, sampled) instead of a blocking stdout handler
+    logger=library_logger("socketio", settings.socket_logger),
+    engineio_logger=library_logger("engineio", settings.engineio_logger)
+)
+
+
+def allow_local_network_origin():
+    """
+    Add the frontend on this machine's LAN address to the allowed origins.
+
+    Probing the local IP opens a socket, so it runs as an explicit startup
+    step instead of on import.
+    """
+    local_ip = get_local_ip()
+    origin = f"http://{local_ip}:{FRONTEND_PORT}"
+
+    if origin not in sio.eio.cors_allowed_origins:
+        sio.eio.cors_allowed_origins.append(origin)
+
+    return local_ip